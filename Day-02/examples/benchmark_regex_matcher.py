@@ -0,0 +1,80 @@
+# benchmark_regex_matcher.py
+# ----------------------------------------------------
+# Compare scanning a log file for many patterns:
+#
+# - naive:   for each line, for each pattern: re.search(pattern, line)
+# - matcher: regex_matcher.count_matches() → one combined regex, 1 MB chunks
+#
+# Run:
+#   python benchmark_regex_matcher.py                       # 500,000 lines, 30 literal patterns
+#   python benchmark_regex_matcher.py --lines 5000000 --patterns 100
+# ----------------------------------------------------
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from collections import Counter
+
+from regex_matcher import MultiMatcher, count_matches
+
+WORDS = ['GET', 'POST', 'user', 'request', 'served', 'cache', 'worker', 'queue', 'ok', 'done']
+
+
+def make_patterns(count):
+    """Literal error markers like 'E1003 failure-3'; none is part of another."""
+    return [f'E{1000 + number} failure-{number}' for number in range(count)]
+
+
+def make_log(path, lines, patterns, hit_rate=0.05):
+    """Log lines with about hit_rate of them containing one of the patterns."""
+    rng = random.Random(42)
+    with open(path, 'w') as file:
+        for number in range(lines):
+            words = ' '.join(rng.choices(WORDS, k=8))
+            if rng.random() < hit_rate:
+                words += ' ' + rng.choice(patterns)
+            file.write(f'2024-01-01T00:00:{number % 60:02d} host-{number % 17} {words} id={number}\n')
+
+
+def naive_count(path, patterns):
+    counts = Counter()
+    with open(path) as file:
+        for line in file:
+            for pattern in patterns:
+                if re.search(pattern, line):
+                    counts[pattern] += 1
+    return counts
+
+
+def timed(label, func, size_mb):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:8.2f} s  {size_mb / elapsed:8.1f} MB/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark multi-pattern log scanning')
+    parser.add_argument('--lines', type=int, default=500000)
+    parser.add_argument('--patterns', type=int, default=30)
+    args = parser.parse_args()
+
+    patterns = make_patterns(args.patterns)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'app.log')
+        make_log(path, args.lines, patterns)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{args.lines} lines ({size_mb:.0f} MB), {len(patterns)} patterns\n")
+
+        naive, naive_time = timed('naive', lambda: naive_count(path, patterns), size_mb)
+        fast, fast_time = timed('matcher', lambda: count_matches(path, MultiMatcher(patterns)), size_mb)
+        assert naive == fast, "results differ"
+        print(f"\nSame {sum(fast.values())} matches, {naive_time / fast_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
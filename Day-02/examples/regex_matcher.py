@@ -0,0 +1,233 @@
+# regex_matcher.py
+# ----------------------------------------------------
+# Reusable regex helpers for scanning BIG log files
+#
+# The 03-regex-*.py examples call re.search / re.match / re.sub / re.split
+# with a pattern string on one sentence. That is fine for one line, but on a
+# GB-sized log file with many patterns:
+#
+# - every call looks the pattern up in re's small internal cache
+#   → here patterns are compiled once and kept in our own LRU cache
+# - "for each line: for each pattern: re.search()" reads every line N times
+#   → MultiMatcher joins all patterns into ONE regex, so each line is read once
+#   (literal words are merged into a trie-shaped regex: "err(?:or|no)"
+#   instead of "error|errno", so shared prefixes are only compared once)
+# - reading line by line costs one Python loop step per line
+#   → scan_file() reads big chunks (1 MB) and searches the whole chunk at once.
+#   A line cut in half at the end of a chunk is carried over to the next
+#   chunk, so matches that straddle a chunk boundary are still found.
+#
+# Matching works per line (like grep): a match never spans two lines.
+#
+# Usage:
+#   from regex_matcher import MultiMatcher, scan_file, search
+#   search(r"brown", "The quick brown fox")            # same as re.search, but cached
+#   matcher = MultiMatcher(["ERROR", "Timeout", "connection refused"])
+#   for found in scan_file("app.log", matcher):
+#       print(found.line_number, found.pattern, found.line)
+#
+# Run:
+#   python regex_matcher.py app.log ERROR Timeout "connection refused"
+#   python regex_matcher.py app.log --regex "status=5\d\d" "took \d{4,}ms"
+# ----------------------------------------------------
+
+import re
+import sys
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+CHUNK_SIZE = 1024 * 1024  # characters read per chunk
+
+LineMatch = namedtuple('LineMatch', ['line_number', 'pattern', 'text', 'line'])
+
+
+# ---------- Cached versions of the re functions used in 03-regex-*.py ----------
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern, flags=0):
+    """re.compile() with an LRU cache (re's own cache is small and is cleared when full)."""
+    return re.compile(pattern, flags)
+
+
+def search(pattern, text, flags=0):
+    return compile_pattern(pattern, flags).search(text)
+
+
+def match(pattern, text, flags=0):
+    return compile_pattern(pattern, flags).match(text)
+
+
+def findall(pattern, text, flags=0):
+    return compile_pattern(pattern, flags).findall(text)
+
+
+def sub(pattern, replacement, text, count=0, flags=0):
+    return compile_pattern(pattern, flags).sub(replacement, text, count)
+
+
+def split(pattern, text, maxsplit=0, flags=0):
+    return compile_pattern(pattern, flags).split(text, maxsplit)
+
+
+# ---------- Many patterns, one pass ----------
+
+def trie_regex(words):
+    """
+    Build one regex (string) matching any of the literal words, shaped like a
+    trie: ["error", "errno", "warn"] → "(?:err(?:no|or)|warn)".
+    At every position the regex engine follows one branch per character
+    instead of trying every word. Longer words win over their prefixes.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # end of a word
+
+    def build(node):
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1:
+            body = branches[0]
+            if ends_here:  # the word may stop here, or continue (optional group, greedy → longest)
+                return f'(?:{body})?'
+            return body
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if ends_here else body
+
+    return build(trie)
+
+
+class MultiMatcher:
+    """
+    Search for many patterns in a single pass.
+
+    literal=True:  patterns are plain words (no regex syntax), merged into a trie regex.
+    literal=False: patterns are regexes, joined as (p0)|(p1)|...; each is wrapped in
+                   a group so we know which one matched (don't use numbered
+                   backreferences like \\1 inside them).
+
+    Matches don't overlap: where two patterns match at the same place, the
+    longer literal wins (regex mode: the first pattern in the list wins).
+    """
+
+    def __init__(self, patterns, literal=True, ignore_case=False):
+        self.patterns = list(dict.fromkeys(patterns))  # drop duplicates, keep order
+        if not self.patterns or '' in self.patterns:
+            raise ValueError("MultiMatcher needs at least one pattern and no empty patterns")
+        self.literal = literal
+        self.ignore_case = ignore_case
+        flags = re.IGNORECASE if ignore_case else 0
+
+        if literal:
+            # The matched text IS the pattern (lower-cased when ignoring case)
+            self._by_text = {self._key(pattern): pattern for pattern in self.patterns}
+            self.regex = compile_pattern(trie_regex(self._by_text), flags)
+        else:
+            # (p0)|(p1)|... → the OUTER group of the pattern that matched closes
+            # last, so match.lastindex tells us which pattern it was
+            parts, self._by_group = [], {}
+            group = 1
+            for pattern in self.patterns:
+                self._by_group[group] = pattern
+                parts.append(f'({pattern})')
+                group += 1 + re.compile(pattern).groups
+            self.regex = compile_pattern('|'.join(parts), flags)
+
+    def _key(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def pattern_of(self, found):
+        """Which of our patterns produced this re.Match."""
+        if self.literal:
+            return self._by_text[self._key(found.group())]
+        return self._by_group[found.lastindex]
+
+    def finditer(self, text):
+        """Yield (pattern, re.Match) for every match in text."""
+        for found in self.regex.finditer(text):
+            yield self.pattern_of(found), found
+
+    def search(self, text):
+        """First (pattern, re.Match) in text, or None."""
+        found = self.regex.search(text)
+        return None if found is None else (self.pattern_of(found), found)
+
+
+# ---------- Streaming big files ----------
+
+def read_chunks(path, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """
+    Yield (text, first_line_number) chunks that always end at a line boundary.
+    The unfinished last line of a chunk is carried over to the next one.
+    """
+    line_number = 1
+    carry = ''
+    with open(path, encoding=encoding, errors='replace', newline='') as file:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind('\n') + 1
+            if cut == 0:      # no newline yet: one very long line, keep reading
+                carry = data
+                continue
+            chunk, carry = data[:cut], data[cut:]
+            yield chunk, line_number
+            line_number += chunk.count('\n')
+    if carry:
+        yield carry, line_number
+
+
+def scan_file(path, matcher, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """Yield a LineMatch for every match of matcher (a MultiMatcher) in the file."""
+    for chunk, line_number in read_chunks(path, chunk_size, encoding):
+        counted_upto = 0
+        for pattern, found in matcher.finditer(chunk):
+            start = found.start()
+            line_number += chunk.count('\n', counted_upto, start)
+            counted_upto = start
+            line_start = chunk.rfind('\n', 0, start) + 1
+            line_end = chunk.find('\n', start)
+            line = chunk[line_start:line_end if line_end != -1 else len(chunk)].rstrip('\r')
+            yield LineMatch(line_number, pattern, found.group(), line)
+
+
+def count_matches(path, matcher, chunk_size=CHUNK_SIZE, encoding='utf-8'):
+    """Counter {pattern: number of matches}; skips the line bookkeeping of scan_file()."""
+    counts = Counter()
+    for chunk, _ in read_chunks(path, chunk_size, encoding):
+        if matcher.literal:
+            # The trie regex has no capturing groups: findall() returns the matched words
+            counts.update(matcher.regex.findall(chunk))
+        else:
+            counts.update(matcher.pattern_of(found) for found in matcher.regex.finditer(chunk))
+    if matcher.literal:
+        # Matched text → pattern (several spellings can map to one pattern when ignoring case)
+        by_pattern = Counter()
+        for text, count in counts.items():
+            by_pattern[matcher._by_text[matcher._key(text)]] += count
+        return by_pattern
+    return counts
+
+
+def main():
+    args = sys.argv[1:]
+    literal = '--regex' not in args
+    args = [arg for arg in args if arg != '--regex']
+    if len(args) < 2:
+        print("Usage: python regex_matcher.py FILE [--regex] PATTERN [PATTERN ...]")
+        sys.exit(1)
+
+    path, patterns = args[0], args[1:]
+    matcher = MultiMatcher(patterns, literal=literal)
+    for found in scan_file(path, matcher):
+        print(f"{path}:{found.line_number}: [{found.pattern}] {found.line}")
+
+
+if __name__ == "__main__":
+    main()
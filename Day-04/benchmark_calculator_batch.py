@@ -0,0 +1,81 @@
+# benchmark_calculator_batch.py
+# ----------------------------------------------------
+# Scalar loop vs vectorized batch calculator (calculator_batch.py)
+#
+# - scalar: [calc.div(x, y) for x, y in zip(list1, list2)] with the
+#           two-number functions of assignments/calculator_module.py
+# - vector: calculator_batch.div(array1, array2, zero='nan'), one NumPy call
+#
+# For every size we report time and PEAK extra memory of the operation
+# (measured with tracemalloc in a separate run, because tracing slows down
+# the Python loop). Inputs are created before measuring.
+#
+# Run:
+#   python benchmark_calculator_batch.py                  # 10^3 .. 10^7 elements
+#   python benchmark_calculator_batch.py --max-exp 8      # needs ~3 GB of RAM for 10^8
+# ----------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assignments'))
+import calculator_module as calc  # noqa: E402  (the scalar add/sub/mul/div)
+
+from calculator_batch import div  # noqa: E402
+
+
+def scalar_div(list1, list2):
+    return [calc.div(x, y) for x, y in zip(list1, list2)]
+
+
+def vector_div(array1, array2):
+    return div(array1, array2, zero='nan')
+
+
+def measure(func, *args):
+    """Returns (seconds, peak extra bytes)."""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scalar vs vectorized calculator')
+    parser.add_argument('--max-exp', type=int, default=7, help='largest size is 10^max-exp elements')
+    parser.add_argument('--scalar-max-exp', type=int, default=7, help='skip the scalar loop above this size')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'elements':>11} | {'scalar time':>11} {'scalar peak':>12} | {'vector time':>11} {'vector peak':>12} | speed-up")
+    for exponent in range(3, args.max_exp + 1):
+        size = 10 ** exponent
+        array1 = rng.random(size) * 100
+        array2 = rng.integers(1, 10, size).astype(np.float64)  # no zeros: same results for both
+
+        vector_time, vector_peak = measure(vector_div, array1, array2)
+        if exponent <= args.scalar_max_exp:
+            list1, list2 = array1.tolist(), array2.tolist()
+            scalar_time, scalar_peak = measure(scalar_div, list1, list2)
+            del list1, list2
+            scalar = f"{scalar_time:>9.4f} s {scalar_peak / 1e6:>9.1f} MB"
+            speedup = f"{scalar_time / vector_time:>7.0f}x"
+        else:
+            scalar, speedup = f"{'(skipped)':>24}", ''
+        print(f"{size:>11} | {scalar} | {vector_time:>9.4f} s {vector_peak / 1e6:>9.1f} MB | {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# calculator_batch.py
+# ----------------------------------------------------
+# Array ("batch") version of the calculator module
+#
+# calculator.py / assignments/calculator_module.py work on TWO numbers:
+#     add(10, 5) → 15
+# To process millions of metric pairs we would call them in a Python loop,
+# one pair at a time. Here every function takes whole columns instead
+# (NumPy arrays, lists, array.array, memoryview, raw float64 bytes) and runs
+# ONE vectorized NumPy kernel per call:
+#     add([1, 2, 3], [10, 20, 30]) → array([11, 22, 33])
+#
+# Division by zero is an explicit choice (zero=...):
+#   'raise' → ZeroDivisionError, like 10 / 0 in plain Python (default)
+#   'nan'   → NaN wherever the divisor is 0
+#   'mask'  → numpy masked array, divisor-0 entries are masked out
+#
+# Batch files: two columns in, one column out
+#   CSV  → python calculator_batch.py div metrics.csv result.csv --zero nan
+#   .npy → python calculator_batch.py add metrics.npy result.npy
+# .npy files are memory-mapped and processed in chunks, so memory stays
+# small even for 10^8 rows.
+#
+# Requirements: pip install numpy
+# ----------------------------------------------------
+
+import argparse
+
+import numpy as np
+
+ZERO_POLICIES = ('raise', 'nan', 'mask')
+CHUNK_ROWS = 1_000_000  # rows per chunk when streaming .npy files
+
+
+def as_array(values):
+    """
+    Turn the input into a NumPy array WITHOUT copying when possible.
+    Raw bytes / bytearray are read as float64 values.
+    """
+    if isinstance(values, (bytes, bytearray)):
+        return np.frombuffer(values, dtype=np.float64)
+    return np.asarray(values)  # arrays, array.array and memoryview are not copied
+
+
+def add(num1, num2, out=None):
+    return np.add(as_array(num1), as_array(num2), out=out)
+
+
+def sub(num1, num2, out=None):
+    return np.subtract(as_array(num1), as_array(num2), out=out)
+
+
+def mul(num1, num2, out=None):
+    return np.multiply(as_array(num1), as_array(num2), out=out)
+
+
+def div(num1, num2, zero='raise', out=None):
+    """Element-wise num1 / num2 with an explicit divide-by-zero policy (see ZERO_POLICIES)."""
+    if zero not in ZERO_POLICIES:
+        raise ValueError(f"zero must be one of {ZERO_POLICIES}, got {zero!r}")
+    num1, num2 = as_array(num1), as_array(num2)
+    zeros = num2 == 0
+
+    if zero == 'raise':
+        if zeros.any():
+            raise ZeroDivisionError(f"division by zero in {np.count_nonzero(zeros)} element(s), "
+                                    f"first at index {int(np.argmax(zeros))}")
+        return np.true_divide(num1, num2, out=out)
+
+    if out is None:
+        shape = np.broadcast_shapes(num1.shape, num2.shape)
+        out = np.empty(shape, dtype=np.result_type(num1, num2, 1.0))
+    out[...] = np.nan
+    # where= skips the zero divisors: no inf, no warnings, they keep the NaN
+    np.true_divide(num1, num2, out=out, where=~zeros)
+    if zero == 'mask':
+        return np.ma.masked_array(out, mask=np.broadcast_to(zeros, out.shape))
+    return out
+
+
+OPERATIONS = {'add': add, 'sub': sub, 'mul': mul, 'div': div}
+
+
+def calculate(operation, num1, num2, zero='raise', out=None):
+    """Run one of OPERATIONS by name."""
+    if operation not in OPERATIONS:
+        raise ValueError(f"Invalid operation {operation!r}, use one of {list(OPERATIONS)}")
+    if operation == 'div':
+        return div(num1, num2, zero=zero, out=out)
+    return OPERATIONS[operation](num1, num2, out=out)
+
+
+# ---------- Batch files: column in, column out ----------
+
+def _has_header(path, delimiter):
+    with open(path) as file:
+        first = file.readline().split(delimiter)[0].strip()
+    try:
+        float(first)
+        return False
+    except ValueError:
+        return True
+
+
+def run_csv(operation, input_path, output_path, zero='raise', columns=(0, 1), delimiter=','):
+    """Read two columns of a CSV file, write the result column. Returns the number of rows."""
+    skip = 1 if _has_header(input_path, delimiter) else 0
+    data = np.loadtxt(input_path, delimiter=delimiter, usecols=columns, skiprows=skip,
+                      dtype=np.float64, ndmin=2)
+    result = calculate(operation, data[:, 0], data[:, 1], zero=zero)
+    with open(output_path, 'w') as file:
+        file.write('result\n')
+        if np.ma.isMaskedArray(result):
+            # Masked rows become empty cells
+            file.writelines('\n' if masked else '%.17g\n' % value
+                            for value, masked in zip(result.data.tolist(), result.mask.tolist()))
+        else:
+            np.savetxt(file, result, fmt='%.17g')
+    return len(result)
+
+
+def run_npy(operation, input_path, output_path, zero='raise', columns=(0, 1), chunk_rows=CHUNK_ROWS):
+    """
+    Read two columns of a 2-D .npy file (memory-mapped), write a 1-D .npy result.
+    Works chunk by chunk; masked values ('mask' policy) are stored as NaN.
+    """
+    data = np.load(input_path, mmap_mode='r')
+    if data.ndim != 2:
+        raise ValueError(f"{input_path}: expected a 2-D array (rows x columns), got shape {data.shape}")
+    rows = data.shape[0]
+    dtype = np.result_type(data.dtype, 1.0) if operation == 'div' else data.dtype
+    result = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype, shape=(rows,))
+    policy = 'nan' if zero == 'mask' else zero
+    for start in range(0, rows, chunk_rows):
+        end = min(start + chunk_rows, rows)
+        calculate(operation, data[start:end, columns[0]], data[start:end, columns[1]],
+                  zero=policy, out=result[start:end])
+    result.flush()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized calculator over two columns of a CSV or .npy file')
+    parser.add_argument('operation', choices=list(OPERATIONS))
+    parser.add_argument('input', help='.csv or .npy file with (at least) two columns')
+    parser.add_argument('output', help='result column, same format as the input')
+    parser.add_argument('--zero', choices=ZERO_POLICIES, default='raise', help='divide-by-zero policy')
+    parser.add_argument('--columns', default='0,1', help='the two input columns (0-based), e.g. 2,5')
+    parser.add_argument('--delimiter', default=',', help='CSV delimiter')
+    args = parser.parse_args()
+
+    columns = tuple(int(column) for column in args.columns.split(','))
+    if len(columns) != 2:
+        parser.error("--columns needs exactly two column numbers")
+    try:
+        if args.input.endswith('.npy'):
+            rows = run_npy(args.operation, args.input, args.output, args.zero, columns)
+        else:
+            rows = run_csv(args.operation, args.input, args.output, args.zero, columns, args.delimiter)
+    except ZeroDivisionError as e:
+        parser.exit(1, f"Error: {e} (use --zero nan or --zero mask)\n")
+    print(f"Output: {rows} rows written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
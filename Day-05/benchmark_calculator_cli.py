@@ -0,0 +1,107 @@
+# benchmark_calculator_cli.py
+# ----------------------------------------------------
+# Operations per second of calculator_cli.py in its three modes:
+#
+# - per-process: one "python calculator_cli.py 2 add 3" per operation
+# - stdin batch: one process, all operations piped through --batch
+#                (plain "2 add 3" lines and NDJSON lines)
+# - server:      one long-lived --serve process on a unix socket; the client
+#                sends all lines over one connection and reads the answers
+#
+# Run:
+#   python benchmark_calculator_cli.py
+#   python benchmark_calculator_cli.py --ops 1000000 --processes 100
+# ----------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLI = os.path.join(HERE, "calculator_cli.py")
+
+
+def make_lines(count, ndjson=False):
+    rng = random.Random(42)
+    lines = []
+    for number in range(count):
+        num1, op, num2 = rng.randint(1, 1000), rng.choice(["add", "sub", "mul", "div"]), rng.randint(1, 1000)
+        if ndjson:
+            lines.append(json.dumps({"id": number, "num1": num1, "op": op, "num2": num2}))
+        else:
+            lines.append(f"{num1} {op} {num2}")
+    return lines
+
+
+def per_process(count):
+    for line in make_lines(count):
+        subprocess.run([sys.executable, CLI, *line.split()], check=True, capture_output=True)
+    return count
+
+
+def stdin_batch(lines):
+    result = subprocess.run([sys.executable, CLI, "--batch"], input="\n".join(lines) + "\n",
+                            check=True, capture_output=True, text=True)
+    answers = result.stdout.count("\n")
+    assert answers == len(lines), f"got {answers} answers for {len(lines)} lines"
+    return answers
+
+
+def server(lines, socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+
+        def send():
+            client.sendall(("\n".join(lines) + "\n").encode())
+            client.shutdown(socket.SHUT_WR)  # "no more lines": the server's loop ends
+
+        sender = threading.Thread(target=send)  # send and receive at the same time
+        sender.start()
+        answers = 0
+        with client.makefile("rb") as replies:
+            for _ in replies:
+                answers += 1
+        sender.join()
+    assert answers == len(lines), f"got {answers} answers for {len(lines)} lines"
+    return answers
+
+
+def report(label, func, *args):
+    start = time.perf_counter()
+    count = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {count:>9} ops {elapsed:8.2f} s {count / elapsed:>12,.0f} ops/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calculator_cli.py modes")
+    parser.add_argument("--ops", type=int, default=200000, help="operations for batch and server modes")
+    parser.add_argument("--processes", type=int, default=50, help="operations for per-process mode")
+    args = parser.parse_args()
+
+    lines, ndjson_lines = make_lines(args.ops), make_lines(args.ops, ndjson=True)
+    report("per-process", per_process, args.processes)
+    report("stdin batch (text)", stdin_batch, lines)
+    report("stdin batch (NDJSON)", stdin_batch, ndjson_lines)
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "calculator.sock")
+    process = subprocess.Popen([sys.executable, CLI, "--serve", socket_path], stderr=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(socket_path):
+            time.sleep(0.01)
+        report("server (text)", server, lines, socket_path)
+        report("server (NDJSON)", server, ndjson_lines, socket_path)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmark_expression_compiler.py
+# ----------------------------------------------------
+# Evaluate one formula over many rows of variable values:
+#
+# - parse every row: parse + validate + compile the text again for each row
+#                    (what you get without a cache)
+# - compiled rows:   compile_expression() once (LRU cache), call it per row
+# - columns:         compile once, evaluate_columns() with NumPy arrays
+#
+# Run:
+#   python benchmark_expression_compiler.py
+#   python benchmark_expression_compiler.py --rows 5000000
+# ----------------------------------------------------
+
+import argparse
+import random
+import time
+
+from expression_compiler import compile_expression
+
+FORMULA = "(cpu * 100) / cores + max(load1, load5) * 0.5"
+
+
+def timed(label, func, rows):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {rows:>9} rows {elapsed:8.3f} s {rows / elapsed:>14,.0f} rows/sec")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cached expression compiler")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--parse-rows", type=int, default=50000, help="rows for the (slow) re-parse case")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    columns = {
+        "cpu": [rng.random() for _ in range(args.rows)],
+        "cores": [rng.choice([2, 4, 8, 16]) for _ in range(args.rows)],
+        "load1": [rng.random() * 4 for _ in range(args.rows)],
+        "load5": [rng.random() * 4 for _ in range(args.rows)],
+    }
+    names = list(columns)
+    rows = [dict(zip(names, values)) for values in zip(*columns.values())]
+
+    uncached = compile_expression.__wrapped__  # the function without its LRU cache
+    parsed = timed("parse every row", lambda: [uncached(FORMULA)(row) for row in rows[:args.parse_rows]],
+                   args.parse_rows)
+    formula = compile_expression(FORMULA)
+    compiled = timed("compiled rows", lambda: [formula(row) for row in rows], args.rows)
+    column_result = timed("columns (NumPy)", lambda: formula.evaluate_columns(columns), args.rows)
+
+    assert parsed == compiled[:args.parse_rows]
+    assert max(abs(a - b) for a, b in zip(compiled, column_result.tolist())) < 1e-9
+    print(f"\n{compile_expression.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
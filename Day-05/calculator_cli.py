@@ -1,5 +1,31 @@
+import json  # json module reads/writes NDJSON lines in batch mode
+import os
+import socketserver  # socketserver module gives us a ready-made socket server
+import stat
 import sys  # Import sys module to access command line arguments
 
+from expression_compiler import compile_expression  # safe, cached "(cpu*100)/cores" expressions
+
+# Usage:
+#   python calculator_cli.py 2 add 3                 → one calculation (Output: 5.0)
+#   python calculator_cli.py --batch < ops.txt       → many calculations, one per line
+#   python calculator_cli.py --serve /tmp/calc.sock  → long-lived server on a local (unix) socket
+#   python calculator_cli.py --expr "(cpu*100)/cores" cpu=0.5 cores=4   → Output: 12.5
+#   python calculator_cli.py --expr "(cpu*100)/cores" --batch < rows.ndjson
+#                                        → one result per {"cpu": ..., "cores": ...} line
+#
+# Batch / server input, one operation per line, either:
+#   2 add 3                              → answers: 5.0
+#   {"id": 1, "num1": 2, "op": "add", "num2": 3}
+#                                        → answers: {"id": 1, "result": 5.0}
+# A bad line answers "error: ..." (or {"error": ...}) and processing goes on.
+#
+# Why? Starting Python for every single calculation costs far more than the
+# calculation itself. In batch and server mode Python starts ONCE.
+
+DEFAULT_SOCKET = "/tmp/calculator.sock"
+
+
 # Define functions for basic arithmetic operations
 def add(x, y):
     return x + y
@@ -13,24 +39,156 @@ def mul(x, y):
 def div(x, y):
     return x / y
 
+# Dispatch table: operation name → function (replaces the if/elif chain)
+OPERATIONS = {
+    "add": add,
+    "sub": sub,
+    "mul": mul,
+    "div": div,
+}
+
+
+def calculate(num1, operation, num2):
+    """Look the operation up in OPERATIONS and run it. Raises ValueError for unknown operations."""
+    function = OPERATIONS.get(operation.lower())  # lowercase → case-insensitive input
+    if function is None:
+        raise ValueError(f"Invalid operation {operation!r}")
+    return function(num1, num2)
+
+
+def process_line(line):
+    """Answer one batch/server line (text or NDJSON). Returns the answer line, or None for blank lines."""
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith("{"):
+        request = {}
+        try:
+            request = json.loads(line)
+            result = calculate(float(request["num1"]), str(request["op"]), float(request["num2"]))
+            answer = {"result": result}
+        except (ValueError, KeyError, TypeError, AttributeError, ZeroDivisionError) as e:
+            answer = {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            answer = {"id": request["id"], **answer}
+        return json.dumps(answer)
+
+    try:
+        num1, operation, num2 = line.split()
+        return str(calculate(float(num1), operation, float(num2)))
+    except (ValueError, ZeroDivisionError) as e:
+        return f"error: {type(e).__name__}: {e}"
+
+
+def run_batch(lines, output):
+    """Answer every line and write the answers to output. Returns how many lines were answered."""
+    count = 0
+    for line in lines:
+        answer = process_line(line)
+        if answer is not None:
+            output.write(answer + "\n")
+            count += 1
+    return count
+
+
+class CalculatorHandler(socketserver.BaseRequestHandler):
+    """
+    One client connection. Whatever arrived in one recv() is answered with one
+    sendall(): an interactive client gets its answer right away, a client that
+    sends thousands of lines at once gets them back in big blocks (few system calls).
+    """
+
+    def handle(self):
+        pending = b""
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                break
+            *lines, pending = (pending + data).split(b"\n")  # keep the unfinished last line
+            self.answer(lines)
+        self.answer([pending])
+
+    def answer(self, lines):
+        answers = [process_line(line.decode("utf-8", errors="replace")) for line in lines]
+        answers = [answer for answer in answers if answer is not None]
+        if answers:
+            self.request.sendall(("\n".join(answers) + "\n").encode())
+
+
+class CalculatorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True  # don't wait for open connections on shutdown
+
+
+def run_expression(text, args, lines=None, output=None):
+    """--expr mode: evaluate one expression for NAME=VALUE args, or for every NDJSON line with --batch."""
+    formula = compile_expression(text)  # parsed + validated once (ValueError if not allowed)
+    if args != ["--batch"]:
+        if not all("=" in arg for arg in args):
+            raise ValueError("Variables must be given as NAME=VALUE, e.g. cpu=0.5")
+        values = dict(arg.split("=", 1) for arg in args)
+        print("Output:", formula(values))
+        return
+
+    lines = sys.stdin if lines is None else lines
+    output = sys.stdout if output is None else output
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            answer = str(formula(json.loads(line)))
+        except (ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+            answer = json.dumps({"error": f"{type(e).__name__}: {e}"})
+        output.write(answer + "\n")
+
+
+def serve(socket_path=DEFAULT_SOCKET):
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        mode = None
+    if mode is not None:
+        if not stat.S_ISSOCK(mode):
+            # Never delete a regular file (or folder, link...) given by mistake
+            print(f"Error: {socket_path} exists and is not a socket", file=sys.stderr)
+            sys.exit(1)
+        os.remove(socket_path)  # left over from a previous run
+    with CalculatorServer(socket_path, CalculatorHandler) as server:
+        print(f"Calculator server listening on {socket_path} (Ctrl+C to stop)", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(socket_path)
+
+
 if __name__ == "__main__":
-    # sys.argv[1], sys.argv[2], sys.argv[3] are command line arguments passed by the user
-    # Convert the first and third arguments to int or float for numeric operations
-    num1 = float(sys.argv[1])
-    operation = sys.argv[2].lower()  # Convert operation to lowercase to handle case-insensitive input
-    num2 = float(sys.argv[3])
-
-    # Use conditional statements to call the appropriate function based on the operation
-    if operation == "add":
-        result = add(num1, num2)
-    elif operation == "sub":
-        result = sub(num1, num2)
-    elif operation == "mul":
-        result = mul(num1, num2)
-    elif operation == 'div':
-        # Handle division carefully (no zero division check here for simplicity)
-        result = div(num1, num2)
+    if sys.argv[1:2] == ["--batch"]:
+        run_batch(sys.stdin, sys.stdout)
+    elif sys.argv[1:2] == ["--serve"]:
+        serve(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SOCKET)
+    elif sys.argv[1:2] == ["--expr"]:
+        if len(sys.argv) < 3:
+            print('Usage: python calculator_cli.py --expr "(cpu*100)/cores" cpu=0.5 cores=4')
+            sys.exit(1)
+        # Same errors as the --batch path: a bad value or a bad expression is a message, not a traceback
+        try:
+            run_expression(sys.argv[2], sys.argv[3:])
+        except (ValueError, ZeroDivisionError, OverflowError) as e:
+            print(f"Error: {type(e).__name__}: {e}")
+            sys.exit(1)
     else:
-        result = "Invalid operation"
+        # sys.argv[1], sys.argv[2], sys.argv[3] are command line arguments passed by the user
+        # Convert the first and third arguments to float for numeric operations
+        num1 = float(sys.argv[1])
+        operation = sys.argv[2]
+        num2 = float(sys.argv[3])
+
+        # The dispatch table picks the function (no zero division check here for simplicity)
+        try:
+            result = calculate(num1, operation, num2)
+        except ValueError:
+            result = "Invalid operation"
 
-    print("Output:", result)
\ No newline at end of file
+        print("Output:", result)
@@ -0,0 +1,212 @@
+# expression_compiler.py
+# ----------------------------------------------------
+# Safe, cached compiler for calculator expressions like "(cpu*100)/cores"
+#
+# calculator_cli.py takes "num1 op num2"; to combine operations we had to
+# chain calls by hand: calc.div(calc.mul(cpu, 100), cores).
+# Here we accept a whole arithmetic expression with variables:
+#
+#   formula = compile_expression("(cpu*100)/cores")
+#   formula(cpu=0.5, cores=4)                        → 12.5
+#   formula.evaluate_columns({"cpu": [...], "cores": [...]})  → one result per row
+#
+# Safe: the text is parsed with Python's ast module and EVERY node is checked
+# against a short allow-list (numbers, variable names, + - * / // % **,
+# unary + and -, and a few functions like abs/min/max). Anything else
+# (attribute access, calls to other functions, strings, lambdas, ...) is
+# rejected with ValueError BEFORE anything runs.
+#
+# Fast:
+# - each expression text is parsed + compiled ONCE and kept in an LRU cache
+# - evaluate_columns() runs the compiled code over whole columns with NumPy
+#   (one vectorized pass per operator); without NumPy it loops over the rows
+#   with the already-compiled code, still without re-parsing
+#
+# All numbers are floats (like calculator_cli.py), so x / 0 raises
+# ZeroDivisionError for one row; in NumPy column mode x / 0 gives inf (0 / 0 → nan).
+# Results must be real numbers: (-8) ** 0.5 raises ValueError for one row
+# (like sqrt(-8)) instead of returning a complex number; in column mode it gives nan.
+# ----------------------------------------------------
+
+import ast
+import math
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # column mode falls back to a row loop
+    np = None
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_CONSTANT_EXPONENT = 1000  # "10 ** 100000" would only produce an OverflowError anyway
+
+ALLOWED_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+
+
+def _round(number, digits=0.0):
+    return round(number, int(digits))  # constants are floats: round(x, 2.0) needs an int
+
+
+def _round_column(values, digits=0.0):
+    return np.round(values, int(digits))
+
+
+# Functions usable inside expressions:
+#   (scalar version, NumPy column version or its name in numpy, allowed argument counts)
+# min/max take exactly two arguments: numpy.minimum(a, b, c) would treat c as the output array
+FUNCTIONS = {
+    "abs": (abs, "absolute", (1,)),
+    "min": (min, "minimum", (2,)),
+    "max": (max, "maximum", (2,)),
+    "sqrt": (math.sqrt, "sqrt", (1,)),
+    "round": (_round, _round_column, (1, 2)),
+}
+
+
+def _column_functions():
+    return {name: getattr(np, column) if isinstance(column, str) else column
+            for name, (_, column, _) in FUNCTIONS.items()}
+
+
+def _scalar_functions():
+    return {name: function for name, (function, _, _) in FUNCTIONS.items()}
+
+
+class _Validator(ast.NodeVisitor):
+    """Walks the parsed expression; raises ValueError on anything not allowed."""
+
+    def __init__(self):
+        self.names = set()
+
+    def generic_visit(self, node):
+        raise ValueError(f"Not allowed in an expression: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        self.visit(node.body)
+
+    def visit_BinOp(self, node):
+        self._check_operator(node.op)
+        if isinstance(node.op, ast.Pow) and isinstance(node.right, ast.Constant) \
+                and abs(node.right.value) > MAX_CONSTANT_EXPONENT:
+            raise ValueError(f"Exponent too large: {node.right.value}")
+        self.visit(node.left)
+        self.visit(node.right)
+
+    def visit_UnaryOp(self, node):
+        self._check_operator(node.op)
+        self.visit(node.operand)
+
+    def visit_Constant(self, node):
+        if type(node.value) not in (int, float):  # bool is a subclass of int: excluded on purpose
+            raise ValueError(f"Only numbers are allowed, not {node.value!r}")
+
+    def visit_Name(self, node):
+        if node.id in FUNCTIONS:
+            raise ValueError(f"{node.id} is a function, call it like {node.id}(x)")
+        if node.id.startswith("_"):
+            raise ValueError(f"Variable names cannot start with '_': {node.id}")
+        self.names.add(node.id)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f"Only these functions are allowed: {', '.join(FUNCTIONS)}")
+        arities = FUNCTIONS[node.func.id][2]
+        if node.keywords or len(node.args) not in arities:
+            counts = " or ".join(str(count) for count in arities)
+            raise ValueError(f"{node.func.id}() takes {counts} positional argument(s)")
+        for argument in node.args:
+            self.visit(argument)
+
+    def _check_operator(self, operator):
+        if not isinstance(operator, ALLOWED_OPERATORS):
+            raise ValueError(f"Operator not allowed: {type(operator).__name__}")
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """2 → 2.0: float math everywhere, so '**' can never build a huge int."""
+
+    def visit_Constant(self, node):
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+class CompiledExpression:
+    """A validated, compiled expression. Call it with variable values."""
+
+    def __init__(self, text, code, variables):
+        self.text = text
+        self.variables = variables  # sorted tuple of variable names
+        self._code = code
+        self._globals = {"__builtins__": {}, **_scalar_functions()}  # built once, not per call
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r}, variables={self.variables})"
+
+    def _bind(self, values):
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise ValueError(f"Missing value for: {', '.join(missing)}")
+        return {name: values[name] for name in self.variables}
+
+    def __call__(self, values=None, **kwargs):
+        """Evaluate for ONE set of values: formula(cpu=0.5, cores=4) or formula({"cpu": 0.5, ...})."""
+        if kwargs:
+            values = {**(values or {}), **kwargs}
+        try:
+            bindings = {name: float(values[name]) for name in self.variables}
+        except (KeyError, TypeError):
+            self._bind(values or {})  # raises ValueError naming the missing variables
+            raise
+        result = eval(self._code, self._globals, bindings)
+        if isinstance(result, complex):  # float ** fraction of a negative number
+            raise ValueError(f"Result is not a real number: {result}")
+        return result
+
+    def evaluate_columns(self, columns):
+        """
+        Evaluate for every row: columns = {"cpu": [...], "cores": [...]} (equal lengths).
+        Returns a NumPy array (or a list when NumPy is not installed).
+        """
+        columns = self._bind(columns)
+        if np is None:
+            rows = zip(*(columns[name] for name in self.variables))
+            return [self(dict(zip(self.variables, row))) for row in rows]
+
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"All columns must have the same length, got {sorted(lengths)}")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = eval(self._code, {"__builtins__": {}, **_column_functions()}, arrays)
+        if lengths and np.ndim(result) == 0:
+            result = np.full(lengths.pop(), result)  # e.g. "2 * 3" over 5 rows → five 6.0s
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """Parse, validate and compile an expression once; repeated texts come from the LRU cache."""
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    # Deep nesting ('-' * 990 + '1') is short enough to pass the length check but
+    # can overflow the stack in the parser, the validator or compile()
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+        validator = _Validator()
+        validator.visit(tree)
+        tree = ast.fix_missing_locations(_FloatConstants().visit(tree))
+        code = compile(tree, "<expression>", "eval")
+    except (SyntaxError, RecursionError) as e:
+        raise ValueError(f"Invalid expression {text!r}: {e}") from None
+    return CompiledExpression(text, code, tuple(sorted(validator.names)))
+
+
+def evaluate(text, values=None, **kwargs):
+    """One-shot helper: evaluate("(cpu*100)/cores", cpu=0.5, cores=4) → 12.5"""
+    return compile_expression(text)(values, **kwargs)
+
+
+if __name__ == "__main__":
+    formula = compile_expression("(cpu*100)/cores")
+    print(formula)
+    print("Output:", formula(cpu=0.5, cores=4))
+    print("Columns:", formula.evaluate_columns({"cpu": [0.5, 1.5, 3.0], "cores": [4, 4, 8]}))
@@ -0,0 +1,127 @@
+# benchmark_bitmap_set.py
+# ----------------------------------------------------
+# list vs set vs BitmapSet for tens of millions of integer IDs
+#
+# Two ID sets A and B:
+#   dense  → 20% of the IDs below 50 million are used (bitmap containers)
+#   sparse → the same number of IDs spread over the whole 32-bit range (array containers)
+# Measured:
+#   - memory (tracemalloc while building) and build time
+#   - "id in ids" for random IDs (the list only gets a few: it scans all IDs)
+#   - A & B, A | B, A ^ B, A - B
+#   - to_bytes() size, save + load (mmap) and lookups on the loaded set
+#
+# Run:
+#   python benchmark_bitmap_set.py                  # 10,000,000 IDs per set
+#   python benchmark_bitmap_set.py --ids 2000000
+# ----------------------------------------------------
+
+import argparse
+import gc
+import operator
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from bitmap_set import BitmapSet
+
+LOOKUPS = 1_000_000
+LIST_LOOKUPS = 20
+OPERATIONS = {'&': operator.and_, '|': operator.or_, '^': operator.xor, '-': operator.sub}
+
+
+def make_ids(count, spread, seed):
+    """count unique random IDs from range(spread), as a numpy array."""
+    rng = np.random.default_rng(seed)
+    if spread < count * 20:
+        ids = np.flatnonzero(rng.random(spread) < count / spread)
+    else:
+        ids = np.sort(rng.integers(0, spread, int(count * 1.01)))
+        ids = ids[np.concatenate(([True], ids[1:] != ids[:-1]))]
+    return rng.permutation(ids)[:count]
+
+
+def measure(build):
+    """(result, seconds, bytes): memory traced on a second build, time on the first."""
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def lookup_rate(ids, probes):
+    _, elapsed = timed(lambda: sum(1 for probe in probes if probe in ids))
+    return len(probes) / elapsed
+
+
+def run_case(title, count, spread):
+    a_ids, b_ids = make_ids(count, spread, 1), make_ids(count, spread, 2)
+    probes = np.random.default_rng(3).integers(0, spread, LOOKUPS).tolist()
+    print(f"{title}: {count:,} IDs per set from range({spread:,})")
+
+    ids_list, list_build, list_memory = measure(lambda: a_ids.tolist())
+    python_set, set_build, set_memory = measure(lambda: set(a_ids.tolist()))
+    other_set = set(b_ids.tolist())
+    # The garbage collector walks every entry of a Python list/set on each full
+    # run; with 30M+ entries alive, a full run started by the BitmapSet side (it
+    # creates thousands of small arrays) would be charged to BitmapSet. Freezing
+    # the existing objects keeps the measurements independent.
+    gc.collect()
+    gc.freeze()
+    bitmap, bitmap_build, bitmap_memory = measure(lambda: BitmapSet(a_ids))
+    print(f"  {'':<22} {'list':>12} {'set':>12} {'BitmapSet':>12}")
+    print(f"  {'build (s)':<22} {list_build:12.2f} {set_build:12.2f} {bitmap_build:12.2f}")
+    print(f"  {'memory (MB)':<22} {list_memory / 1e6:12.1f} {set_memory / 1e6:12.1f} {bitmap_memory / 1e6:12.1f}")
+    print(f"  {'bytes per ID':<22} {list_memory / count:12.1f} {set_memory / count:12.1f} "
+          f"{bitmap_memory / count:12.2f}")
+    rates = (lookup_rate(ids_list, probes[:LIST_LOOKUPS]), lookup_rate(python_set, probes),
+             lookup_rate(bitmap, probes))
+    print(f"  {'lookups per second':<22} {rates[0]:12,.0f} {rates[1]:12,.0f} {rates[2]:12,.0f}")
+    assert sum(probe in python_set for probe in probes[:10000]) == sum(probe in bitmap for probe in probes[:10000])
+
+    other_bitmap = BitmapSet(b_ids)
+    for operation, function in OPERATIONS.items():
+        result, bitmap_time = timed(lambda: function(bitmap, other_bitmap))
+        expected, set_time = timed(lambda: function(python_set, other_set))
+        assert len(result) == len(expected)
+        print(f"  A {operation} B {'':<16} {'':>12} {set_time:11.3f}s {bitmap_time:11.3f}s"
+              f"   ({set_time / bitmap_time:.1f}x, {len(result):,} IDs)")
+        del result, expected  # a big result set left alive would slow down the next garbage collections
+    del ids_list, python_set, other_set
+    gc.unfreeze()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'ids.bin')
+        _, save_time = timed(lambda: bitmap.save(path))
+        loaded, load_time = timed(lambda: BitmapSet.load(path))
+        rate = lookup_rate(loaded, probes)
+        print(f"  file: {os.path.getsize(path) / 1e6:.1f} MB, save {save_time:.3f} s, "
+              f"load (mmap) {load_time * 1000:.1f} ms, {rate:,.0f} lookups/s on the mapped set")
+        assert loaded == bitmap
+        del loaded
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list vs set vs BitmapSet')
+    parser.add_argument('--ids', type=int, default=10_000_000, help='IDs per set')
+    args = parser.parse_args()
+    run_case("Dense", args.ids, args.ids * 5)
+    run_case("Sparse", args.ids, 2 ** 32)
+
+
+if __name__ == "__main__":
+    main()
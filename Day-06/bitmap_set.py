@@ -0,0 +1,475 @@
+# bitmap_set.py
+# ----------------------------------------------------
+# Compressed bitmap set for large sets of integer IDs (roaring-style)
+#
+# task-06 checks "3 in my_list": a list is scanned element by element, O(n).
+# A Python set is O(1), but costs ~60-90 bytes per ID (an int object + a
+# hash table slot): 20 million instance IDs / PR numbers → over 1 GB.
+#
+# BitmapSet stores IDs as BITS (task-05's &, |, ^, << and >> doing the work).
+# Like Roaring bitmaps, the 32-bit ID space is cut into chunks of 65,536:
+#     high 16 bits of the ID → which chunk ("container")
+#     low 16 bits            → position inside that chunk
+# and every chunk picks the cheaper of two containers:
+#     array  container: sorted array('H') of low bits, 2 bytes per ID
+#                       (used while a chunk has <= 4096 IDs)
+#     bitmap container: 8192-byte bytearray, one bit for each of the 65,536
+#                       positions (used above 4096 IDs: < 2 bytes per ID)
+#
+#   ids = BitmapSet(range(0, 10_000_000, 3))
+#   42 in ids                   → True
+#   ids & other, ids | other, ids ^ other, ids - other
+#   len(ids), list(ids), ids.add(7), ids.discard(7)
+#
+# Serialization is zero-copy in the other direction: to_bytes() / save()
+# write the containers as raw bytes, and BitmapSet.from_buffer(data) /
+# BitmapSet.load(path) (mmap) use memoryviews INTO that buffer instead of
+# copying it. A container is copied only when it is changed.
+#
+# IDs must be integers from 0 to 2**32 - 1. Roaring's third container type
+# (runs of consecutive IDs) is left out to keep things simple.
+#
+# numpy (optional) speeds up building from big iterables/arrays.
+# ----------------------------------------------------
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:  # update() falls back to a pure Python loop
+    np = None
+
+ARRAY_MAX = 4096        # array containers hold at most this many IDs
+BITMAP_BYTES = 8192     # 65,536 bits; an array container is never this long
+MAX_ID = 2 ** 32 - 1
+
+FILE_MAGIC = b'BMSET1\n\0'
+HEADER = struct.Struct('<8sI4x')  # magic, number of containers (16 bytes)
+ENTRY = struct.Struct('<HxxII')   # container key, number of IDs, byte offset
+ALIGN = 8
+
+
+def _is_bitmap(container):
+    return len(container) == BITMAP_BYTES
+
+
+def _contains(container, low):
+    if _is_bitmap(container):
+        return container[low >> 3] >> (low & 7) & 1 == 1
+    index = bisect_left(container, low)
+    return index < len(container) and container[index] == low
+
+
+def _bitmap_positions(data):
+    """Positions of the set bits of a bitmap, in order (skips zero bytes)."""
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+
+def _bitmap_to_array(data):
+    """array('H') of the set bits of a bitmap (numpy unpacks all bits in one call)."""
+    if np is None:
+        return array('H', _bitmap_positions(data))
+    container = array('H')
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')
+    container.frombytes(np.flatnonzero(bits).astype(np.uint16).tobytes())
+    return container
+
+
+def _iter_container(container):
+    return _bitmap_positions(container) if _is_bitmap(container) else iter(container)
+
+
+def _to_int(container):
+    """Container as one 65,536-bit Python int (for &, |, ^ on whole containers)."""
+    if _is_bitmap(container):
+        return int.from_bytes(container, 'little')
+    bits = bytearray(BITMAP_BYTES)
+    for low in container:
+        bits[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _from_int(bits):
+    """(container, number of IDs) for a 65,536-bit int; (None, 0) when empty."""
+    count = bits.bit_count()
+    if count == 0:
+        return None, 0
+    data = bits.to_bytes(BITMAP_BYTES, 'little')
+    if count > ARRAY_MAX:
+        return bytearray(data), count
+    return _bitmap_to_array(data), count
+
+
+def _from_sorted(lows):
+    """Container for sorted, unique low bits."""
+    if len(lows) <= ARRAY_MAX:
+        return array('H', lows)
+    bits = bytearray(BITMAP_BYTES)
+    for low in lows:
+        bits[low >> 3] |= 1 << (low & 7)
+    return bits
+
+
+def _combine_containers(operation, first, second):
+    """(container, count) for first OP second; both array containers → plain set algebra."""
+    if not _is_bitmap(first) and not _is_bitmap(second):
+        if operation == '&':
+            lows = set(first).intersection(second)
+        elif operation == '|':
+            lows = set(first).union(second)
+        elif operation == '^':
+            lows = set(first).symmetric_difference(second)
+        else:
+            lows = set(first).difference(second)
+        if not lows:
+            return None, 0
+        lows = sorted(lows)
+        container = _from_sorted(lows)
+        return container, len(lows)
+    if operation == '&' and not _is_bitmap(first):  # small & big: keep the small one's IDs
+        lows = [low for low in first if _contains(second, low)]
+        return (array('H', lows), len(lows)) if lows else (None, 0)
+
+    first, second = _to_int(first), _to_int(second)
+    if operation == '&':
+        return _from_int(first & second)
+    if operation == '|':
+        return _from_int(first | second)
+    if operation == '^':
+        return _from_int(first ^ second)
+    return _from_int(first & ~second)
+
+
+def _sorted_operation(operation, first, second):
+    """first OP second for sorted, unique numpy arrays (all vectorized)."""
+    if operation in '&-':
+        if len(second) == 0:
+            return first[:0] if operation == '&' else first
+        positions = np.minimum(np.searchsorted(second, first), len(second) - 1)
+        found = second[positions] == first
+        return first[found] if operation == '&' else first[~found]
+    merged = np.sort(np.concatenate((first, second)))
+    if len(merged) == 0:
+        return merged
+    first_of_run = np.concatenate(([True], merged[1:] != merged[:-1]))
+    if operation == '|':
+        return merged[first_of_run]
+    last_of_run = np.concatenate((first_of_run[1:], [True]))
+    return merged[first_of_run & last_of_run]  # '^': IDs that are in only one of the two
+
+
+def _numpy_containers(values):
+    """(key, container, count) for every 65,536-chunk of sorted, unique uint32 IDs."""
+    if len(values) == 0:
+        return
+    highs = values >> 16
+    lows = (values & 0xFFFF).astype(np.uint16)
+    starts = np.flatnonzero(np.diff(highs)) + 1
+    bounds = [0] + starts.tolist() + [len(values)]
+    keys = highs[bounds[:-1]].tolist()
+    # Slices are made one at a time (np.split would keep thousands of arrays
+    # alive, and every garbage collection run would have to walk them)
+    for key, start, end in zip(keys, bounds, bounds[1:]):
+        if end - start <= ARRAY_MAX:
+            container = array('H')
+            container.frombytes(lows[start:end].tobytes())
+        else:
+            bits = np.zeros(1 << 16, dtype=bool)
+            bits[lows[start:end]] = True
+            container = bytearray(np.packbits(bits, bitorder='little').tobytes())
+        yield key, container, end - start
+
+
+class BitmapSet:
+    """Set of integer IDs (0 .. 2**32-1) stored as roaring-style containers."""
+
+    def __init__(self, values=()):
+        self._containers = {}  # high 16 bits → array('H') / bytearray (or memoryview after from_buffer)
+        self._counts = {}      # high 16 bits → number of IDs, for bitmap containers only
+        self._buffer = None    # the bytes / mmap that loaded containers point into
+        self.update(values)
+
+    # ---------- Single IDs ----------
+
+    def __contains__(self, value):
+        # Same as _contains(), written out: this is the hot path of lookups
+        try:
+            container = self._containers.get(value >> 16)
+        except TypeError:  # not an int
+            return False
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if len(container) == BITMAP_BYTES:
+            return container[low >> 3] >> (low & 7) & 1 == 1
+        index = bisect_left(container, low)
+        return index < len(container) and container[index] == low
+
+    def add(self, value):
+        self._check(value)
+        key, low = value >> 16, value & 0xFFFF
+        container = self._owned(key)
+        if container is None:
+            self._containers[key] = array('H', [low])
+        elif _is_bitmap(container):
+            mask = 1 << (low & 7)
+            if not container[low >> 3] & mask:
+                container[low >> 3] |= mask
+                self._counts[key] += 1
+        else:
+            index = bisect_left(container, low)
+            if index == len(container) or container[index] != low:
+                container.insert(index, low)
+                if len(container) > ARRAY_MAX:
+                    self._store(key, _from_sorted(container), len(container))
+
+    def discard(self, value):
+        if value not in self:
+            return
+        key, low = value >> 16, value & 0xFFFF
+        container = self._owned(key)
+        if _is_bitmap(container):
+            container[low >> 3] &= ~(1 << (low & 7)) & 0xFF
+            self._counts[key] -= 1
+            if self._counts[key] <= ARRAY_MAX:  # small enough again: back to an array
+                self._store(key, _bitmap_to_array(container), self._counts[key])
+        else:
+            del container[bisect_left(container, low)]
+            if not container:
+                del self._containers[key]
+
+    def remove(self, value):
+        if value not in self:
+            raise KeyError(value)
+        self.discard(value)
+
+    # ---------- Many IDs ----------
+
+    def update(self, values):
+        """Add many IDs at once (much faster than add() one by one)."""
+        if np is not None:
+            if not isinstance(values, (np.ndarray, list, tuple, range)):
+                values = list(values)  # sets, generators, ... (numpy can't read them directly)
+            values = np.asarray(values)
+            if values.size == 0:
+                return
+            if values.dtype.kind not in 'iu' or values.min() < 0 or values.max() > MAX_ID:
+                raise ValueError(f"IDs must be integers from 0 to {MAX_ID}")
+            values = np.sort(values.astype(np.uint32))  # (np.unique is much slower on big arrays)
+            values = values[np.concatenate(([True], values[1:] != values[:-1]))]
+            for key, container, count in _numpy_containers(values):
+                self._merge(key, container, count)
+            return
+
+        groups = {}
+        for value in values:
+            self._check(value)
+            groups.setdefault(value >> 16, set()).add(value & 0xFFFF)
+        for key, lows in groups.items():
+            self._merge(key, _from_sorted(sorted(lows)), len(lows))
+
+    def __len__(self):
+        return sum(self._counts[key] if _is_bitmap(container) else len(container)
+                   for key, container in self._containers.items())
+
+    def __iter__(self):
+        for key in sorted(self._containers):
+            base = key << 16
+            for low in _iter_container(self._containers[key]):
+                yield base | low
+
+    def __eq__(self, other):
+        if not isinstance(other, BitmapSet):
+            return NotImplemented
+        if self._containers.keys() != other._containers.keys():
+            return False
+        return all(bytes(container) == bytes(other._containers[key])
+                   for key, container in self._containers.items())
+
+    def __repr__(self):
+        count = len(self)
+        preview = ', '.join(str(value) for _, value in zip(range(5), self))
+        return f"BitmapSet({{{preview}{', ...' if count > 5 else ''}}}, len={count})"
+
+    def copy(self):
+        result = BitmapSet()
+        for key, container in self._containers.items():
+            owned = bytearray(container) if _is_bitmap(container) else array('H', container)
+            result._store(key, owned, self._counts.get(key, 0))
+        return result
+
+    def __and__(self, other):
+        return self._combine('&', other, self._containers.keys() & other._containers.keys())
+
+    def __or__(self, other):
+        return self._combine('|', other, self._containers.keys() | other._containers.keys())
+
+    def __xor__(self, other):
+        return self._combine('^', other, self._containers.keys() | other._containers.keys())
+
+    def __sub__(self, other):
+        return self._combine('-', other, self._containers.keys())
+
+    # ---------- Bytes / files ----------
+
+    def to_bytes(self):
+        """
+        Header, one ENTRY per container, then the containers as raw little-endian
+        bytes, each starting at a multiple of 8 (so they can be viewed in place).
+        """
+        keys = sorted(self._containers)
+        offset = HEADER.size + ENTRY.size * len(keys)
+        entries, payloads = [], []
+        for key in keys:
+            container = self._containers[key]
+            if _is_bitmap(container):
+                count, payload = self._counts[key], bytes(container)
+            else:
+                count, payload = len(container), self._little_endian(container)
+            padding = -offset % ALIGN
+            offset += padding
+            entries.append(ENTRY.pack(key, count, offset))
+            payloads.append(b'\0' * padding + payload)
+            offset += len(payload)
+        return b''.join([HEADER.pack(FILE_MAGIC, len(keys))] + entries + payloads)
+
+    @classmethod
+    def from_buffer(cls, data):
+        """
+        Set backed by data (bytes, bytearray, mmap, ...) WITHOUT copying it:
+        the containers are memoryviews into data. Keep data unchanged while the set is used.
+        """
+        view = memoryview(data).cast('B')
+        magic, number = HEADER.unpack_from(view, 0)
+        if magic != FILE_MAGIC:
+            raise ValueError("Not a BitmapSet buffer")
+        result = cls()
+        result._buffer = data
+        for position in range(number):
+            key, count, offset = ENTRY.unpack_from(view, HEADER.size + position * ENTRY.size)
+            if count > ARRAY_MAX:
+                container = view[offset:offset + BITMAP_BYTES]
+                result._counts[key] = count
+            else:
+                container = view[offset:offset + 2 * count]
+                if sys.byteorder == 'little':
+                    container = container.cast('H')
+                else:  # the file is little-endian: copy and swap on big-endian machines
+                    container = array('H', bytes(container))
+                    container.byteswap()
+            if len(container) != (BITMAP_BYTES if count > ARRAY_MAX else count):
+                raise ValueError("BitmapSet buffer is truncated")
+            result._containers[key] = container
+        return result
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map the file read-only: loading is instant, pages are read when used."""
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(data)
+
+    def memory_bytes(self):
+        """Approximate memory used by the containers (not counting a mapped file)."""
+        return sum(sys.getsizeof(container) for container in self._containers.values()) \
+            + sys.getsizeof(self._containers) + sys.getsizeof(self._counts)
+
+    # ---------- Internals ----------
+
+    @staticmethod
+    def _check(value):
+        if not isinstance(value, int) or not 0 <= value <= MAX_ID:
+            raise ValueError(f"IDs must be integers from 0 to {MAX_ID}, got {value!r}")
+
+    @staticmethod
+    def _little_endian(container):
+        if sys.byteorder == 'big':
+            container = array('H', container)
+            container.byteswap()
+        return bytes(container)
+
+    def _store(self, key, container, count):
+        self._containers[key] = container
+        if _is_bitmap(container):
+            self._counts[key] = count
+        else:
+            self._counts.pop(key, None)
+
+    def _owned(self, key):
+        """The container for key, copied first if it still points into a loaded buffer (copy-on-write)."""
+        container = self._containers.get(key)
+        if isinstance(container, memoryview):
+            container = bytearray(container) if _is_bitmap(container) else array('H', container)
+            self._containers[key] = container
+        return container
+
+    def _merge(self, key, container, count):
+        """Union a new container (holding count IDs) into key."""
+        current = self._containers.get(key)
+        if current is not None:
+            container, count = _combine_containers('|', current, container)
+        self._store(key, container, count)
+
+    @staticmethod
+    def _counts_of(container):
+        if _is_bitmap(container):
+            return int.from_bytes(container, 'little').bit_count()
+        return len(container)
+
+    def _combine(self, operation, other, keys):
+        if not isinstance(other, BitmapSet):
+            return NotImplemented
+        result = BitmapSet()
+        if np is not None:
+            # Keys without any bitmap container (sparse sets: thousands of tiny arrays)
+            # are combined in ONE vectorized step instead of one small step per key
+            small = [key for key in keys
+                     if not _is_bitmap(self._containers.get(key, ())) and not _is_bitmap(other._containers.get(key, ()))]
+            values = _sorted_operation(operation, self._sorted_values(small), other._sorted_values(small))
+            for key, container, count in _numpy_containers(values):
+                result._store(key, container, count)
+            keys = set(keys).difference(small)
+        for key in keys:
+            first, second = self._containers.get(key), other._containers.get(key)
+            if first is None or second is None:  # only in one of the two sets
+                present = first if first is not None else second
+                if operation in '|^' or (operation == '-' and second is None):
+                    owned = bytearray(present) if _is_bitmap(present) else array('H', present)
+                    result._store(key, owned, self._counts_of(owned))
+                continue
+            container, count = _combine_containers(operation, first, second)
+            if container is not None:
+                result._store(key, container, count)
+        return result
+
+    def _sorted_values(self, keys):
+        """All IDs of the (array) containers of keys, as one sorted uint32 numpy array."""
+        keys = sorted(key for key in keys if key in self._containers)
+        containers = [self._containers[key] for key in keys]
+        lows = np.frombuffer(b''.join(containers), dtype=np.uint16)  # native order, like array('H')
+        highs = np.repeat(np.array(keys, dtype=np.uint32) << 16, [len(container) for container in containers])
+        return highs | lows
+
+
+if __name__ == "__main__":
+    ids = BitmapSet(range(0, 1_000_000, 3))
+    print(ids)
+    print("3 in ids:", 3 in ids, "| 4 in ids:", 4 in ids)
+    evens = BitmapSet(range(0, 1_000_000, 2))
+    print("multiples of 6:", len(ids & evens))      # 166667
+    print("union:", len(ids | evens))              # 666667
+    copy = BitmapSet.from_buffer(ids.to_bytes())   # zero-copy view of the bytes
+    print("round trip equal:", copy == ids)
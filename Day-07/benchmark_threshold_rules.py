@@ -0,0 +1,130 @@
+# benchmark_threshold_rules.py
+# ----------------------------------------------------
+# if/elif chain vs compiled threshold tables on millions of metric samples
+#
+#   if/elif loop    → the task-03 chain, one Python comparison chain per sample
+#   table (bisect)  → ThresholdTable called per sample
+#   numpy.select    → the usual hand-written vectorized chain
+#   table (numpy)   → classify_codes(): one searchsorted pass (+ nested tables)
+#
+# Checks that every method gives the same labels.
+#
+# Run:
+#   python benchmark_threshold_rules.py
+#   python benchmark_threshold_rules.py --samples 10000000
+# ----------------------------------------------------
+
+import argparse
+import time
+
+import numpy as np
+
+from threshold_rules import compile_table
+
+SEVERITY = {
+    'field': 'value',
+    'default': 'ok',
+    'bands': [
+        {'min': 50, 'label': 'notice'},
+        {'min': 70, 'label': 'warning'},
+        {'min': 85, 'label': 'high'},
+        {'min': 95, 'label': 'critical'},
+    ],
+}
+
+# Nested: high CPU only counts as critical when it lasted 5 minutes or more
+CPU_ALERT = {
+    'field': 'cpu',
+    'default': 'ok',
+    'bands': [
+        {'min': 70, 'label': 'warning'},
+        {'min': 90, 'then': {'field': 'minutes', 'default': 'warning',
+                             'bands': [{'min': 5, 'label': 'critical'}]}},
+    ],
+}
+
+
+def severity_chain(value):
+    if value >= 95:
+        return 'critical'
+    elif value >= 85:
+        return 'high'
+    elif value >= 70:
+        return 'warning'
+    elif value >= 50:
+        return 'notice'
+    else:
+        return 'ok'
+
+
+def cpu_alert_chain(cpu, minutes):
+    if cpu >= 90:
+        if minutes >= 5:
+            return 'critical'
+        return 'warning'
+    elif cpu >= 70:
+        return 'warning'
+    else:
+        return 'ok'
+
+
+def severity_select(values):
+    conditions = [values >= 95, values >= 85, values >= 70, values >= 50]
+    return np.select(conditions, ['critical', 'high', 'warning', 'notice'], default='ok')
+
+
+def timed(label, function, samples):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<18} {elapsed:8.3f} s  {samples / elapsed / 1e6:8.2f} M samples/s")
+    return result, elapsed
+
+
+def run(samples=5_000_000, loop_samples=1_000_000, seed=7):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0, 100, samples)
+    minutes = rng.integers(0, 15, samples)
+    loop_values = values[:loop_samples].tolist()
+    loop_minutes = minutes[:loop_samples].tolist()
+
+    table = compile_table(SEVERITY)
+    print(f"Single field, {len(SEVERITY['bands'])} bands "
+          f"(loops on {loop_samples:,} samples, arrays on {samples:,}):")
+    chain, chain_time = timed('if/elif loop', lambda: [severity_chain(value) for value in loop_values], loop_samples)
+    scalar, _ = timed('table (bisect)', lambda: [table({'value': value}) for value in loop_values], loop_samples)
+    selected, _ = timed('numpy.select', lambda: severity_select(values), samples)
+    codes, table_time = timed('table (numpy)', lambda: table.classify_codes({'value': values}), samples)
+    labels = np.asarray(table.labels)[codes]
+    assert scalar == chain
+    assert labels[:loop_samples].tolist() == chain
+    assert (labels == selected).all()
+    counts = dict(zip(table.labels, np.bincount(codes, minlength=len(table.labels)).tolist()))
+    print(f"  → {chain_time / loop_samples * samples / table_time:.0f}x faster than the if/elif loop; {counts}\n")
+
+    nested = compile_table(CPU_ALERT)
+    print("Nested (cpu, then minutes):")
+    chain, chain_time = timed('if/elif loop',
+                              lambda: [cpu_alert_chain(cpu, mins) for cpu, mins in zip(loop_values, loop_minutes)],
+                              loop_samples)
+    scalar, _ = timed('table (bisect)',
+                      lambda: [nested({'cpu': cpu, 'minutes': mins}) for cpu, mins in zip(loop_values, loop_minutes)],
+                      loop_samples)
+    codes, table_time = timed('table (numpy)', lambda: nested.classify_codes({'cpu': values, 'minutes': minutes}),
+                              samples)
+    labels = np.asarray(nested.labels)[codes]
+    assert scalar == chain
+    assert labels[:loop_samples].tolist() == chain
+    print(f"  → {chain_time / loop_samples * samples / table_time:.0f}x faster than the if/elif loop")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark threshold tables against if/elif chains')
+    parser.add_argument('--samples', type=int, default=5_000_000, help='samples for the array methods')
+    parser.add_argument('--loop-samples', type=int, default=1_000_000, help='samples for the Python loops')
+    args = parser.parse_args()
+    run(args.samples, min(args.loop_samples, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# threshold_rules.py
+# ----------------------------------------------------
+# Declarative threshold tables (the if / elif / else chain of task-03, as data)
+#
+# task-03-if-elif-else.py grades marks with a hand-written chain:
+#     if marks >= 90: "A"  elif marks >= 75: "B"  elif marks >= 50: "C"  else: "F"
+# We write the same chains for alert severities. Here the chain is a TABLE:
+#
+#     grade:
+#       field: marks
+#       default: F
+#       bands:
+#         - {min: 90, label: A}      # marks >= 90
+#         - {min: 75, label: B}
+#         - {min: 50, label: C}
+#
+# Each band has a threshold:  min: x  → value >= x     above: x  → value > x
+# and a result:               label: ...               then: {a nested table}
+# "then" is a nested if (task-04): the nested table is only checked when
+# its band matched, on the same field or on another field of the record.
+# The band with the highest threshold that matches wins - exactly what an
+# if/elif chain written from the highest threshold down does. No match (or
+# NaN, where every comparison is False) → default.
+#
+# Compiling turns each table into a SORTED list of boundaries:
+# - one value:     bisect.bisect_right(boundaries, value)   O(log n) per value
+# - whole arrays:  numpy.searchsorted(boundaries, values)   one vectorized pass
+#
+# Usage:
+#   tables = load_rules('threshold_rules.yaml')        # {name: ThresholdTable}
+#   tables['grade'](82)                                # 'B'
+#   tables['cpu_alert']({'cpu': 95, 'minutes': 10})    # 'critical'
+#   tables['grade'].classify_array(marks_array)        # array of labels
+#
+#   python threshold_rules.py threshold_rules.yaml grade 82 45 97
+#   python threshold_rules.py threshold_rules.yaml cpu_alert cpu=95,minutes=10
+#
+# Requirements: pip install numpy pyyaml (pyyaml only for .yaml files;
+# without numpy, classify_array() falls back to a loop)
+# ----------------------------------------------------
+
+import argparse
+import json
+import math
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # classify_array() falls back to a Python loop
+    np = None
+
+try:
+    import yaml
+except ImportError:  # only needed for .yaml / .yml rule files
+    yaml = None
+
+TABLE_KEYS = {'field', 'default', 'bands'}
+BAND_KEYS = {'min', 'above', 'label', 'then'}
+
+
+class ThresholdTable:
+    """
+    One compiled table. Call it with a number (single-field tables) or a
+    record {field: value}; classify_array() / classify_codes() take arrays.
+    """
+
+    def __init__(self, field, boundaries, outcomes, labels):
+        self.field = field            # None → the value itself is classified
+        self.boundaries = boundaries  # sorted ascending, all ">=" (see _boundary)
+        self.outcomes = outcomes      # len(boundaries) + 1: label code or nested table; [0] = default
+        self.labels = labels          # label code → label, shared by the whole tree of tables
+        self._nested = [(position, outcome) for position, outcome in enumerate(outcomes)
+                        if isinstance(outcome, ThresholdTable)]
+        self.fields = {field}.union(*(table.fields for _, table in self._nested))
+        if np is not None:
+            self._boundary_array = np.array(boundaries, dtype=np.float64)
+            self._code_array = np.array([-1 if isinstance(outcome, ThresholdTable) else outcome
+                                         for outcome in outcomes], dtype=np.intp)
+
+    def __repr__(self):
+        return f"ThresholdTable(field={self.field!r}, boundaries={self.boundaries}, labels={self.labels})"
+
+    def __call__(self, value):
+        """Label for one number or one record (dict)."""
+        number = value[self.field] if self.field is not None else value
+        # number != number only for NaN: no threshold matches, like in an if/elif chain
+        position = bisect_right(self.boundaries, number) if number == number else 0
+        outcome = self.outcomes[position]
+        if isinstance(outcome, ThresholdTable):
+            return outcome(value)
+        return self.labels[outcome]
+
+    def classify_codes(self, values):
+        """
+        Label CODES (indexes into .labels) for a whole array, or for a dict of
+        equal-length columns {field: array}. Cheapest way to count labels:
+            numpy.bincount(table.classify_codes(values), minlength=len(table.labels))
+        """
+        if np is None:
+            raise RuntimeError("classify_codes() needs numpy (pip install numpy)")
+        if isinstance(values, dict):
+            columns = {field: np.asarray(values[field]) for field in self.fields}
+        else:
+            columns = {None: np.asarray(values)}
+            if self.fields != {None}:
+                raise ValueError(f"This table needs a dict of columns: {sorted(self.fields)}")
+        return self._codes(columns)
+
+    def classify_array(self, values):
+        """Labels for a whole array (or dict of columns): one label per row."""
+        if np is None:
+            if isinstance(values, dict):
+                rows = zip(*(values[field] for field in self.fields))
+                return [self(dict(zip(self.fields, row))) for row in rows]
+            return [self(value) for value in values]
+        return np.asarray(self.labels)[self.classify_codes(values)]
+
+    def _codes(self, columns):
+        values = columns[self.field]
+        positions = np.searchsorted(self._boundary_array, values, side='right')
+        if values.dtype.kind == 'f':
+            positions[np.isnan(values)] = 0  # NaN sorts after everything in searchsorted
+        codes = self._code_array[positions]
+        for position, table in self._nested:
+            rows = np.flatnonzero(positions == position)
+            if rows.size:
+                codes[rows] = table._codes({field: columns[field][rows] for field in table.fields})
+        return codes
+
+
+def _boundary(band):
+    """'min: x' → x, 'above: x' → the next float after x (value > x  ⇔  value >= nextafter(x))."""
+    if ('min' in band) == ('above' in band):
+        raise ValueError(f"Each band needs exactly one of 'min' or 'above': {band}")
+    threshold = band['min'] if 'min' in band else band['above']
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or math.isnan(threshold):
+        raise ValueError(f"Threshold must be a number: {band}")
+    threshold = float(threshold)
+    return threshold if 'min' in band else math.nextafter(threshold, math.inf)
+
+
+def compile_table(spec, labels=None, parent_field=None):
+    """Compile one table spec (dict, e.g. from YAML/JSON) into a ThresholdTable."""
+    labels = [] if labels is None else labels
+    if not isinstance(spec, dict):
+        raise ValueError(f"A table must be a mapping, got {spec!r}")
+    unknown = set(spec) - TABLE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown table keys: {sorted(unknown)}")
+    field = spec.get('field', parent_field)  # nested tables check the parent's field by default
+
+    def outcome_of(result, label_key):
+        if label_key == 'then':
+            return compile_table(result, labels, field)
+        if result not in labels:
+            labels.append(result)
+        return labels.index(result)
+
+    bands = []
+    for band in spec.get('bands', []):
+        unknown = set(band) - BAND_KEYS
+        if unknown:
+            raise ValueError(f"Unknown band keys: {sorted(unknown)}")
+        if ('label' in band) == ('then' in band):
+            raise ValueError(f"Each band needs exactly one of 'label' or 'then': {band}")
+        key = 'label' if 'label' in band else 'then'
+        bands.append((_boundary(band), key, band[key]))
+    bands.sort(key=lambda band: band[0])
+    boundaries = [boundary for boundary, _, _ in bands]
+    if len(set(boundaries)) != len(boundaries):
+        raise ValueError(f"Two bands have the same threshold in table {spec}")
+
+    outcomes = [outcome_of(spec.get('default'), 'label')]
+    outcomes += [outcome_of(result, key) for _, key, result in bands]
+    return ThresholdTable(field, boundaries, outcomes, labels)
+
+
+def compile_rules(specs):
+    """{name: table spec} → {name: ThresholdTable}"""
+    return {name: compile_table(spec) for name, spec in specs.items()}
+
+
+def load_rules(path):
+    """Load and compile every table of a .yaml/.yml or .json rules file."""
+    with open(path) as file:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise RuntimeError("Reading YAML rules needs pyyaml (pip install pyyaml)")
+            specs = yaml.safe_load(file)
+        else:
+            specs = json.load(file)
+    return compile_rules(specs)
+
+
+def parse_sample(text):
+    """'82' → 82.0,  'cpu=95,minutes=10' → {'cpu': 95.0, 'minutes': 10.0}"""
+    if '=' not in text:
+        return float(text)
+    return {name: float(value) for name, value in (pair.split('=', 1) for pair in text.split(','))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Classify values with a threshold table')
+    parser.add_argument('rules', help='.yaml or .json rules file')
+    parser.add_argument('table', help='table name in the rules file')
+    parser.add_argument('samples', nargs='+', help='numbers, or NAME=VALUE,NAME=VALUE records')
+    args = parser.parse_args()
+
+    tables = load_rules(args.rules)
+    if args.table not in tables:
+        parser.error(f"No table {args.table!r}, choose from {sorted(tables)}")
+    for sample in args.samples:
+        print(f"{sample} → {tables[args.table](parse_sample(sample))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmark_tree_scanner.py
+# ----------------------------------------------------
+# Compare directory inventory approaches on a synthetic deep + wide tree:
+#
+# - listdir+stat: os.listdir() per folder + os.stat() per name, recursive
+#                 (the 03-list-files-in-folders.py approach made recursive)
+# - scandir x1:   tree_scanner.scan_tree() with 1 worker
+# - scandir xN:   tree_scanner.scan_tree() with N workers
+# then checks that a scan of several roots (one of them missing) finds everything
+#
+# Run:
+#   python benchmark_tree_scanner.py                        # depth 4, fan-out 6, 20 files/folder
+#   python benchmark_tree_scanner.py --depth 5 --fanout 8 --workers 16
+# ----------------------------------------------------
+
+import argparse
+import os
+import shutil
+import stat as stat_module
+import tempfile
+import time
+
+from tree_scanner import scan_tree
+
+
+def make_tree(root, depth, fanout, files):
+    """Every folder gets 'files' small files and 'fanout' sub-folders, down to 'depth' levels."""
+    folders = 0
+    level = [root]
+    for current_depth in range(depth + 1):
+        next_level = []
+        for folder in level:
+            folders += 1
+            for number in range(files):
+                with open(os.path.join(folder, f'file-{number}.log'), 'w') as file:
+                    file.write('x' * number)
+            if current_depth < depth:
+                for number in range(fanout):
+                    child = os.path.join(folder, f'dir-{number}')
+                    os.mkdir(child)
+                    next_level.append(child)
+        level = next_level
+    return folders
+
+
+def listdir_inventory(root):
+    """Baseline: os.listdir + os.stat for every name, recursive."""
+    count = 0
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            info = os.lstat(path)
+            if stat_module.S_ISDIR(info.st_mode):
+                stack.append(path)
+            else:
+                count += 1
+    return count
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed:8.3f} s  {count:>9} files  {count / elapsed:>10.0f} files/sec")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark recursive directory inventory')
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--files', type=int, default=20, help='files per folder')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='scan-bench-')
+    try:
+        folders = make_tree(root, args.depth, args.fanout, args.files)
+        print(f"Tree: {folders} folders, {folders * args.files} files\n")
+        expected = timed('listdir+stat', lambda: listdir_inventory(root))
+        for workers in (1, args.workers):
+            count = timed(f'scandir x{workers}', lambda: sum(1 for _ in scan_tree(root, workers=workers)))
+            assert count == expected, "scanner missed files"
+
+        # Several roots, the first one missing (finishes at once): every root must be scanned
+        roots = [os.path.join(root, 'missing')] + [os.path.join(root, f'dir-{n}') for n in range(args.fanout)]
+        for _ in range(20):
+            records = list(scan_tree(roots, workers=args.workers))
+            assert len(records) == expected - args.files + 1, "scanner stopped before the last root"
+        print(f"multi-root     ok ({len(roots)} roots, 20 runs)")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
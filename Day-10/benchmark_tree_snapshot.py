@@ -0,0 +1,85 @@
+# benchmark_tree_snapshot.py
+# ----------------------------------------------------
+# Show that a TreeSnapshot rescan (tree_snapshot.py) costs time proportional
+# to the CHANGES, not to the size of the tree.
+#
+# - full scan:        tree_scanner.scan_tree() lists every file again
+# - rescan (k files): add k new files in k different folders, then rescan
+# - rescan --verify:  no changes, but stat() every known file too
+#
+# Run:
+#   python benchmark_tree_snapshot.py                      # ~100k files
+#   python benchmark_tree_snapshot.py --depth 4 --fanout 8 --files 50
+# ----------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmark_tree_scanner import make_tree
+from tree_scanner import scan_tree
+from tree_snapshot import TreeSnapshot
+
+
+def backdate(folders, seconds):
+    """
+    Make folders look old, like a tree written long before the scan (folders
+    changed within the last seconds are always re-listed, see RACY_WINDOW_NS).
+    """
+    past = time.time() - seconds
+    for folder in folders:
+        os.utime(folder, (past, past))
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1e3:10.1f} ms   {result}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark incremental snapshot rescans')
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--files', type=int, default=60, help='files per folder')
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='snapshot-bench-')
+    root = os.path.join(work, 'tree')
+    os.mkdir(root)
+    try:
+        folders = make_tree(root, args.depth, args.fanout, args.files)
+        all_folders = sorted(folder for folder, _, _ in os.walk(root))
+        backdate(all_folders, 3600)
+        print(f"Tree: {folders} folders, {folders * args.files} files\n")
+
+        snapshot = TreeSnapshot(os.path.join(work, 'snapshot.db'))
+        count = lambda records: sum(1 for _ in records)
+        timed('full scan (scan_tree)', lambda: f"{count(scan_tree(root))} files")
+        timed('first snapshot', lambda: f"{count(snapshot.rescan(root))} changes")
+        timed('rescan, no changes', lambda: f"{count(snapshot.rescan(root))} changes")
+
+        for round_number, changed in enumerate((1, 10, 100, 1000)):
+            touched = set()
+            for number in range(changed):
+                folder = all_folders[number * len(all_folders) // changed]
+                with open(os.path.join(folder, f'new-{changed}-{number}.log'), 'w') as file:
+                    file.write('new')
+                touched.add(folder)
+            backdate(touched, 3000 - round_number)
+            timed(f'rescan, {changed} added', lambda: f"{count(snapshot.rescan(root))} changes, "
+                                                      f"{snapshot.stats['dirs_listed']} folders listed")
+
+        timed('rescan --verify', lambda: f"{count(snapshot.rescan(root, verify=True))} changes, "
+                                         f"{snapshot.stats['files_verified']} files verified")
+        snapshot.close()
+    finally:
+        shutil.rmtree(work)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# tree_scanner.py
+# ----------------------------------------------------
+# Recursive, parallel directory inventory (big brother of 03-list-files-in-folders.py)
+#
+# 03-list-files-in-folders.py lists ONE level of each folder with os.listdir()
+# and keeps the names in a list. On log/artifact volumes with millions of
+# entries we need more:
+#
+# - recursive: every sub-folder is scanned too
+# - os.scandir(): each DirEntry already knows if it is a file or folder
+#   (no extra stat() call for that), and entry.stat() is cached on the entry
+# - parallel: folders are put on a shared work queue; whichever worker thread
+#   is idle takes the next folder, and each folder it finds becomes new work
+#   (idle workers "steal" work instead of waiting on one big subtree)
+# - streaming: scan_tree() is a generator, records come out while the scan
+#   is still running, nothing is collected into a huge list
+# - errors are records too: a missing or unreadable folder produces
+#   {"path": ..., "error": "Permission denied"} and the scan continues
+#
+# Output format: NDJSON (one JSON object per line)
+#   {"path": "/var/log/syslog", "size": 12345, "mtime": 1700000000.0}
+#
+# Run:
+#   python tree_scanner.py /var/log /etc > inventory.ndjson
+#   python tree_scanner.py            # asks for folder paths, like 03-list-files-in-folders.py
+# ----------------------------------------------------
+
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+BATCH_SIZE = 1000  # records per queue message (fewer, bigger messages = less locking)
+_DONE = object()   # marks the end of the scan on the output queue
+
+
+def error_record(path, error):
+    """Per-entry error record; keeps the messages of 03-list-files-in-folders.py."""
+    if isinstance(error, FileNotFoundError):
+        message = "Folder not found"
+    elif isinstance(error, PermissionError):
+        message = "Permission denied"
+    else:
+        message = str(error)
+    return {"path": path, "error": message}
+
+
+def scan_directory(path):
+    """
+    Scan ONE folder. Returns (records, sub_folders).
+    Files (and symlinks, not followed) become records; folders are returned for scanning.
+    """
+    records, sub_folders = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):  # uses d_type, no stat() call
+                        sub_folders.append(entry.path)
+                        continue
+                    stat = entry.stat(follow_symlinks=False)   # cached on the DirEntry
+                    records.append({"path": entry.path, "size": stat.st_size, "mtime": stat.st_mtime})
+                except OSError as error:
+                    records.append(error_record(entry.path, error))
+    except OSError as error:
+        records.append(error_record(path, error))
+    return records, sub_folders
+
+
+def scan_tree(roots, workers=8, max_pending=64):
+    """
+    Generator: yield one record dict per file (or error) under every root.
+    'workers' threads scan folders in parallel; at most 'max_pending' batches
+    wait in memory when the consumer is slower than the scan.
+    """
+    if isinstance(roots, str):
+        roots = [roots]
+    if not roots:
+        return
+
+    output = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+    pending = [0]              # folders submitted but not finished yet
+    lock = threading.Lock()
+    pool = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(path):
+        with lock:
+            pending[0] += 1
+        pool.submit(work, path)
+
+    def put(item):
+        # Block while the consumer catches up, but give up if the scan was stopped
+        while not stop.is_set():
+            try:
+                output.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def work(path):
+        try:
+            if stop.is_set():
+                return
+            records, sub_folders = scan_directory(path)
+            for sub_folder in sub_folders:
+                submit(sub_folder)  # new work for any idle worker
+            for start in range(0, len(records), BATCH_SIZE):
+                put(records[start:start + BATCH_SIZE])
+        except BaseException as error:  # never lose the "finished" bookkeeping
+            put([error_record(path, error)])
+        finally:
+            with lock:
+                pending[0] -= 1
+                finished = pending[0] == 0
+            if finished:
+                put(_DONE)
+
+    # Count every root before the first one starts: otherwise a worker that finishes
+    # the first root before the next is submitted sees pending == 0 and ends the scan
+    with lock:
+        pending[0] = len(roots)
+    for root in roots:
+        pool.submit(work, root)
+
+    try:
+        while True:
+            batch = output.get()
+            if batch is _DONE:
+                break
+            yield from batch
+    finally:
+        # Consumer stopped early (or finished): tell workers to quit, don't wait for them
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def write_ndjson(records, stream):
+    """Write records as NDJSON; returns how many lines were written."""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record) + "\n")
+        count += 1
+    return count
+
+
+def main():
+    # Folder paths from the command line, or ask like 03-list-files-in-folders.py does
+    folder_paths = sys.argv[1:] or input("Enter a list of folder paths separated by spaces: ").split()
+    write_ndjson(scan_tree(folder_paths), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
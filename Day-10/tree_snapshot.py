@@ -0,0 +1,256 @@
+# tree_snapshot.py
+# ----------------------------------------------------
+# Incremental directory snapshot + change detection
+#
+# 03-list-files-in-folders.py (and tree_scanner.py) list EVERYTHING on every
+# run. When a job re-lists the same folders every few minutes just to find
+# what is new, most of that work is wasted. Here we keep a snapshot in a
+# small SQLite database and only report what changed:
+#
+#   {"change": "added",    "path": "/var/log/app/new.log", "size": 120, "mtime": ..., "inode": ...}
+#   {"change": "modified", "path": "/var/log/app/app.log", "size": 990, "mtime": ..., "inode": ...}
+#   {"change": "removed",  "path": "/var/log/app/old.log", "size": 512, "mtime": ..., "inode": ...}
+#
+# How a rescan stays cheap:
+# - the snapshot stores every folder's mtime. A folder's mtime changes when a
+#   file is created, deleted or renamed IN that folder.
+# - for each known folder we do ONE stat(). If its mtime did not change, we
+#   do not list it again; we go straight to its known sub-folders.
+# - only folders whose mtime changed are listed (os.scandir) and compared
+#   with the rows stored for them.
+# So a rescan costs one stat() per folder + work proportional to the changes,
+# instead of one stat() per FILE.
+#
+# Important: writing INTO an existing file does not change its folder's
+# mtime. Use --verify (verify=True) to also stat() every known file in
+# unchanged folders (still no directory listing), e.g. for app.log growing.
+#
+# Database tables (sorted by primary key, WITHOUT ROWID = compact):
+#   dirs(path, mtime_ns)
+#   files(dir, name, size, mtime_ns, inode)
+#
+# Run:
+#   python tree_snapshot.py snapshot.db /var/log            # first run: everything is "added"
+#   python tree_snapshot.py snapshot.db /var/log            # later runs: only the changes
+#   python tree_snapshot.py snapshot.db /var/log --verify   # also catch files modified in place
+# ----------------------------------------------------
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from tree_scanner import error_record, write_ndjson
+
+# A folder changed less than this long before the scan may change again
+# within the same mtime tick; it is stored as RELIST so the next run lists it anyway.
+RACY_WINDOW_NS = 2 * 10**9
+RELIST = -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    dir      TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode    INTEGER NOT NULL,
+    PRIMARY KEY (dir, name)
+) WITHOUT ROWID;
+"""
+
+
+def list_directory(path):
+    """scandir ONE folder. Returns ({name: (size, mtime_ns, inode)}, [sub-folder paths])."""
+    files, sub_folders = {}, []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    sub_folders.append(entry.path)
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue  # vanished between listing and stat: it will show up as not there
+            files[entry.name] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    return files, sub_folders
+
+
+def change_record(change, path, info):
+    size, mtime_ns, inode = info
+    return {"change": change, "path": path, "size": size, "mtime": mtime_ns / 1e9, "inode": inode}
+
+
+class TreeSnapshot:
+    """SQLite-backed snapshot of one or more folder trees."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self.stats = {}
+
+    def rescan(self, roots, verify=False):
+        """
+        Generator: compare the folders under 'roots' with the snapshot, yield one
+        change record per added / modified / removed file, and update the snapshot.
+        Unreadable folders yield an error record (see tree_scanner.error_record).
+        """
+        if isinstance(roots, str):
+            roots = [roots]
+        self.stats = {'dirs_checked': 0, 'dirs_listed': 0, 'files_verified': 0, 'changes': 0}
+        try:
+            for root in roots:
+                for record in self._rescan_root(os.path.abspath(root), verify):
+                    if 'change' in record:
+                        self.stats['changes'] += 1
+                    yield record
+        finally:
+            # Folders are written only after all their changes were yielded,
+            # so stopping early just means the rest is looked at next time.
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ---------- Internals ----------
+
+    def _rescan_root(self, root, verify):
+        # All known folders under root: primary-key range scan, "root/" .. "root0"
+        known = dict(self._db.execute(
+            "SELECT path, mtime_ns FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+            (root, root + os.sep, root + chr(ord(os.sep) + 1))))
+        children = {}
+        for path in known:
+            if path != root:
+                children.setdefault(os.path.dirname(path), []).append(path)
+
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+        stack = [root]
+        while stack:
+            folder = stack.pop()
+            self.stats['dirs_checked'] += 1
+            try:
+                mtime_ns = os.stat(folder).st_mtime_ns
+            except FileNotFoundError:
+                # Gone since the last scan: everything below it is removed
+                yield from self._remove_subtree(folder, known, children)
+                continue
+            except OSError as error:
+                yield error_record(folder, error)
+                continue
+
+            if known.get(folder) == mtime_ns:
+                # Nothing created/deleted/renamed here: skip the listing
+                stack.extend(children.get(folder, ()))
+                if verify:
+                    yield from self._verify_files(folder)
+                continue
+
+            self.stats['dirs_listed'] += 1
+            try:
+                files, sub_folders = list_directory(folder)
+            except OSError as error:
+                yield error_record(folder, error)  # keep the old rows until it is readable again
+                continue
+            yield from self._compare_files(folder, files)
+
+            current = set(sub_folders)
+            for old_folder in children.get(folder, ()):
+                if old_folder not in current:
+                    yield from self._remove_subtree(old_folder, known, children)
+            stack.extend(sub_folders)
+
+            self._db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)",
+                             (folder, mtime_ns if mtime_ns < racy_after else RELIST))
+
+    def _stored_files(self, folder):
+        rows = self._db.execute("SELECT name, size, mtime_ns, inode FROM files WHERE dir = ?", (folder,))
+        return {name: (size, mtime_ns, inode) for name, size, mtime_ns, inode in rows}
+
+    def _compare_files(self, folder, files):
+        """Compare a fresh listing of folder with its stored rows."""
+        old = self._stored_files(folder)
+        changes, upserts = [], []
+        for name, info in files.items():
+            before = old.pop(name, None)
+            if before == info:
+                continue
+            changes.append(change_record('added' if before is None else 'modified',
+                                         os.path.join(folder, name), info))
+            upserts.append((folder, name) + info)
+        for name, before in old.items():
+            changes.append(change_record('removed', os.path.join(folder, name), before))
+
+        yield from changes
+        self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", upserts)
+        self._db.executemany("DELETE FROM files WHERE dir = ? AND name = ?",
+                             [(folder, name) for name in old])
+
+    def _verify_files(self, folder):
+        """stat() the known files of an unchanged folder (catches in-place writes)."""
+        changes, upserts, deletes = [], [], []
+        for name, before in self._stored_files(folder).items():
+            path = os.path.join(folder, name)
+            self.stats['files_verified'] += 1
+            try:
+                stat = os.lstat(path)
+            except FileNotFoundError:
+                changes.append(change_record('removed', path, before))
+                deletes.append((folder, name))
+                continue
+            info = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            if info != before:
+                changes.append(change_record('modified', path, info))
+                upserts.append((folder, name) + info)
+
+        yield from changes
+        self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", upserts)
+        self._db.executemany("DELETE FROM files WHERE dir = ? AND name = ?", deletes)
+
+    def _remove_subtree(self, folder, known, children):
+        """Report every stored file under folder as removed and forget the folders."""
+        folders, stack = [], [folder]
+        while stack:
+            path = stack.pop()
+            folders.append(path)
+            stack.extend(children.pop(path, ()))
+
+        for path in folders:
+            for name, before in self._stored_files(path).items():
+                yield change_record('removed', os.path.join(path, name), before)
+        for path in folders:
+            known.pop(path, None)
+            self._db.execute("DELETE FROM files WHERE dir = ?", (path,))
+            self._db.execute("DELETE FROM dirs WHERE path = ?", (path,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report files added/modified/removed since the last run')
+    parser.add_argument('db', help='snapshot database (created on the first run)')
+    parser.add_argument('folders', nargs='+', help='folders to scan')
+    parser.add_argument('--verify', action='store_true',
+                        help='also stat files in unchanged folders (catches in-place writes)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with TreeSnapshot(args.db) as snapshot:
+        write_ndjson(snapshot.rescan(args.folders, verify=args.verify), sys.stdout)
+        elapsed = time.perf_counter() - start
+        print(f"{elapsed:.3f} s: {snapshot.stats}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,33 +4,29 @@
 
 import requests
 
-# URL to fetch pull requests from the GitHub API
-url = 'https://api.github.com/repos/kubernetes/kubernetes/pulls'
-
-# Make a GET request to fetch pull request data from GitHub
-# For private repos or higher rate limits, add headers={'Authorization': 'token YOUR_TOKEN'}
-response = requests.get(url)
-
-# Check if the request was successful
-if response.status_code == 200:
-    # Convert the JSON response into a Python dictionary (list of PRs)
-    pull_requests = response.json()
-
-    # Dictionary to store PR creators and their counts
-    pr_creators = {}
-
-    # Loop through each pull request
-    for pull in pull_requests:
-        creator = pull['user']['login']  # Get username of PR creator
-        if creator in pr_creators:
-            pr_creators[creator] += 1  # Increment count if already present
-        else:
-            pr_creators[creator] = 1   # Add new creator with count 1
+from http_cache import ResponseCache
+from pr_fetcher import GITHUB_PULLS_URL, fetch_pr_creators_concurrent
 
+# URL to fetch pull requests from the GitHub API
+url = GITHUB_PULLS_URL
+
+# A single GET only returns the first page (30 PRs by default).
+# fetch_pr_creators_concurrent (see pr_fetcher.py) asks for 100 PRs per page,
+# follows GitHub's "Link" pagination header and fetches all pages concurrently
+# over one pooled requests.Session.
+# For private repos or higher rate limits, pass a session from make_session(token='YOUR_TOKEN')
+
+# On-disk ETag cache (see http_cache.py): when this runs from cron, unchanged
+# pages come back as "304 Not Modified" and are served from disk.
+cache = ResponseCache()
+
+try:
+    # Dictionary (Counter) of PR creators and their counts, merged across all pages
+    pr_creators = fetch_pr_creators_concurrent(url, cache=cache)
+except requests.HTTPError as error:
+    print(f"Failed to fetch data. Status code: {error.response.status_code}")
+else:
     # Display PR creators and number of PRs they created
     print("PR Creators and Counts:")
     for creator, count in pr_creators.items():
         print(f"{creator}: {count} PR(s)")
-
-else:
-    print(f"Failed to fetch data. Status code: {response.status_code}")
\ No newline at end of file
@@ -0,0 +1,208 @@
+# benchmark_health_checker.py
+# ----------------------------------------------------
+# Checks a fake fleet of 50,000 endpoints on this machine (loopback only)
+#
+# - a child process runs --listeners fake servers on free local ports
+#   (most answer HTTP 200, some answer 503, some never answer)
+# - every endpoint is a different 127.x.y.z address on one of those ports
+#   (Linux routes all of 127.0.0.0/8 to the loopback interface), so 50,000
+#   different ip:port pairs only need a few hundred listening sockets
+# - 10% of the endpoints use a closed port → connection refused
+# - 1% are "blackholed": a listener whose accept queue is full, the kernel
+#   drops the connection attempts → the check runs into its timeout
+#   (like a firewalled or crashed host; these are what make serial loops slow)
+#
+# Then:
+#   serial   → one socket.create_connection() after the other (a sample, extrapolated)
+#   asyncio  → health_checker.check_all() over ALL endpoints, TCP and HTTP mode
+# and the results are written back into a ServerInventory and verified.
+#
+# Run:
+#   python benchmark_health_checker.py
+#   python benchmark_health_checker.py --endpoints 10000 --concurrency 500
+# ----------------------------------------------------
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+from collections import Counter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from health_checker import HEALTHY, UNHEALTHY, apply_results, check_all, max_concurrency
+from server_inventory import ServerInventory, int_to_ip, ip_to_int
+
+FIRST_IP = ip_to_int('127.1.0.1')
+ANSWER_OK = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+ANSWER_ERROR = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+
+
+class FakeServer(asyncio.Protocol):
+    """Answers the first bytes it gets with a fixed HTTP answer (or never answers when answer is None)."""
+
+    def __init__(self, answer):
+        self.answer = answer
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        if self.answer is not None:
+            self.transport.write(self.answer)
+            self.transport.close()
+
+
+def blackhole(port):
+    """
+    A listening socket that never accepts, with its accept queue already full:
+    new connection attempts (SYNs) are dropped, connect() hangs until its timeout.
+    """
+    listener = socket.socket()
+    listener.bind(('0.0.0.0', port))
+    listener.listen(0)
+    fillers = []
+    for _ in range(2):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(('127.0.0.1', port))
+        fillers.append(filler)
+    time.sleep(0.1)  # let the handshakes complete and fill the queue
+    return [listener] + fillers
+
+
+def run_listeners(ports, answers, blackhole_ports, ready):
+    async def main():
+        loop = asyncio.get_running_loop()
+        for port, answer in zip(ports, answers):
+            await loop.create_server(lambda answer=answer: FakeServer(answer), '0.0.0.0', port, backlog=4096)
+        holes = [blackhole(port) for port in blackhole_ports]  # kept referenced: sockets stay open
+        ready.set()
+        await asyncio.Event().wait()  # serve until the parent terminates us
+
+    asyncio.run(main())
+
+
+def free_ports(count):
+    """Ports that are free right now: bind to port 0 and let the kernel choose."""
+    sockets = [socket.socket() for _ in range(count)]
+    for sock in sockets:
+        sock.bind(('0.0.0.0', 0))
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def raise_open_file_limit():
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def build_fleet(endpoints, listener_ports, closed_ports, blackhole_ports):
+    """
+    (name, ip, port, expected_kind) for every endpoint: every 100th endpoint is
+    blackholed, every other 10th goes to a closed port, the rest round-robin over the listeners.
+    """
+    fleet = []
+    for i in range(endpoints):
+        if i % 100 == 99:
+            port, kind = blackhole_ports[i % len(blackhole_ports)], 'blackhole'
+        elif i % 10 == 9:
+            port, kind = closed_ports[i % len(closed_ports)], 'closed'
+        else:
+            index = i % len(listener_ports)
+            port, kind = listener_ports[index], 'listener'
+        fleet.append((f'server{i}', int_to_ip(FIRST_IP + i // len(listener_ports)), port, kind))
+    return fleet
+
+
+def serial_check(targets, timeout):
+    healthy = 0
+    for _, ip, port in targets:
+        try:
+            socket.create_connection((ip, port), timeout=timeout).close()
+            healthy += 1
+        except OSError:
+            pass
+    return healthy
+
+
+def timed_check(targets, **options):
+    start = time.perf_counter()
+    results = asyncio.run(check_all(targets, **options))
+    return results, time.perf_counter() - start
+
+
+def run(endpoints=50_000, listeners=200, concurrency=1000, timeout=1.0, serial_sample=1000):
+    raise_open_file_limit()
+    ports = free_ports(listeners + 20)
+    listener_ports, closed_ports, blackhole_ports = ports[:listeners], ports[listeners:-10], ports[-10:]
+    # 90% of the listeners answer 200, 5% answer 503, 5% never answer (→ HTTP timeout)
+    answers = [ANSWER_OK if i % 20 < 18 else ANSWER_ERROR if i % 20 == 18 else None
+               for i in range(listeners)]
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_listeners, args=(listener_ports, answers, blackhole_ports, ready), daemon=True)
+    server.start()
+    try:
+        if not ready.wait(30):
+            raise RuntimeError("Fake listeners did not start")
+        fleet = build_fleet(endpoints, listener_ports, closed_ports, blackhole_ports)
+        targets = [(name, ip, port) for name, ip, port, _ in fleet]
+        kinds = Counter(kind for *_, kind in fleet)
+        expected_up = kinds['listener']
+        print(f"{endpoints} endpoints on {listeners} fake listeners "
+              f"({kinds['listener']} up, {kinds['closed']} refused, {kinds['blackhole']} blackholed), "
+              f"concurrency {max_concurrency(concurrency)}, timeout {timeout} s\n")
+
+        sample = targets[:serial_sample]
+        start = time.perf_counter()
+        serial_check(sample, timeout)
+        serial_rate = len(sample) / (time.perf_counter() - start)
+        print(f"serial TCP  : {serial_rate:9.0f} checks/s → {endpoints / serial_rate:7.2f} s for all "
+              f"(measured on {len(sample)})")
+
+        results, elapsed = timed_check(targets, concurrency=concurrency, timeout=timeout)
+        counts = Counter(result.status for result in results)
+        print(f"asyncio TCP : {len(results) / elapsed:9.0f} checks/s → {elapsed:7.2f} s   {dict(counts)}")
+        assert len(results) == endpoints and counts[HEALTHY] == expected_up, counts
+
+        inventory = ServerInventory.from_rows((name, ip, port, 'unknown') for name, ip, port, _ in fleet)
+        apply_results(inventory, results)
+        assert inventory.status_counts() == dict(counts), inventory.status_counts()
+
+        results, elapsed = timed_check(targets, concurrency=concurrency, timeout=timeout, http_path='/health')
+        counts = Counter(result.status for result in results)
+        details = Counter(result.detail for result in results)
+        print(f"asyncio HTTP: {len(results) / elapsed:9.0f} checks/s → {elapsed:7.2f} s   {dict(counts)}")
+        print(f"              {dict(details.most_common())}")
+        apply_results(inventory, results)
+        print(f"\ninventory after HTTP checks: {inventory.status_counts()}, "
+              f"e.g. server0 → {inventory.get_status('server0')}, server9 → {inventory.get_status('server9')}")
+        assert inventory.get_status('server9') == UNHEALTHY   # closed port
+        assert inventory.get_status('server99') == UNHEALTHY  # blackholed
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark health_checker.py against fake loopback listeners')
+    parser.add_argument('--endpoints', type=int, default=50_000)
+    parser.add_argument('--listeners', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=1000)
+    parser.add_argument('--timeout', type=float, default=1.0)
+    parser.add_argument('--serial-sample', type=int, default=1000, help='endpoints checked in the serial run')
+    args = parser.parse_args()
+    run(args.endpoints, args.listeners, args.concurrency, args.timeout, args.serial_sample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmark_pr_fetcher.py
+# ----------------------------------------------------
+# Compare sequential vs concurrent PR page fetching (pr_fetcher.py)
+# against a LOCAL stub of the GitHub /pulls API.
+#
+# The stub server:
+# - serves N pages of fake pull requests
+# - adds GitHub-style "Link" headers (next/last)
+# - sleeps for a fixed latency on every request (simulates network delay)
+#
+# Run:
+#   python benchmark_pr_fetcher.py                 # 20 pages, 100 ms latency
+#   python benchmark_pr_fetcher.py --pages 50 --latency 0.2 --workers 16
+# ----------------------------------------------------
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from pr_fetcher import fetch_pr_creators_concurrent, fetch_pr_creators_sequential, make_session
+
+
+def make_stub_handler(total_pages, latency):
+    """Build a request handler class that serves 'total_pages' pages of fake PRs."""
+
+    class StubGitHubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+        def do_GET(self):
+            parts = urlparse(self.path)
+            query = parse_qs(parts.query)
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['30'])[0])
+
+            time.sleep(latency)  # Simulated network + server time
+
+            pulls = []
+            if 1 <= page <= total_pages:
+                for i in range(per_page):
+                    number = (page - 1) * per_page + i
+                    pulls.append({'number': number, 'user': {'login': f'user{number % 37}'}})
+            body = json.dumps(pulls).encode()
+
+            base = f'http://{self.headers["Host"]}{parts.path}?per_page={per_page}&page='
+            links = []
+            if page < total_pages:
+                links.append(f'<{base}{page + 1}>; rel="next"')
+            links.append(f'<{base}{total_pages}>; rel="last"')
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Link', ', '.join(links))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep benchmark output clean
+
+    return StubGitHubHandler
+
+
+def start_stub_server(total_pages, latency):
+    """Start the stub server on a free local port; returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_stub_handler(total_pages, latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/repos/demo/demo/pulls'
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.3f} s   PRs counted: {sum(result.values())}")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sequential vs concurrent PR fetching')
+    parser.add_argument('--pages', type=int, default=20, help='number of pages the stub serves')
+    parser.add_argument('--latency', type=float, default=0.1, help='seconds of delay per request')
+    parser.add_argument('--workers', type=int, default=10, help='threads for the concurrent fetcher')
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.pages, args.latency)
+    print(f"Stub: {args.pages} pages x 100 PRs, {args.latency * 1000:.0f} ms latency, {args.workers} workers\n")
+
+    try:
+        seq_time, seq_counts = timed('sequential', lambda: fetch_pr_creators_sequential(url))
+        con_time, con_counts = timed(
+            'concurrent',
+            lambda: fetch_pr_creators_concurrent(url, session=make_session(args.workers), workers=args.workers),
+        )
+    finally:
+        server.shutdown()
+
+    assert seq_counts == con_counts, "sequential and concurrent results differ"
+    print(f"\nSpeed-up: {seq_time / con_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# benchmark_server_inventory.py
+# ----------------------------------------------------
+# Dict of dicts (server_config in 04-practicals.py) vs ServerInventory
+# (server_inventory.py) for a large fleet:
+#
+# - first: random add / update / set_status / remove, then every index checked
+#   against a plain dict (the indexes are sorted arrays kept up to date by hand)
+# - memory per host (tracemalloc, while building)
+# - status of one server by name
+# - "all inactive servers" and "who is on port 8080"
+#     dict of dicts → scan every host;  inventory → secondary index
+# - save / load time and file size (JSON for the dict, binary for the inventory)
+#
+# Run:
+#   python benchmark_server_inventory.py                # 500,000 hosts
+#   python benchmark_server_inventory.py --hosts 100000
+# ----------------------------------------------------
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from server_inventory import ServerInventory
+
+STATUSES = ['active'] * 8 + ['inactive', 'maintenance']
+PORTS = [22, 80, 443, 8000, 8080, 9000, 9090, 5432]
+
+
+def make_fleet(hosts):
+    """Generate (name, ip, port, status) rows for a fleet spread over 10.x.y.z."""
+    rng = random.Random(42)
+    for number in range(hosts):
+        yield (f'server{number}', f'10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}',
+               rng.choice(PORTS), rng.choice(STATUSES))
+
+
+def build_dict(rows):
+    return {name: {'ip': ip, 'port': port, 'status': status} for name, ip, port, status in rows}
+
+
+def build_inventory_add(rows):
+    inventory = ServerInventory()
+    for name, ip, port, status in rows:
+        inventory.add(name, ip, port, status)
+    return inventory
+
+
+def check_indexes(steps=20000):
+    """Random changes on a small fleet; every query must match a dict of dicts."""
+    rng = random.Random(7)
+    inventory, config = ServerInventory(), {}
+    for _ in range(steps):
+        name = f'server{rng.randrange(300)}'
+        ip, port, status = f'10.0.0.{rng.randrange(50)}', rng.choice(PORTS), rng.choice(STATUSES)
+        action = rng.randrange(4) if name in config else 0
+        if action == 0:
+            inventory.add(name, ip, port, status)
+            config[name] = {'ip': ip, 'port': port, 'status': status}
+        elif action == 1:
+            inventory.update(name, ip=ip, port=port)
+            config[name].update(ip=ip, port=port)
+        elif action == 2:
+            inventory.set_status(name, status)
+            config[name]['status'] = status
+        else:
+            inventory.remove(name)
+            del config[name]
+    assert inventory.to_dict() == config
+    for field, values, query in (('status', STATUSES, inventory.by_status), ('port', PORTS, inventory.by_port),
+                                 ('ip', [f'10.0.0.{number}' for number in range(50)], inventory.by_ip)):
+        for value in set(values):
+            expected = sorted(name for name, fields in config.items() if fields[field] == value)
+            assert sorted(query(value)) == expected, (field, value)
+    expected_counts = {}
+    for fields in config.values():
+        expected_counts[fields['status']] = expected_counts.get(fields['status'], 0) + 1
+    assert inventory.status_counts() == expected_counts
+    print(f"indexes match a dict of dicts after {steps} random changes")
+
+
+def measure_build(build, hosts):
+    """Build from freshly generated rows: memory = what the store keeps (tracemalloc)."""
+    start = time.perf_counter()
+    build(make_fleet(hosts))
+    elapsed = time.perf_counter() - start  # timed without tracing
+
+    tracemalloc.start()
+    store = build(make_fleet(hosts))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return store, elapsed, size
+
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dict-of-dicts vs ServerInventory')
+    parser.add_argument('--hosts', type=int, default=500000)
+    args = parser.parse_args()
+
+    check_indexes()
+    names = [f'server{number}' for number in random.Random(1).sample(range(args.hosts), 1000)]
+    print(f"{args.hosts} hosts\n")
+    print(f"{'':<26} {'dict of dicts':>16} {'ServerInventory':>16}")
+
+    config, dict_build, dict_memory = measure_build(build_dict, args.hosts)
+    inventory, inventory_build, inventory_memory = measure_build(ServerInventory.from_rows, args.hosts)
+    add_time, _ = timed(lambda: build_inventory_add(make_fleet(args.hosts)))
+    print(f"{'build':<26} {dict_build:>14.2f} s {inventory_build:>14.2f} s  (add() per host: {add_time:.2f} s)")
+    print(f"{'memory per host':<26} {dict_memory / args.hosts:>14.0f} B {inventory_memory / args.hosts:>14.0f} B")
+
+    def dict_status():
+        return [config.get(name, {}).get('status', 'Server not found') for name in names]
+
+    def dict_inactive():
+        return [name for name, fields in config.items() if fields['status'] == 'inactive']
+
+    def dict_port():
+        return [name for name, fields in config.items() if fields['port'] == 8080]
+
+    queries = [
+        ('status by name (x1000)', dict_status, lambda: [inventory.get_status(name) for name in names], 20),
+        ('all inactive', dict_inactive, lambda: inventory.by_status('inactive'), 3),
+        ('who is on port 8080', dict_port, lambda: inventory.by_port(8080), 3),
+    ]
+    for label, dict_query, inventory_query, repeat in queries:
+        dict_time, dict_result = timed(dict_query, repeat)
+        inventory_time, inventory_result = timed(inventory_query, repeat)
+        assert sorted(dict_result) == sorted(inventory_result), label
+        print(f"{label:<26} {dict_time * 1e3:>13.2f} ms {inventory_time * 1e3:>13.2f} ms")
+
+    with tempfile.TemporaryDirectory() as folder:
+        json_path, binary_path = os.path.join(folder, 'fleet.json'), os.path.join(folder, 'fleet.bin')
+
+        def save_json():
+            with open(json_path, 'w') as file:
+                json.dump(config, file)
+
+        def load_json():
+            with open(json_path) as file:
+                return json.load(file)
+
+        save_dict, _ = timed(save_json)
+        save_inventory, _ = timed(lambda: inventory.save(binary_path))
+        load_dict, _ = timed(load_json)
+        load_inventory, loaded = timed(lambda: ServerInventory.load(binary_path))
+        assert len(loaded) == args.hosts and loaded.by_port(8080) == inventory.by_port(8080)
+        print(f"{'save':<26} {save_dict:>14.2f} s {save_inventory:>14.2f} s")
+        print(f"{'load':<26} {load_dict:>14.2f} s {load_inventory:>14.2f} s")
+        print(f"{'file size':<26} {os.path.getsize(json_path) / 1e6:>13.1f} MB "
+              f"{os.path.getsize(binary_path) / 1e6:>13.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
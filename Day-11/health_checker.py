@@ -0,0 +1,204 @@
+# health_checker.py
+# ----------------------------------------------------
+# Active health checks for every server in the inventory (asyncio)
+#
+# In 04-practicals.py the 'status' of a server is just a string someone typed.
+# This script CHECKS every ip:port and writes the answer back as the status:
+#     'active'   → TCP connect worked (and the HTTP check, if enabled, returned 2xx/3xx)
+#     'inactive' → refused, timed out, or unhealthy HTTP answer
+#
+# Why asyncio? A serial loop waits for each connect in turn: 50,000 hosts x
+# a few ms (or a 2 s timeout for dead hosts) takes minutes to hours. With
+# asyncio one thread keeps up to --concurrency connects in flight at once.
+#
+# - global concurrency limit: a fixed number of worker coroutines
+#   (also kept below the open-file limit, every connect needs a socket)
+# - per-host timeout: one deadline per check (connect + HTTP answer)
+# - jittered scheduling: with --spread N the checks start at random times
+#   within N seconds, so a big fleet is not hit all in the same instant;
+#   --interval runs the checks again and again with a jittered pause
+#
+# Works with the ServerInventory file from server_inventory.py, or a JSON
+# file in the server_config format of 04-practicals.py.
+#
+# Requires Python 3.11+ (asyncio.timeout).
+#
+# Run:
+#   python health_checker.py inventory.bin                       # TCP checks, statuses saved back
+#   python health_checker.py servers.json --http /health --timeout 1
+#   python health_checker.py inventory.bin --interval 60 --spread 10
+# ----------------------------------------------------
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import tempfile
+import time
+from collections import Counter, namedtuple
+
+try:
+    import resource  # Unix only: used to respect the open-file limit
+except ImportError:
+    resource = None
+
+from server_inventory import ServerInventory
+
+HEALTHY, UNHEALTHY = 'active', 'inactive'
+
+CheckResult = namedtuple('CheckResult', ['name', 'status', 'detail', 'seconds'])
+
+
+def max_concurrency(requested):
+    """Keep concurrent sockets below the process' open-file limit."""
+    if resource is None:
+        return requested
+    soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft_limit == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft_limit - 64))  # leave room for files, logs, ...
+
+
+async def check_endpoint(ip, port, timeout, http_path=None):
+    """
+    One check. Returns (status, detail).
+    Plain non-blocking sockets (loop.sock_connect / sock_sendall / sock_recv):
+    much less work per check than asyncio streams, which matters at 50k checks.
+    """
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        async with asyncio.timeout(timeout):  # one deadline for connect + HTTP answer
+            await loop.sock_connect(sock, (ip, port))
+            if http_path is None:
+                return HEALTHY, 'tcp ok'
+            request = f"GET {http_path} HTTP/1.1\r\nHost: {ip}\r\nConnection: close\r\n\r\n"
+            await loop.sock_sendall(sock, request.encode())
+            status_line = await loop.sock_recv(sock, 1024)  # "HTTP/1.1 200 OK\r\n..." arrives first
+        parts = status_line.split(None, 2)
+        code = int(parts[1]) if len(parts) >= 2 and parts[1].isdigit() else 0
+        if 200 <= code < 400:
+            return HEALTHY, f'http {code}'
+        return UNHEALTHY, f'http {code}' if code else 'bad http answer'
+    except TimeoutError:
+        return UNHEALTHY, 'timeout'
+    except OSError as e:
+        return UNHEALTHY, os.strerror(e.errno) if e.errno else type(e).__name__
+    finally:
+        sock.close()
+
+
+async def check_all(targets, concurrency=1000, timeout=2.0, http_path=None, spread=0.0):
+    """
+    Check every (name, ip, port) target. Returns a list of CheckResult.
+    'concurrency' workers share the list; with spread > 0 each check waits for
+    its random start time within the first 'spread' seconds.
+    """
+    schedule = sorted((random.uniform(0, spread) if spread else 0.0, name, ip, port)
+                      for name, ip, port in targets)
+    results = []
+    position = 0  # next item of the schedule (workers run one at a time, no lock needed)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def worker():
+        nonlocal position
+        while position < len(schedule):
+            offset, name, ip, port = schedule[position]
+            position += 1
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            began = loop.time()
+            status, detail = await check_endpoint(ip, port, timeout, http_path)
+            results.append(CheckResult(name, status, detail, loop.time() - began))
+
+    workers = min(max_concurrency(concurrency), len(schedule))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
+
+
+def load_targets(path):
+    """Returns (store, targets) from an inventory .bin file or a server_config JSON file."""
+    if path.endswith('.json'):
+        with open(path) as file:
+            store = json.load(file)
+        targets = [(name, fields['ip'], fields['port']) for name, fields in store.items()]
+    else:
+        store = ServerInventory.load(path)
+        targets = [(server.name, server.ip, server.port) for server in store]
+    return store, targets
+
+
+def apply_results(store, results):
+    """Write the check results back as the 'status' field."""
+    for result in results:
+        if isinstance(store, ServerInventory):
+            store.set_status(result.name, result.status)
+        else:
+            store[result.name]['status'] = result.status
+
+
+def save_store(store, path):
+    """
+    Write the statuses back. The new content goes to a temporary file in the same
+    folder that os.replace() swaps in: a crash mid-write leaves the old file intact.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix='.tmp-')
+    os.close(fd)
+    try:
+        if isinstance(store, ServerInventory):
+            store.save(temp_path)
+        else:
+            with open(temp_path, 'w') as file:
+                json.dump(store, file, indent=2)
+                file.flush()
+                os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)  # Keep the original file permissions
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def run_once(path, args):
+    store, targets = load_targets(path)
+    start = time.perf_counter()
+    results = asyncio.run(check_all(targets, args.concurrency, args.timeout, args.http, args.spread))
+    elapsed = time.perf_counter() - start
+    apply_results(store, results)
+    save_store(store, path)
+
+    counts = Counter(result.status for result in results)
+    details = Counter(result.detail for result in results if result.status == UNHEALTHY)
+    print(f"Checked {len(results)} servers in {elapsed:.2f} s "
+          f"({len(results) / elapsed if elapsed else 0:.0f}/s): {dict(counts)}")
+    if details:
+        print(f"  inactive because: {dict(details.most_common(5))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check every server and write the result back as its status')
+    parser.add_argument('inventory', help='ServerInventory file (.bin) or server_config JSON file (.json)')
+    parser.add_argument('--concurrency', type=int, default=1000, help='checks in flight at the same time')
+    parser.add_argument('--timeout', type=float, default=2.0, help='seconds per check')
+    parser.add_argument('--http', metavar='PATH', help='also send GET PATH and expect 2xx/3xx')
+    parser.add_argument('--spread', type=float, default=0.0, help='start checks at random times within N seconds')
+    parser.add_argument('--interval', type=float, help='repeat every N seconds (+-10%% jitter)')
+    args = parser.parse_args()
+
+    while True:
+        run_once(args.inventory, args)
+        if not args.interval:
+            break
+        time.sleep(args.interval * random.uniform(0.9, 1.1))  # jitter: many checkers don't sync up
+
+
+if __name__ == "__main__":
+    main()
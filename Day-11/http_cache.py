@@ -0,0 +1,278 @@
+# http_cache.py
+# ----------------------------------------------------
+# On-disk HTTP response cache using conditional requests (ETag / Last-Modified)
+#
+# Scripts that run from cron every minute re-download the same JSON again
+# and again. GitHub and Jira both return an "ETag" (and often
+# "Last-Modified") header. If we send them back on the next request:
+#
+#   If-None-Match: "<etag>"
+#   If-Modified-Since: <last-modified>
+#
+# the server answers "304 Not Modified" with an EMPTY body when nothing
+# changed, and we serve the body we saved last time. (GitHub does not count
+# 304 answers against the rate limit for authenticated requests.)
+#
+# Features:
+# - cache key = URL + auth identity (two users never share an entry)
+# - size-bounded LRU eviction (least recently used files are deleted first)
+# - hit / miss / refresh counters, kept in memory and merged into stats.json
+#   once (close(), or at exit) under a file lock, so overlapping cron runs
+#   add up instead of overwriting each other; printable in Prometheus text format
+#     hits      → 304: the saved body was served
+#     refreshed → we had an entry, but the server sent a new body (200)
+#     misses    → no entry (or an error answer)
+#
+# Usage:
+#   cache = ResponseCache('.http_cache')
+#   response = cache.get(session, url, auth=auth, headers=headers)
+#   data = response.json()
+#   print(cache.metrics_text())
+#   cache.close()   # saves the counters (also done automatically at exit)
+# ----------------------------------------------------
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+
+try:
+    import fcntl  # file locks between processes (not available on Windows)
+except ImportError:
+    fcntl = None
+
+import requests
+
+DEFAULT_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', '.http_cache')
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+
+# Response headers worth keeping with the body (Link is needed for pagination)
+SAVED_HEADERS = ('Content-Type', 'Link')
+
+STATS_FILE = 'stats.json'
+LOCK_FILE = 'stats.lock'
+ENTRY_SUFFIX = '.entry'
+COUNTER_NAMES = ('hits', 'misses', 'refreshed', 'stored', 'evictions')
+
+
+class CachedResponse:
+    """
+    Small response object returned by ResponseCache.get().
+    Looks enough like requests.Response for our scripts:
+    .status_code, .headers, .content, .text, .json(), .raise_for_status(), .from_cache
+    """
+
+    def __init__(self, status_code, headers, content, from_cache):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} error', response=self)
+
+
+def auth_identity(session, auth=None, headers=None):
+    """
+    Return a string that identifies WHO is asking, without storing secrets.
+    - HTTPBasicAuth → the username (email for Jira)
+    - Authorization header → a hash of the header value
+    - nothing → 'anonymous'
+    """
+    auth = auth or session.auth
+    if auth is not None:
+        username = getattr(auth, 'username', None)
+        if username is None and isinstance(auth, tuple):
+            username = auth[0]
+        if username is not None:
+            return f'basic:{username}'
+    token = (headers or {}).get('Authorization') or session.headers.get('Authorization')
+    if token:
+        return 'token:' + hashlib.sha256(token.encode()).hexdigest()[:16]
+    return 'anonymous'
+
+
+class ResponseCache:
+    """Conditional-request cache stored as one file per URL in cache_dir."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()  # counters and eviction are shared by threads
+        self._counts = Counter()       # not yet saved to stats.json
+        os.makedirs(cache_dir, exist_ok=True)
+        atexit.register(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    # ---------- Public API ----------
+
+    def get(self, session, url, auth=None, headers=None, timeout=30):
+        """
+        GET url through the cache. Returns a CachedResponse.
+        Non-200/304 responses are returned as-is and never cached.
+        """
+        key = self._key(url, auth_identity(session, auth, headers))
+        entry = self._read_entry(key)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            meta = entry[0]
+            if meta.get('etag'):
+                request_headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                request_headers['If-Modified-Since'] = meta['last_modified']
+
+        response = session.get(url, auth=auth, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            # Nothing changed on the server: serve the saved body
+            self._count('hits')
+            self._touch(key)
+            meta, body = entry
+            return CachedResponse(200, meta.get('headers', {}), body, from_cache=True)
+
+        self._count('refreshed' if entry is not None and response.status_code == 200 else 'misses')
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                meta = {
+                    'url': url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': {name: response.headers[name] for name in SAVED_HEADERS if name in response.headers},
+                }
+                self._write_entry(key, meta, response.content)
+
+        return CachedResponse(response.status_code, response.headers, response.content, from_cache=False)
+
+    def stats(self):
+        """Return the counters as a dict: saved in stats.json + counted since the last flush()."""
+        counters = self._saved_stats()
+        with self._lock:
+            for name, value in self._counts.items():
+                counters[name] = counters.get(name, 0) + value
+        return counters
+
+    def flush(self):
+        """Add the counters of this run to stats.json (one locked read-modify-write)."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+        with open(os.path.join(self.cache_dir, LOCK_FILE), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # another process may be flushing too
+            counters = self._saved_stats()
+            for name, value in counts.items():
+                counters[name] = counters.get(name, 0) + value
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump(counters, file)
+            os.replace(tmp_path, os.path.join(self.cache_dir, STATS_FILE))
+
+    def metrics_text(self):
+        """Counters in Prometheus text exposition format."""
+        lines = []
+        for name, value in self.stats().items():
+            metric = f'http_cache_{name}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        lines.append('# TYPE http_cache_size_bytes gauge')
+        lines.append(f'http_cache_size_bytes {sum(size for _, size, _ in self._entries())}')
+        return '\n'.join(lines) + '\n'
+
+    # ---------- Storage helpers ----------
+
+    def _key(self, url, identity):
+        return hashlib.sha256(f'{identity}\n{url}'.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def _read_entry(self, key):
+        """Entry file = one JSON metadata line, then the raw body bytes."""
+        try:
+            with open(self._path(key), 'rb') as file:
+                meta = json.loads(file.readline())
+                return meta, file.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_entry(self, key, meta, body):
+        # Write to a temp file, then rename: readers never see half an entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(json.dumps(meta).encode() + b'\n')
+            file.write(body)
+        os.replace(tmp_path, self._path(key))
+        self._count('stored')
+        self._evict()
+
+    def _touch(self, key):
+        # The file modification time is our "last used" timestamp for LRU
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        """Yield (path, size, last_used) for every cache entry."""
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(ENTRY_SUFFIX):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda item: item[2])
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+        if evicted:
+            self._count('evictions', evicted)
+
+    def _count(self, name, amount=1):
+        """Count in memory only; flush() saves the counters."""
+        with self._lock:
+            self._counts[name] += amount
+
+    def _saved_stats(self):
+        counters = dict.fromkeys(COUNTER_NAMES, 0)
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILE)) as file:
+                saved = json.load(file)
+            counters.update((name, saved[name]) for name in COUNTER_NAMES if name in saved)
+        except (FileNotFoundError, ValueError):
+            pass
+        return counters
@@ -0,0 +1,170 @@
+# pr_fetcher.py
+# ----------------------------------------------------
+# Paginated, concurrent version of 04-demo-github-integration.py
+#
+# The demo script does ONE request to /pulls, so it only ever sees the
+# first page (30 PRs). GitHub splits big results into pages and tells us
+# where the other pages are in the "Link" response header:
+#
+#   Link: <https://api.github.com/...&page=2>; rel="next",
+#         <https://api.github.com/...&page=34>; rel="last"
+#
+# This module:
+# - asks for 100 PRs per page (the GitHub maximum) with per_page=100
+# - reads the "last" page number from the first response
+# - fetches the remaining pages concurrently with a thread pool that shares
+#   one requests.Session (so TCP/TLS connections are reused)
+# - merges the per-creator counts as each page arrives
+#
+# Why useful for DevOps?
+# - Repos like kubernetes/kubernetes have thousands of open PRs.
+# - Concurrent page fetching turns "N round-trips one after another"
+#   into "about N / workers round-trips".
+# ----------------------------------------------------
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_PULLS_URL = 'https://api.github.com/repos/kubernetes/kubernetes/pulls'
+PER_PAGE = 100  # GitHub allows at most 100 items per page
+
+
+def parse_link_header(link_header):
+    """
+    Parse a GitHub "Link" header into a dict like {'next': url, 'last': url}.
+    Returns an empty dict when the header is missing (single page result).
+    """
+    links = {}
+    if not link_header:
+        return links
+    for part in link_header.split(','):
+        section = part.split(';')
+        if len(section) < 2:
+            continue
+        url = section[0].strip().strip('<>')
+        for param in section[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'rel':
+                links[value.strip('"')] = url
+    return links
+
+
+def page_url(url, page, per_page=PER_PAGE):
+    """Return url with the page/per_page query parameters set."""
+    parts = urlparse(url)
+    query = parse_qs(parts.query)
+    query['per_page'] = [str(per_page)]
+    query['page'] = [str(page)]
+    return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+
+def last_page_number(links):
+    """Read the page number out of the rel="last" link (None if missing)."""
+    last = links.get('last')
+    if not last:
+        return None
+    pages = parse_qs(urlparse(last).query).get('page')
+    return int(pages[0]) if pages else None
+
+
+def make_session(pool_size=10, token=None):
+    """
+    Create a requests.Session with a connection pool big enough for
+    'pool_size' concurrent threads. Pass a token for private repos or
+    higher rate limits.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept'] = 'application/vnd.github+json'
+    if token:
+        session.headers['Authorization'] = f'token {token}'
+    return session
+
+
+def fetch_page(session, url, timeout=30, cache=None):
+    """
+    GET one page. Returns (pull_requests, links).
+    Pass an http_cache.ResponseCache to send If-None-Match and reuse
+    unchanged pages. Raises requests.HTTPError for non-2xx responses.
+    """
+    if cache is not None:
+        response = cache.get(session, url, timeout=timeout)
+    else:
+        response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json(), parse_link_header(response.headers.get('Link'))
+
+
+def count_creators(pull_requests):
+    """Count PRs per creator login for one page."""
+    return Counter(pull['user']['login'] for pull in pull_requests)
+
+
+def fetch_pr_creators_sequential(url=GITHUB_PULLS_URL, session=None, per_page=PER_PAGE, cache=None):
+    """
+    Follow rel="next" links one page at a time (baseline for benchmarks).
+    Returns a Counter of {creator: number_of_prs}.
+    """
+    session = session or make_session(pool_size=1)
+    pr_creators = Counter()
+    next_url = page_url(url, 1, per_page)
+    while next_url:
+        pull_requests, links = fetch_page(session, next_url, cache=cache)
+        pr_creators.update(count_creators(pull_requests))
+        next_url = links.get('next')
+    return pr_creators
+
+
+def fetch_pr_creators_concurrent(url=GITHUB_PULLS_URL, session=None, workers=10, per_page=PER_PAGE, cache=None):
+    """
+    Fetch page 1, read the "last" page number, then fetch pages 2..last
+    concurrently. Counts are merged as each page finishes.
+    Returns a Counter of {creator: number_of_prs}.
+    """
+    session = session or make_session(pool_size=workers)
+
+    # Step 1: The first page tells us how many pages there are
+    pull_requests, links = fetch_page(session, page_url(url, 1, per_page), cache=cache)
+    pr_creators = count_creators(pull_requests)
+
+    last_page = last_page_number(links)
+    if last_page is None:
+        # No "last" link: either a single page, or the server only gives "next".
+        # Fall back to following "next" one page at a time.
+        next_url = links.get('next')
+        while next_url:
+            pull_requests, links = fetch_page(session, next_url, cache=cache)
+            pr_creators.update(count_creators(pull_requests))
+            next_url = links.get('next')
+        return pr_creators
+
+    # Step 2: Fetch the remaining pages in parallel and merge as they arrive
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fetch_page, session, page_url(url, page, per_page), cache=cache)
+            for page in range(2, last_page + 1)
+        ]
+        for future in as_completed(futures):
+            pull_requests, _ = future.result()
+            pr_creators.update(count_creators(pull_requests))
+
+    return pr_creators
+
+
+def main():
+    pr_creators = fetch_pr_creators_concurrent()
+
+    # Display PR creators and number of PRs they created (most active first)
+    print("PR Creators and Counts:")
+    for creator, count in pr_creators.most_common():
+        print(f"{creator}: {count} PR(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+# server_inventory.py
+# ----------------------------------------------------
+# Compact, indexed server inventory (grown-up version of server_config in 04-practicals.py)
+#
+# 04-practicals.py keeps servers in a dict of dicts:
+#     server_config = {'server1': {'ip': '192.168.1.1', 'port': 8080, 'status': 'active'}, ...}
+# That is fine for 3 servers. For 500,000 hosts:
+# - every host costs a whole dict + an ip string + a port int (~340 bytes)
+# - only lookups BY NAME are fast; "all inactive servers" or "who is on
+#   port 8080" must scan every host
+#
+# ServerInventory stores the same data in COLUMNS:
+#     ips      → array('I')   4 bytes per host (IPv4 as a number)
+#     ports    → array('H')   2 bytes per host
+#     statuses → bytearray    1 byte per host (code into a small table of status names)
+#     names    → list of str
+# plus SECONDARY INDEXES that are updated on every add / update / remove:
+#     status → sorted array('I') of rows,  port → sorted array('I') of rows,
+#     one array('I') of all rows sorted by ip (searched with bisect)
+# so by_status('inactive') and by_port(8080) only touch the matching hosts.
+# The indexes are arrays too (4 bytes per host each), not sets or dicts with a
+# Python int object per host: those would cost more than the columns save.
+#
+# save() / load() use a compact binary file (the columns written as raw bytes).
+#
+# Usage:
+#   inventory = ServerInventory.from_dict(server_config)
+#   inventory.get_status('server2')        # 'inactive'
+#   inventory.by_status('active')          # ['server1', 'server3']
+#   inventory.by_port(8080)                # ['server1']
+#   inventory.set_status('server2', 'active')
+#   inventory.save('inventory.bin'); ServerInventory.load('inventory.bin')
+#
+# Only IPv4 addresses are supported (they fit in 4 bytes).
+# ----------------------------------------------------
+
+import json
+import socket
+import struct
+import sys
+from array import array
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+Server = namedtuple('Server', ['name', 'ip', 'port', 'status'])
+
+FILE_MAGIC = b'SINV1\n'
+HEADER = struct.Struct('<I')  # little-endian uint32 length prefix
+MAX_STATUSES = 256            # status codes are stored in one byte
+
+
+def ip_to_int(ip):
+    try:
+        return int.from_bytes(socket.inet_aton(ip), 'big')
+    except OSError:
+        raise ValueError(f"Not an IPv4 address: {ip!r}") from None
+
+
+def int_to_ip(number):
+    return socket.inet_ntoa(number.to_bytes(4, 'big'))
+
+
+def _little_endian(column):
+    """Raw bytes of a column; arrays are stored little-endian in the file."""
+    if isinstance(column, array) and column.itemsize > 1 and sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return bytes(column)
+
+
+def _write_block(file, data):
+    file.write(HEADER.pack(len(data)))
+    file.write(data)
+
+
+def _read_block(file):
+    (size,) = HEADER.unpack(file.read(HEADER.size))
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Inventory file is truncated")
+    return data
+
+
+class ServerInventory:
+    """Columnar server store with indexes on status, ip and port."""
+
+    def __init__(self):
+        self._names = []             # row → name (None for a removed row)
+        self._ips = array('I')       # row → IPv4 as int
+        self._ports = array('H')     # row → port
+        self._statuses = bytearray() # row → status code
+        self._status_names = []      # status code → status name
+        self._status_codes = {}      # status name → status code
+        self._rows = {}              # name → row
+        self._free_rows = []         # rows of removed servers, reused by add()
+        self._by_status = {}         # status code → sorted array of rows
+        self._by_port = {}           # port → sorted array of rows
+        self._by_ip = array('I')     # all rows, sorted by ip
+
+    # ---------- Building ----------
+
+    @classmethod
+    def from_dict(cls, server_config):
+        """Build from the 04-practicals.py format: {name: {'ip': ..., 'port': ..., 'status': ...}}."""
+        return cls.from_rows((name, fields['ip'], fields['port'], fields.get('status', 'unknown'))
+                             for name, fields in server_config.items())
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Bulk load from (name, ip, port, status) rows: the columns are filled
+        first and the indexes built once at the end (much faster than add() per row).
+        """
+        inventory = cls()
+        names, ips, ports, statuses = inventory._names, inventory._ips, inventory._ports, inventory._statuses
+        status_code = inventory._status_code
+        for name, ip, port, status in rows:
+            names.append(name)
+            ips.append(ip_to_int(ip))
+            ports.append(port)  # array('H') raises OverflowError for ports outside 0..65535
+            statuses.append(status_code(status))
+        inventory._rows = {name: row for row, name in enumerate(names)}
+        if len(inventory._rows) != len(names):
+            raise ValueError("Duplicate server names")
+        inventory._rebuild_indexes()
+        return inventory
+
+    def to_dict(self):
+        return {server.name: {'ip': server.ip, 'port': server.port, 'status': server.status}
+                for server in self}
+
+    def add(self, name, ip, port, status='unknown'):
+        """Add a server (or replace it if the name exists)."""
+        if name in self._rows:
+            self.remove(name)
+        ip_number, code = ip_to_int(ip), self._status_code(status)
+        if not 0 <= port <= 65535:
+            raise ValueError(f"Port out of range: {port}")
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._names[row] = name
+            self._ips[row], self._ports[row], self._statuses[row] = ip_number, port, code
+        else:
+            row = len(self._names)
+            self._names.append(name)
+            self._ips.append(ip_number)
+            self._ports.append(port)
+            self._statuses.append(code)
+        self._rows[name] = row
+        self._index_row(row)
+
+    def remove(self, name):
+        """Remove a server. Raises KeyError if it does not exist."""
+        row = self._rows.pop(name)
+        self._unindex_row(row)
+        self._names[row] = None
+        self._free_rows.append(row)
+
+    def update(self, name, ip=None, port=None, status=None):
+        """Change some fields of a server; the indexes follow."""
+        row = self._rows[name]
+        if port is not None and not 0 <= port <= 65535:
+            raise ValueError(f"Port out of range: {port}")
+        self._unindex_row(row)
+        try:
+            if ip is not None:
+                self._ips[row] = ip_to_int(ip)
+            if port is not None:
+                self._ports[row] = port
+            if status is not None:
+                self._statuses[row] = self._status_code(status)
+        finally:
+            self._index_row(row)  # re-index even if a value was invalid (row keeps its old value)
+
+    def set_status(self, name, status):
+        """Fast path for the most common change: only the status index is touched."""
+        row = self._rows[name]
+        code = self._status_code(status)
+        old = self._statuses[row]
+        if old != code:
+            self._discard(self._by_status, old, row)
+            self._insert(self._by_status, code, row)
+            self._statuses[row] = code
+
+    # ---------- Queries ----------
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __iter__(self):
+        for row in self._rows.values():
+            yield self._record(row)
+
+    def get(self, name):
+        """Server record for name, or None."""
+        row = self._rows.get(name)
+        return None if row is None else self._record(row)
+
+    def get_status(self, name, default='Server not found'):
+        """Same answer as get_server_status() in 04-practicals.py."""
+        row = self._rows.get(name)
+        return default if row is None else self._status_names[self._statuses[row]]
+
+    def by_status(self, status):
+        code = self._status_codes.get(status)
+        return self._names_of(self._by_status.get(code, ()))
+
+    def by_port(self, port):
+        return self._names_of(self._by_port.get(port, ()))
+
+    def by_ip(self, ip):
+        ip_number, by_ip, ips = ip_to_int(ip), self._by_ip, self._ips
+        position = self._ip_position(ip_number)
+        rows = []
+        while position < len(by_ip) and ips[by_ip[position]] == ip_number:
+            rows.append(by_ip[position])
+            position += 1
+        return self._names_of(rows)
+
+    def status_counts(self):
+        """{status: number of servers}"""
+        return {self._status_names[code]: len(rows) for code, rows in self._by_status.items() if rows}
+
+    # ---------- Saving / loading ----------
+
+    def save(self, path):
+        """
+        Binary file: magic line, then length-prefixed blocks:
+        status names (JSON), names (UTF-8, newline separated), ips, ports, statuses.
+        Removed rows are left out (the file is always compact).
+        """
+        rows = sorted(self._rows.values())
+        if any('\n' in self._names[row] for row in rows):
+            raise ValueError("Server names cannot contain newlines")
+        with open(path, 'wb') as file:
+            file.write(FILE_MAGIC)
+            _write_block(file, json.dumps(self._status_names).encode())
+            _write_block(file, '\n'.join(self._names[row] for row in rows).encode())
+            if len(rows) == len(self._names):  # no holes: write the columns as they are
+                columns = (self._ips, self._ports, self._statuses)
+            else:
+                columns = (array('I', (self._ips[row] for row in rows)),
+                           array('H', (self._ports[row] for row in rows)),
+                           bytearray(self._statuses[row] for row in rows))
+            for column in columns:
+                _write_block(file, _little_endian(column))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as file:
+            if file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"{path} is not a server inventory file")
+            status_names = json.loads(_read_block(file))
+            names_data = _read_block(file).decode()
+            ips, ports = array('I'), array('H')
+            ips.frombytes(_read_block(file))
+            ports.frombytes(_read_block(file))
+            statuses = bytearray(_read_block(file))
+        if sys.byteorder == 'big':
+            ips.byteswap()
+            ports.byteswap()
+
+        inventory = cls()
+        inventory._names = names_data.split('\n') if names_data else []
+        if not len(inventory._names) == len(ips) == len(ports) == len(statuses):
+            raise ValueError(f"{path}: column lengths do not match")
+        inventory._ips, inventory._ports, inventory._statuses = ips, ports, statuses
+        inventory._status_names = status_names
+        inventory._status_codes = {name: code for code, name in enumerate(status_names)}
+        inventory._rows = {name: row for row, name in enumerate(inventory._names)}
+        if len(inventory._rows) != len(inventory._names):
+            raise ValueError(f"{path}: duplicate server names")
+        inventory._rebuild_indexes()
+        return inventory
+
+    # ---------- Internals ----------
+
+    def _record(self, row):
+        return Server(self._names[row], int_to_ip(self._ips[row]), self._ports[row],
+                      self._status_names[self._statuses[row]])
+
+    def _names_of(self, rows):
+        names = self._names
+        return [names[row] for row in rows]
+
+    def _status_code(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            if len(self._status_names) >= MAX_STATUSES:
+                raise ValueError(f"Too many different statuses (max {MAX_STATUSES})")
+            code = self._status_codes[status] = len(self._status_names)
+            self._status_names.append(status)
+        return code
+
+    def _ip_position(self, ip_number):
+        """Position of the first row with this ip in _by_ip (binary search on the ips column)."""
+        return bisect_left(self._by_ip, ip_number, key=self._ips.__getitem__)
+
+    def _index_row(self, row):
+        self._insert(self._by_status, self._statuses[row], row)
+        self._insert(self._by_port, self._ports[row], row)
+        insort(self._by_ip, row, key=self._ips.__getitem__)
+
+    def _unindex_row(self, row):
+        self._discard(self._by_status, self._statuses[row], row)
+        self._discard(self._by_port, self._ports[row], row)
+        by_ip = self._by_ip
+        position = self._ip_position(self._ips[row])
+        while by_ip[position] != row:  # several servers can share an ip: find this row among them
+            position += 1
+        del by_ip[position]
+
+    @staticmethod
+    def _insert(index, key, row):
+        rows = index.get(key)
+        if rows is None:
+            rows = index[key] = array('I')
+        insort(rows, row)
+
+    @staticmethod
+    def _discard(index, key, row):
+        rows = index.get(key)
+        if rows is not None:
+            position = bisect_left(rows, row)
+            if position < len(rows) and rows[position] == row:
+                del rows[position]
+            if not rows:
+                del index[key]
+
+    def _rebuild_indexes(self):
+        """Build every index in one pass (rows in order, so append keeps the arrays sorted)."""
+        self._by_status, self._by_port = {}, {}
+        rows = sorted(self._rows.values())
+        for row in rows:
+            by_status = self._by_status.get(self._statuses[row])
+            if by_status is None:
+                by_status = self._by_status[self._statuses[row]] = array('I')
+            by_status.append(row)
+            by_port = self._by_port.get(self._ports[row])
+            if by_port is None:
+                by_port = self._by_port[self._ports[row]] = array('I')
+            by_port.append(row)
+        self._by_ip = array('I', sorted(rows, key=self._ips.__getitem__))
+
+
+if __name__ == "__main__":
+    server_config = {
+        'server1': {'ip': '192.168.1.1', 'port': 8080, 'status': 'active'},
+        'server2': {'ip': '192.168.1.2', 'port': 8000, 'status': 'inactive'},
+        'server3': {'ip': '192.168.1.3', 'port': 9000, 'status': 'active'}
+    }
+    inventory = ServerInventory.from_dict(server_config)
+    print("server2 status:", inventory.get_status('server2'))   # inactive
+    print("active servers:", inventory.by_status('active'))     # ['server1', 'server3']
+    print("on port 8080:", inventory.by_port(8080))             # ['server1']
+    inventory.set_status('server2', 'active')
+    print("status counts:", inventory.status_counts())          # {'active': 3}
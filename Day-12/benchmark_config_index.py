@@ -0,0 +1,126 @@
+# benchmark_config_index.py
+# ----------------------------------------------------
+# Compare the mmap-backed ServerConfig index (config_index.py) with a
+# naive full text scan (what update_server.py-style code does for a read).
+#
+# For each file size we measure:
+# - naive:    scan the file line by line for every lookup
+# - index:    first lookup (lazy parse up to the key) + 1000 cached lookups
+# - parse:    full parse of the file (worst case: key at the end / missing)
+# - reload:   re-index after changing ONE value in the middle of the file
+#
+# First checks reload() on small edge cases (file without a trailing newline
+# that grows, keys added / removed at the end).
+#
+# Run:
+#   python benchmark_config_index.py                 # 10^4 .. 10^6 lines
+#   python benchmark_config_index.py --max-exp 7
+# ----------------------------------------------------
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from config_index import ServerConfig
+
+LOOKUPS = 1000
+
+
+def naive_lookup(file_path, key):
+    """Scan the whole file as text until the key is found."""
+    with open(file_path) as file:
+        for line in file:
+            name, separator, rest = line.partition('=')
+            if separator and name.strip() == key:
+                return rest.split('#', 1)[0].strip()
+    return None
+
+
+def make_config(path, lines):
+    with open(path, 'w') as file:
+        for number in range(lines):
+            if number % 50 == 0:
+                file.write(f'# ---------- Section {number // 50} ----------\n')
+            else:
+                file.write(f'KEY_{number} = value_{number}            # setting number {number}\n')
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def check_reload(folder):
+    """reload() must give the same answers as a fresh ServerConfig."""
+    path = os.path.join(folder, 'edge.conf')
+    cases = [
+        ('A = 1', 'A = 12\nB = 2\n'),        # old last line had no newline, then grew
+        ('A = 1\nB = 2', 'A = 1\nB = 23'),   # last value made longer
+        ('A = 1\nB = 2\n', 'A = 1\n'),       # last key removed
+        ('A = 1\n', 'A = 1\nB = 2\n'),       # key appended
+    ]
+    for old, new in cases:
+        with open(path, 'w') as file:
+            file.write(old)
+        config = ServerConfig(path)
+        config.parse_all()
+        with open(path, 'w') as file:
+            file.write(new)
+        config.reload()
+        fresh = ServerConfig(path)
+        for key in ('A', 'B'):
+            assert config.get(key) == fresh.get(key), f"reload {old!r} → {new!r}: {key}"
+        config.close()
+        fresh.close()
+    print(f"reload edge cases ok ({len(cases)})\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ServerConfig vs naive scan')
+    parser.add_argument('--max-exp', type=int, default=6, help='largest size is 10^max-exp lines')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        check_reload(folder)
+
+    print(f"{'lines':>10} | {'naive/lookup':>13} | {'1st lookup':>11} {'cached/lookup':>14} "
+          f"| {'full parse':>11} | {'reload(1 edit)':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        for exponent in range(4, args.max_exp + 1):
+            lines = 10 ** exponent
+            path = os.path.join(folder, 'server.conf')
+            make_config(path, lines)
+            keys = [f'KEY_{random.randrange(1, lines)}' for _ in range(LOOKUPS)]
+            keys = [key for key in keys if int(key[4:]) % 50] or ['KEY_1']
+
+            # Naive: a handful of full scans is enough to get the per-lookup cost
+            sample = keys[:5]
+            naive_time, _ = timed(lambda: [naive_lookup(path, key) for key in sample])
+            naive_per = naive_time / len(sample)
+
+            config = ServerConfig(path)
+            first_time, _ = timed(lambda: config.get(keys[0]))
+            config.parse_all()
+            cached_time, _ = timed(lambda: [config.get(key) for key in keys])
+
+            full_time, _ = timed(lambda: ServerConfig(path).parse_all())
+
+            # Change one value in the middle, then reload incrementally
+            middle = f'KEY_{lines // 2 + 1} = value_{lines // 2 + 1}'
+            with open(path) as file:
+                text = file.read()
+            with open(path, 'w') as file:
+                file.write(text.replace(middle, middle + '_edited', 1))
+            reload_time, reparsed = timed(config.reload)
+
+            print(f"{lines:>10} | {naive_per * 1e3:>10.2f} ms | {first_time * 1e3:>8.2f} ms "
+                  f"{cached_time / len(keys) * 1e6:>11.2f} us | {full_time * 1e3:>8.1f} ms "
+                  f"| {reload_time * 1e3:>8.1f} ms ({reparsed // 1024} KB re-parsed)")
+            config.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmark_rollout.py
+# ----------------------------------------------------
+# Compare serial, thread pool and process pool rollouts (rollout_config.py)
+# on a synthetic tree with one server.conf per host.
+#
+# Each mode writes a DIFFERENT value, so every mode really rewrites every file.
+#
+# Run:
+#   python benchmark_rollout.py                  # 10,000 files
+#   python benchmark_rollout.py --files 100000   # the full 100k-host fleet
+# ----------------------------------------------------
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from rollout_config import MODES, find_config_files, run_rollout
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_tree(root, files):
+    """root/rack-XXX/host-XXXXXX/server.conf, 100 hosts per rack, copied from ./server.conf."""
+    with open(os.path.join(HERE, 'server.conf')) as template:
+        content = template.read()
+    for number in range(files):
+        folder = os.path.join(root, f'rack-{number // 100:04d}', f'host-{number:06d}')
+        os.makedirs(folder)
+        with open(os.path.join(folder, 'server.conf'), 'w') as file:
+            file.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark config rollout modes')
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='rollout-bench-')
+    try:
+        print(f"Creating {args.files} config files ...")
+        make_tree(root, args.files)
+        paths = list(find_config_files(root))
+
+        print(f"{'mode':<8} {'seconds':>8} {'files/sec':>10}   (workers={args.workers})")
+        for number, mode in enumerate(MODES):
+            updates = {'MAX_CONNECTIONS': str(1000 + number), 'TIMEOUT': str(40 + number)}
+            start = time.perf_counter()
+            statuses = [status for _, status, _ in run_rollout(paths, updates, mode, args.workers)]
+            elapsed = time.perf_counter() - start
+            assert statuses.count('updated') == len(paths), f"{mode}: not every file was updated"
+            print(f"{mode:<8} {elapsed:>8.2f} {len(paths) / elapsed:>10.0f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmark_update_server.py
+# ----------------------------------------------------
+# Compare the original readlines() updater with the streaming updater
+# in update_server.py on synthetic configs of 10^3 ... 10^N lines.
+#
+# For each size we update 5 keys:
+# - legacy:    the original function, called once per key (5 full reads + rewrites)
+# - streaming: update_server_config(path, {5 keys}) → one pass, temp file + os.replace
+#
+# We report wall time and peak Python memory (tracemalloc).
+# Before the table, a few tricky lines are checked (spacing and inline comments kept).
+#
+# Run:
+#   python benchmark_update_server.py                 # 10^3 .. 10^6 lines
+#   python benchmark_update_server.py --max-exp 7     # up to 10^7 lines (~400 MB file, slow)
+# ----------------------------------------------------
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from update_server import update_config_line, update_server_config
+
+UPDATES = {f'KEY_{n}': 'updated' for n in (1, 10, 100, 500, 999)}
+
+
+def legacy_update_server_config(file_path, key, value):
+    """The original implementation (readlines + rewrite in place, substring match)."""
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+    with open(file_path, 'w') as file:
+        for line in lines:
+            if key in line:
+                file.write(key + "=" + value + "\n")
+            else:
+                file.write(line)
+
+
+def legacy_update_many(file_path, updates):
+    for key, value in updates.items():
+        legacy_update_server_config(file_path, key, value)
+
+
+def make_config(path, lines):
+    """Write a synthetic config: sections, comments and KEY_n = value lines."""
+    with open(path, 'w') as file:
+        for number in range(lines):
+            if number % 50 == 0:
+                file.write(f'# ---------- Section {number // 50} ----------\n')
+            else:
+                file.write(f'KEY_{number % 1000} = value_{number}            # setting number {number}\n')
+
+
+def measure(func, path):
+    """Return (seconds, peak_bytes). Time and memory are measured in separate runs."""
+    start = time.perf_counter()
+    func(path, UPDATES)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(path, UPDATES)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def check_lines():
+    """update_config_line() must keep indentation, ' = ' spacing and inline comments."""
+    cases = [
+        ('PORT = 80   # web\n', 'PORT = 8080 # web\n'),        # comment stays in its column
+        ('  PORT=80\r\n', '  PORT=8080\r\n'),                # indentation and CRLF kept
+        ('PORT =   # set me\n', 'PORT = 8080 # set me\n'),    # empty value: comment kept
+        ('PORT =\n', 'PORT =8080\n'),                        # empty value, no comment
+        ('MAX_PORT = 80\n', 'MAX_PORT = 80\n'),              # other key: untouched
+        ('# PORT = 80\n', '# PORT = 80\n'),                  # comment line: untouched
+    ]
+    for line, expected in cases:
+        new_line, _ = update_config_line(line, {'PORT': '8080'})
+        assert new_line == expected, f"{line!r} → {new_line!r}, expected {expected!r}"
+    print(f"config line edge cases ok ({len(cases)})\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark config updaters')
+    parser.add_argument('--max-exp', type=int, default=6, help='largest size is 10^max-exp lines')
+    args = parser.parse_args()
+
+    check_lines()
+    print(f"{'lines':>10} {'file MB':>8} | {'legacy s':>9} {'legacy MB':>10} | {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        for exponent in range(3, args.max_exp + 1):
+            lines = 10 ** exponent
+            path = os.path.join(folder, 'server.conf')
+            make_config(path, lines)
+            size_mb = os.path.getsize(path) / 1e6
+
+            legacy_time, legacy_peak = measure(legacy_update_many, path)
+            make_config(path, lines)  # legacy mangles the file; start from a clean copy
+            stream_time, stream_peak = measure(update_server_config, path)
+
+            print(f"{lines:>10} {size_mb:>8.1f} | {legacy_time:>9.3f} {legacy_peak / 1e6:>10.1f} "
+                  f"| {stream_time:>9.3f} {stream_peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
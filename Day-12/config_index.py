@@ -0,0 +1,293 @@
+# config_index.py
+# ----------------------------------------------------
+# Fast, indexed reader for server.conf-style files ("KEY = value  # comment")
+#
+# update_server.py has to scan the file as text to find a key. For big,
+# generated configs that are read far more often than written, we build an
+# index instead:
+#
+#   key → (byte offset, value, inline comment)
+#
+# - The file is memory-mapped (mmap): the OS pages it in on demand, we never
+#   copy the whole file into Python objects.
+# - Parsing is LAZY: get('PORT') parses block by block (~64 KB each) only
+#   until PORT is found. Keys already seen are answered from a dict (O(1)).
+# - reload() is INCREMENTAL: blocks whose bytes did not change (checked
+#   with a CRC32) are reused; only the changed region is parsed again.
+# - Typed accessors (int for PORT / MAX_CONNECTIONS, bool for SSL_ENABLED)
+#   are converted once and cached until the raw value changes.
+#
+# If a key appears twice, the FIRST definition wins.
+#
+# Usage:
+#   config = ServerConfig('server.conf')
+#   config.get('LOG_LEVEL')          # 'INFO'
+#   config.typed('PORT')             # 8080 (int)
+#   config.typed('SSL_ENABLED')      # True
+#   config.entry('PORT')             # ConfigEntry(offset=..., value='8080', comment='Port number ...')
+#   config.reload()                  # after the file changed on disk
+# ----------------------------------------------------
+
+import mmap
+import os
+import re
+import zlib
+from collections import namedtuple
+
+BLOCK_SIZE = 64 * 1024
+
+# The key at the start of a "KEY = value  # comment" line (bytes, multi-line mode).
+# Comment lines start with '#' and do not match because a key must come first.
+# While indexing we only record WHERE each key is; the value and comment are
+# cut out of the mmap (with plain bytes methods) the first time a key is read.
+KEY_PATTERN = re.compile(rb'^[ \t]*([A-Za-z0-9_.\-]+)[ \t]*=', re.MULTILINE)
+
+ConfigEntry = namedtuple('ConfigEntry', ['offset', 'value', 'comment'])
+
+# A parsed piece of the file: [start, end) byte range, its CRC32 and {key bytes: offset}.
+# Offsets are stored RELATIVE to the block start, so a block that only moved
+# (text inserted before it) is reused as-is with a new start.
+Block = namedtuple('Block', ['start', 'end', 'crc', 'entries'])
+
+
+def split_value(rest):
+    """Split b' value   # comment' into ('value', 'comment' or None)."""
+    cut = rest.find(b' #')
+    tab_cut = rest.find(b'\t#')
+    if tab_cut != -1 and (cut == -1 or tab_cut < cut):
+        cut = tab_cut
+    if cut == -1:
+        return rest.strip().decode(), None
+    return rest[:cut].strip().decode(), rest[cut + 2:].strip().decode()
+
+
+def parse_bool(text):
+    lowered = text.strip().lower()
+    if lowered in ('true', 'yes', 'on', '1'):
+        return True
+    if lowered in ('false', 'no', 'off', '0'):
+        return False
+    raise ValueError(f"Not a boolean: {text!r}")
+
+
+# Known keys and how to convert them. Unknown keys stay strings.
+KEY_TYPES = {
+    'PORT': int,
+    'MAX_CONNECTIONS': int,
+    'TIMEOUT': int,
+    'SSL_ENABLED': parse_bool,
+    'ENABLE_FEATURE_X': parse_bool,
+}
+
+
+class ServerConfig:
+    """Lazily parsed, mmap-backed index of a KEY = value config file."""
+
+    def __init__(self, file_path, block_size=BLOCK_SIZE, key_types=None):
+        self.file_path = file_path
+        self.block_size = block_size
+        self.key_types = dict(KEY_TYPES if key_types is None else key_types)
+        self._file = None
+        self._map = None
+        self._size = 0
+        self._signature = None
+        self._blocks = []        # parsed blocks, in file order
+        self._parsed_upto = 0    # everything before this offset is parsed
+        self._index = {}         # key bytes → Block that holds its (first) definition
+        self._entries = {}       # key → ConfigEntry, decoded on first access
+        self._typed = {}         # key → (raw value, converted value)
+        self._open()
+
+    # ---------- Lookups ----------
+
+    def entry(self, key):
+        """Return the ConfigEntry for key (None if the key is not in the file)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        raw_key = key.encode()
+        block = self._index.get(raw_key)
+        while block is None and self._parsed_upto < self._size:
+            self._parse_next_block()
+            block = self._index.get(raw_key)
+        if block is None:
+            return None
+
+        # Cut "KEY = value  # comment" out of the mapped file
+        offset = block.start + block.entries[raw_key]
+        line_end = self._map.find(b'\n', offset, block.end)
+        line = self._map[offset:block.end if line_end == -1 else line_end]
+        value, comment = split_value(line.partition(b'=')[2])
+        entry = self._entries[key] = ConfigEntry(offset, value, comment)
+        return entry
+
+    def get(self, key, default=None):
+        """Raw string value of key, or default."""
+        entry = self.entry(key)
+        return default if entry is None else entry.value
+
+    def __getitem__(self, key):
+        entry = self.entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry.value
+
+    def __contains__(self, key):
+        return self.entry(key) is not None
+
+    def typed(self, key, default=None):
+        """
+        Value converted with KEY_TYPES (int/bool/...), cached per raw value.
+        Raises ValueError if the text cannot be converted.
+        """
+        entry = self.entry(key)
+        if entry is None:
+            return default
+        cached = self._typed.get(key)
+        if cached is not None and cached[0] == entry.value:
+            return cached[1]
+        convert = self.key_types.get(key, str)
+        value = convert(entry.value)
+        self._typed[key] = (entry.value, value)
+        return value
+
+    def get_int(self, key, default=None):
+        entry = self.entry(key)
+        return default if entry is None else int(entry.value)
+
+    def get_bool(self, key, default=None):
+        entry = self.entry(key)
+        return default if entry is None else parse_bool(entry.value)
+
+    def keys(self):
+        """All keys (parses the rest of the file if needed)."""
+        self.parse_all()
+        return [key.decode() for key in self._index]
+
+    def parse_all(self):
+        while self._parsed_upto < self._size:
+            self._parse_next_block()
+
+    # ---------- Reloading ----------
+
+    def reload(self):
+        """
+        Re-read the file if it changed on disk. Unchanged blocks at the start
+        and at the end of the file are reused; only the region in between is
+        parsed again. Returns the number of bytes that were re-parsed now.
+        """
+        stat = os.stat(self.file_path)
+        if (stat.st_size, stat.st_mtime_ns, stat.st_ino) == self._signature:
+            return 0
+
+        old_blocks, old_size = self._blocks, self._size
+        fully_parsed = self._parsed_upto >= old_size
+        self.close()
+        self._open()
+        new_map, delta = self._map, self._size - old_size
+
+        # 1) Common prefix: old blocks whose bytes are identical at the same offsets.
+        # A block must also end a line: the old last block may stop at EOF in the
+        # middle of a line ('A = 1') that the new file continues ('A = 12\n...').
+        prefix = []
+        for block in old_blocks:
+            if block.end > self._size or zlib.crc32(new_map[block.start:block.end]) != block.crc:
+                break
+            if block.end < self._size and new_map[block.end - 1:block.end] != b'\n':
+                break
+            if block.end == old_size and self._size != old_size:
+                break  # the old last block: parsed again whenever the file grew or shrank
+            prefix.append(block)
+        prefix_end = prefix[-1].end if prefix else 0
+
+        # 2) Common suffix (only if we had parsed to the end): same bytes, shifted by delta
+        suffix = []
+        if fully_parsed:
+            for block in reversed(old_blocks[len(prefix):]):
+                start, end = block.start + delta, block.end + delta
+                if start < prefix_end or start < 0:
+                    break
+                if start > 0 and new_map[start - 1:start] != b'\n':
+                    break  # block would no longer start at the beginning of a line
+                if zlib.crc32(new_map[start:end]) != block.crc:
+                    break
+                suffix.append(block._replace(start=start, end=end))
+            suffix.reverse()
+
+        # 3) Parse only the changed middle region
+        self._blocks = prefix
+        self._parsed_upto = prefix_end
+        middle_end = suffix[0].start if suffix else self._size
+        reparsed = 0
+        while self._parsed_upto < middle_end:
+            reparsed += self._parse_next_block(limit=middle_end)
+        if suffix:
+            self._blocks.extend(suffix)
+            self._parsed_upto = suffix[-1].end
+
+        # Rebuild the key index from the blocks (no text parsing involved).
+        # Going backwards lets earlier blocks overwrite later ones: first definition wins.
+        self._index = {}
+        for block in reversed(self._blocks):
+            self._index.update(dict.fromkeys(block.entries, block))
+        return reparsed
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+        self._map = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ---------- Internals ----------
+
+    def _open(self):
+        self._entries = {}
+        self._file = open(self.file_path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._size = stat.st_size
+        self._signature = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        # mmap cannot map an empty file; an empty config simply has no keys
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b''
+        self._blocks = []
+        self._parsed_upto = 0
+        self._index = {}
+
+    def _parse_next_block(self, limit=None):
+        """Parse one block (ending at a line boundary) after _parsed_upto; returns its size."""
+        limit = self._size if limit is None else limit
+        start = self._parsed_upto
+        end = min(start + self.block_size, limit)
+        if end < limit:
+            newline = self._map.find(b'\n', end, limit)
+            end = limit if newline == -1 else newline + 1
+
+        data = self._map[start:end]
+        # Walk the matches backwards so the first definition in the block wins
+        matches = list(KEY_PATTERN.finditer(data))
+        entries = {match[1]: match.start(1) for match in reversed(matches)}
+
+        block = Block(start, end, zlib.crc32(data), entries)
+        self._blocks.append(block)
+        index = self._index
+        for key in entries:
+            if key not in index:
+                index[key] = block
+        self._parsed_upto = end
+        return end - start
+
+
+if __name__ == "__main__":
+    config = ServerConfig('server.conf')
+    print("PORT:", config.typed('PORT'))
+    print("MAX_CONNECTIONS:", config.typed('MAX_CONNECTIONS'))
+    print("SSL_ENABLED:", config.typed('SSL_ENABLED'))
+    print("LOG_FILE:", config.get('LOG_FILE'))
+    print("PORT entry:", config.entry('PORT'))
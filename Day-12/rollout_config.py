@@ -0,0 +1,177 @@
+# rollout_config.py
+# ----------------------------------------------------
+# Fleet-wide config rollout: apply the same key updates to EVERY server.conf
+# in a directory tree (one file per host), in parallel.
+#
+#   configs/
+#     web-001/server.conf
+#     web-002/server.conf
+#     ...
+#
+# Features:
+# - walks the tree and finds every file called server.conf (--name to change)
+# - applies updates with update_server_config() from update_server.py:
+#   one pass per file, temp file + os.replace → each file is committed atomically
+# - --dry-run prints a unified diff per file instead of writing anything
+# - resumable: finished files are appended to a journal; if the rollout is
+#   interrupted, running the same command again skips them
+# - serial, thread pool or process pool execution, with files/sec report
+#
+# Run:
+#   python rollout_config.py configs --set MAX_CONNECTIONS=800 --set TIMEOUT=45 --dry-run
+#   python rollout_config.py configs --set MAX_CONNECTIONS=800 --set TIMEOUT=45
+#   python rollout_config.py configs --set MAX_CONNECTIONS=800 --mode thread --workers 16
+# ----------------------------------------------------
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from update_server import update_config_line, update_server_config
+
+MODES = ('serial', 'thread', 'process')
+
+
+def find_config_files(root, name='server.conf'):
+    """Yield the path of every file called 'name' under root (sorted per folder)."""
+    for folder, subfolders, files in os.walk(root):
+        subfolders.sort()
+        if name in files:
+            yield os.path.join(folder, name)
+
+
+def apply_updates(path, updates):
+    """
+    Update one file. Returns (path, status, detail):
+      'updated'      → file rewritten atomically
+      'unchanged'    → all keys already had these values (file not touched)
+      'missing-keys' → file updated, but some keys were not found (detail lists them)
+      'error'        → the file could not be read/written (detail has the reason)
+    """
+    try:
+        found, changed = update_server_config(path, updates)
+    except OSError as error:
+        return path, 'error', str(error)
+    missing = sorted(set(updates) - found)
+    if missing:
+        return path, 'missing-keys', ','.join(missing)
+    return path, 'updated' if changed else 'unchanged', ''
+
+
+def diff_updates(path, updates):
+    """Return a unified diff (string) of what apply_updates() would change."""
+    with open(path, newline='') as file:
+        old_lines = file.readlines()
+    new_lines = [update_config_line(line, updates)[0] for line in old_lines]
+    return ''.join(difflib.unified_diff(old_lines, new_lines, fromfile=path, tofile=path + ' (new)'))
+
+
+def _diff_task(path, updates):
+    try:
+        return path, 'diff', diff_updates(path, updates)
+    except OSError as error:
+        return path, 'error', str(error)
+
+
+def journal_path_for(root, updates):
+    """One journal per (tree, set of updates): a different rollout never skips files by mistake."""
+    digest = hashlib.sha256(json.dumps(updates, sort_keys=True).encode()).hexdigest()[:12]
+    return os.path.join(root, f'.rollout-{digest}.journal')
+
+
+def read_journal(journal_path):
+    """Paths already finished by an earlier (interrupted) run."""
+    try:
+        with open(journal_path) as journal:
+            return {line.rstrip('\n') for line in journal if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def run_rollout(paths, updates, mode='process', workers=None, journal_path=None, dry_run=False, chunksize=64):
+    """
+    Apply updates to all paths. Yields (path, status, detail) as files finish.
+    Finished files are appended to journal_path (if given) so a rerun can skip them.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+
+    task = _diff_task if dry_run else apply_updates
+    done = read_journal(journal_path) if journal_path and not dry_run else set()
+    pending = [path for path in paths if path not in done]
+    for path in sorted(set(paths) & done):
+        yield path, 'skipped', 'already done (journal)'
+
+    journal = open(journal_path, 'a') if journal_path and not dry_run else None
+    try:
+        if mode == 'serial':
+            results = (task(path, updates) for path in pending)
+            yield from _journaled(results, journal)
+            return
+
+        executor_class = ProcessPoolExecutor if mode == 'process' else ThreadPoolExecutor
+        with executor_class(max_workers=workers) as pool:
+            # chunksize only matters for processes: ship paths in batches, not one by one
+            results = pool.map(task, pending, [updates] * len(pending), chunksize=chunksize)
+            yield from _journaled(results, journal)
+    finally:
+        if journal:
+            journal.close()
+
+
+def _journaled(results, journal):
+    for path, status, detail in results:
+        if journal and status in ('updated', 'unchanged', 'missing-keys'):
+            journal.write(path + '\n')
+            journal.flush()  # survive a crash right after this file
+        yield path, status, detail
+
+
+def parse_updates(pairs):
+    updates = {}
+    for pair in pairs:
+        key, separator, value = pair.partition('=')
+        if not separator or not key.strip():
+            raise argparse.ArgumentTypeError(f"--set expects KEY=VALUE, got {pair!r}")
+        updates[key.strip()] = value.strip()
+    return updates
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply config updates to every server.conf in a tree')
+    parser.add_argument('root', help='folder that contains one server.conf per host')
+    parser.add_argument('--set', dest='pairs', action='append', required=True, metavar='KEY=VALUE')
+    parser.add_argument('--name', default='server.conf', help='config file name to look for')
+    parser.add_argument('--mode', choices=MODES, default='process')
+    parser.add_argument('--workers', type=int, default=None, help='pool size (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='print diffs, change nothing')
+    parser.add_argument('--no-journal', action='store_true', help='do not record/skip finished files')
+    args = parser.parse_args()
+
+    updates = parse_updates(args.pairs)
+    journal_path = None if args.no_journal else journal_path_for(args.root, updates)
+    paths = list(find_config_files(args.root, args.name))
+
+    counts = {}
+    start = time.perf_counter()
+    for path, status, detail in run_rollout(paths, updates, args.mode, args.workers, journal_path, args.dry_run):
+        counts[status] = counts.get(status, 0) + 1
+        if status == 'diff':
+            sys.stdout.write(detail)
+        elif status in ('error', 'missing-keys'):
+            print(f"{status}: {path} {detail}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{len(paths)} files in {elapsed:.2f} s ({len(paths) / elapsed if elapsed else 0:.0f} files/sec) "
+          f"mode={args.mode}: {counts}")
+    if journal_path and not args.dry_run and not counts.get('error'):
+        os.remove(journal_path)  # rollout complete: the journal is no longer needed
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,112 @@
-# Function to update a specific configuration value in the server.conf file
-def update_server_config(file_path, key, value):
-    # Step 1: Read the existing content of the configuration file
-    with open(file_path, 'r') as file:
-        lines = file.readlines()  # Read all lines into a list
-
-    # Step 2: Open the file in write mode to overwrite with updated content
-    with open(file_path, 'w') as file:
-        for line in lines:
-            # Check if the current line contains the key we want to update
-            if key in line: # → updates if the key appears anywhere in the line.
-                # if line.strip().startswith(key): → safer (only updates if the line begins with the key).
-                # Replace the entire line with key=new_value
-                file.write(key + "=" + value + "\n")
-            else:
-                # Otherwise, keep the existing line unchanged
-                file.write(line)
+import os
+import re
+import shutil
+import tempfile
+
+# Matches one "KEY = value   # comment" line and splits it into parts:
+#   indent, key, separator (" = "), value, trailing comment (with its leading spaces), line ending
+# The separator takes as few blanks as it can and the value starts with a non-blank:
+# with an empty value ("PORT =   # c") the blanks stay in front of the comment,
+# so the comment is not mistaken for the value.
+CONFIG_LINE = re.compile(r'^(\s*)([A-Za-z0-9_.\-]+)(\s*=[ \t]*?)((?:\S.*?)?)(\s+#.*)?(\r?\n)?$')
+
+
+def update_config_line(line, updates):
+    """
+    Return (new_line, key) for one line of the config file.
+    - Only lines whose KEY (the part before '=') is exactly one of the keys
+      in 'updates' are changed. Comment lines and other keys that merely
+      contain the text (e.g. 'MAX_CONNECTIONS_PER_IP') are left alone.
+    - The indentation, the ' = ' spacing and the inline comment are kept;
+      the comment stays in the same column when the new value fits.
+    key is None when the line was not changed.
+    """
+    # Cheap check first (plain string ops): is the text before '=' one of our keys?
+    name, separator, _ = line.partition('=')
+    if not separator or name.strip() not in updates:
+        return line, None
+
+    match = CONFIG_LINE.match(line)
+    if not match:
+        return line, None
+
+    indent, key, separator, old_value, comment, newline = match.groups()
+    new_value = str(updates[key])
+    if comment and not old_value and not separator[-1].isspace():
+        # Empty value: keep one blank after the '=' so the new value is not glued to it
+        separator, comment = separator + comment[0], comment[1:]
+    if comment:
+        # Keep the '#' in the same column: shrink/grow the spaces in front of it
+        spaces = len(comment) - len(comment.lstrip())
+        padding = max(1, len(old_value) + spaces - len(new_value))
+        comment = ' ' * padding + comment.lstrip()
+    return f'{indent}{key}{separator}{new_value}{comment or ""}{newline or ""}', key
+
+
+# Function to update configuration values in the server.conf file
+def update_server_config(file_path, key, value=None):
+    """
+    Update one key (update_server_config(path, 'PORT', '9090')) or many keys
+    in ONE pass (update_server_config(path, {'PORT': '9090', 'TIMEOUT': '60'})).
+    Returns (keys, rewritten): the set of keys that were found, and whether the
+    file was rewritten (False when every key already had its value).
+
+    How it stays safe and fast on huge files:
+    - The file is read line by line (constant memory, no readlines()).
+    - New content goes to a temporary file in the same folder.
+    - os.replace() swaps the temp file in atomically: a crash mid-write
+      leaves the original server.conf untouched.
+    - If nothing changed, the original file is not rewritten at all.
+    """
+    updates = key if isinstance(key, dict) else {key: value}
+    updated_keys = set()
+    changed = False
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.conf')
+    try:
+        # newline='' keeps the original line endings (\n or \r\n) as they are
+        with open(file_path, 'r', newline='') as source, os.fdopen(fd, 'w', newline='') as target:
+            for line in source:
+                new_line, found = update_config_line(line, updates)
+                if found is not None:
+                    updated_keys.add(found)
+                    changed = changed or new_line != line
+                target.write(new_line)
+            target.flush()
+            os.fsync(target.fileno())  # Make sure the data is on disk before the swap
+
+        if changed:
+            shutil.copymode(file_path, temp_path)  # Keep the original file permissions
+            os.replace(temp_path, file_path)       # Atomic swap
+        else:
+            os.remove(temp_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return updated_keys, changed
+
 
 # -------------------------------
 # Example usage of the function
 # -------------------------------
 
-# Path to the server configuration file
-server_config_file = 'server.conf'
+if __name__ == "__main__":
+    # Path to the server configuration file
+    server_config_file = 'server.conf'
+
+    # The configuration key we want to update
+    key_to_update = 'MAX_CONNECTIONS'
 
-# The configuration key we want to update
-key_to_update = 'MAX_CONNECTIONS'
+    # The new value to set for this key
+    new_value = '600'  # Update maximum allowed client connections
 
-# The new value to set for this key
-new_value = '600'  # Update maximum allowed client connections
+    # Call the function to update the config file
+    update_server_config(server_config_file, key_to_update, new_value)
 
-# Call the function to update the config file
-update_server_config(server_config_file, key_to_update, new_value)
+    print(f"Configuration updated: {key_to_update} set to {new_value}")
 
-print(f"Configuration updated: {key_to_update} set to {new_value}")
+    # Several keys at once, in a single pass over the file:
+    # update_server_config(server_config_file, {'PORT': '9090', 'TIMEOUT': '60'})
@@ -0,0 +1,89 @@
+"""
+Day-13: Benchmark – multi-region plan/apply (snapshot_planner.py) on moto
+-------------------------------------------------------------------------
+Creates stale and in-use snapshots in many regions of a moto-mocked AWS,
+gives every region a different API latency, then:
+
+1. scans the regions one after another (sum of all regions)
+2. builds the plan with build_plan() (all regions at the same time)
+3. applies the plan and checks that exactly the stale snapshots are gone
+
+moto answers all regions from this one Python process, so its own CPU time
+is shared by the region threads: build_plan() lands a bit above the slowest
+region here. Against real AWS the waiting is on the network and overlaps fully.
+
+Requirements: pip install boto3 moto
+
+Run:
+    python benchmark_snapshot_planner.py
+    python benchmark_snapshot_planner.py --regions 12 --snapshots 150
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('MOTO_EC2_LOAD_DEFAULT_AMIS', 'false')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from benchmark_snapshot_sweeper import add_latency, create_test_data
+from snapshot_planner import apply_plan, build_plan, scan_region
+from snapshot_sweeper import make_client
+
+REGIONS = ['us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'eu-west-1', 'eu-west-2',
+           'eu-central-1', 'ap-south-1', 'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'sa-east-1']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark multi-region snapshot planning on moto')
+    parser.add_argument('--regions', type=int, default=8, choices=range(1, len(REGIONS) + 1), metavar='N')
+    parser.add_argument('--snapshots', type=int, default=90, help='snapshots per region')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='latency of the slowest region')
+    args = parser.parse_args()
+
+    regions = REGIONS[:args.regions]
+    # Region i gets (i + 1) / N of the maximum latency: the last one is the slowest
+    latencies = {region: args.latency_ms / 1000 * (number + 1) / len(regions)
+                 for number, region in enumerate(regions)}
+
+    def client_factory(region, workers=16):
+        ec2 = make_client(region, workers)
+        add_latency(ec2, latencies[region])
+        return ec2
+
+    quiet = dict(log=lambda message: None)
+    with mock_aws():
+        expected_stale = 0
+        for region in regions:
+            expected_stale += create_test_data(boto3.client('ec2', region_name=region), args.snapshots)
+        print(f"{len(regions)} regions x {args.snapshots} snapshots, "
+              f"latency {min(latencies.values()) * 1e3:.0f}..{max(latencies.values()) * 1e3:.0f} ms\n")
+
+        start = time.perf_counter()
+        sequential = [scan_region(region, client_factory=client_factory) for region in regions]
+        sequential_time = time.perf_counter() - start
+        slowest = max(result['seconds'] for result in sequential)
+        print(f"sequential scan  {sequential_time:6.2f} s   (slowest region alone: {slowest:.2f} s)")
+
+        plan = build_plan(regions, client_factory=client_factory, **quiet)
+        print(f"build_plan()     {plan['scan_seconds']:6.2f} s   "
+              f"{plan['total_stale']} stale, ~{plan['estimated_gb_saved']} GB")
+        assert plan['total_stale'] == expected_stale, "plan does not match the test data"
+
+        start = time.perf_counter()
+        results = apply_plan(plan, workers=16, batch_size=50, client_factory=client_factory, **quiet)
+        apply_time = time.perf_counter() - start
+        deleted = sum(counts['deleted'] for counts in results.values())
+        print(f"apply_plan()     {apply_time:6.2f} s   {deleted} deleted")
+
+        left = sum(len(scan_region(region)['stale']) for region in regions)
+        assert deleted == expected_stale and left == 0, "apply did not delete exactly the stale snapshots"
+        print(f"\nScan {sequential_time / plan['scan_seconds']:.1f}x faster than sequential; "
+              f"no stale snapshots left.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Day-13: Benchmark – original lambda_handler vs snapshot_sweeper
+---------------------------------------------------------------
+Runs both against a local, moto-mocked EC2 (no AWS account needed) with the
+same set of snapshots, and compares API calls and wall time.
+
+Test data:
+- instances with their root volume snapshotted   → keep
+- volumes that are not attached, snapshotted     → stale
+- snapshots whose volume was deleted             → stale
+
+--latency-ms adds a delay to every API call (moto answers in ~1 ms, real AWS
+in tens of ms). --throttle-rate makes some delete_snapshot calls fail with
+RequestLimitExceeded during the sweeper run, to show the retries at work
+(the original handler has no retries, so it would simply crash).
+
+Requirements: pip install boto3 moto
+
+Run:
+    python benchmark_snapshot_sweeper.py
+    python benchmark_snapshot_sweeper.py --snapshots 3000 --latency-ms 30 --throttle-rate 0.1
+"""
+import argparse
+import os
+import random
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault('MOTO_EC2_LOAD_DEFAULT_AMIS', 'false')  # no built-in AMI snapshots
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+
+import boto3
+from moto import mock_aws
+
+from snapshot_sweeper import make_client, sweep, track_api_calls
+
+REGION = 'us-east-1'
+AMI_ID = 'ami-12c6146b'  # moto accepts any AMI ID for run_instances
+
+
+def legacy_lambda_handler(ec2):
+    """The handler from 03-cost-optimization-project.md (client passed in, prints removed)."""
+    response = ec2.describe_snapshots(OwnerIds=['self'])
+    instances_response = ec2.describe_instances(
+        Filters=[{'Name': 'instance-state-name', 'Values': ['running']}]
+    )
+    active_instance_ids = set()
+    for reservation in instances_response['Reservations']:
+        for instance in reservation['Instances']:
+            active_instance_ids.add(instance['InstanceId'])
+
+    deleted = 0
+    for snapshot in response['Snapshots']:
+        snapshot_id = snapshot['SnapshotId']
+        volume_id = snapshot.get('VolumeId')
+        if not volume_id:
+            ec2.delete_snapshot(SnapshotId=snapshot_id)
+            deleted += 1
+        else:
+            try:
+                volume_response = ec2.describe_volumes(VolumeIds=[volume_id])
+                volume = volume_response['Volumes'][0]
+                if not volume['Attachments']:
+                    ec2.delete_snapshot(SnapshotId=snapshot_id)
+                    deleted += 1
+            except ec2.exceptions.ClientError as e:
+                if e.response['Error']['Code'] == 'InvalidVolume.NotFound':
+                    ec2.delete_snapshot(SnapshotId=snapshot_id)
+                    deleted += 1
+    return deleted
+
+
+def create_test_data(ec2, snapshots):
+    """About a third of each kind. Returns how many snapshots are stale."""
+    per_kind = snapshots // 3
+    reservation = ec2.run_instances(ImageId=AMI_ID, MinCount=per_kind, MaxCount=per_kind)
+    for instance in reservation['Instances']:
+        root_volume = instance['BlockDeviceMappings'][0]['Ebs']['VolumeId']
+        ec2.create_snapshot(VolumeId=root_volume)
+
+    for _ in range(per_kind):
+        volume_id = ec2.create_volume(AvailabilityZone=f'{REGION}a', Size=8)['VolumeId']
+        ec2.create_snapshot(VolumeId=volume_id)
+
+    for _ in range(per_kind):
+        volume_id = ec2.create_volume(AvailabilityZone=f'{REGION}a', Size=8)['VolumeId']
+        ec2.create_snapshot(VolumeId=volume_id)
+        ec2.delete_volume(VolumeId=volume_id)
+    return 2 * per_kind
+
+
+def add_latency(ec2, latency):
+    def sleep(**kwargs):
+        time.sleep(latency)
+    ec2.meta.events.register('before-call.ec2.*', sleep)
+
+
+def add_throttling(ec2, rate):
+    """Make a share of delete_snapshot calls fail with RequestLimitExceeded (before reaching moto)."""
+    rng = random.Random(7)
+
+    def maybe_throttle(**kwargs):
+        if rng.random() < rate:
+            error = {'Error': {'Code': 'RequestLimitExceeded', 'Message': 'Request limit exceeded.'},
+                     'ResponseMetadata': {'HTTPStatusCode': 503}}
+            return SimpleNamespace(status_code=503), error
+        return None
+
+    ec2.meta.events.register('before-call.ec2.DeleteSnapshot', maybe_throttle)
+
+
+def run(label, snapshots, latency, func, throttle_rate=0.0):
+    with mock_aws():
+        setup = boto3.client('ec2', region_name=REGION)
+        stale = create_test_data(setup, snapshots)
+
+        ec2 = make_client(REGION)
+        calls = track_api_calls(ec2)
+        add_latency(ec2, latency)
+        if throttle_rate:
+            add_throttling(ec2, throttle_rate)
+
+        start = time.perf_counter()
+        deleted = func(ec2)
+        elapsed = time.perf_counter() - start
+        left = len(setup.describe_snapshots(OwnerIds=['self'])['Snapshots'])
+
+    assert deleted == stale, f"{label}: deleted {deleted}, expected {stale}"
+    print(f"{label:<18} {elapsed:8.2f} s  {sum(calls.values()):>6} API calls  "
+          f"deleted {deleted}, kept {left}  {dict(calls)}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark stale snapshot cleanup on moto')
+    parser.add_argument('--snapshots', type=int, default=1500)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='added delay per API call')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--throttle-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    print(f"{args.snapshots} snapshots, {args.latency_ms:.0f} ms per API call\n")
+    legacy = run('original handler', args.snapshots, latency, legacy_lambda_handler)
+    quiet = dict(log=lambda message: None)
+    fast = run('sweeper', args.snapshots, latency,
+               lambda ec2: sweep(ec2, workers=args.workers, **quiet)['deleted'],
+               throttle_rate=args.throttle_rate)
+    print(f"\n{legacy / fast:.1f}x faster "
+          f"(sweeper run had {args.throttle_rate:.0%} of deletes throttled and retried)")
+
+
+if __name__ == "__main__":
+    main()
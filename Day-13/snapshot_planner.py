@@ -0,0 +1,213 @@
+"""
+Day-13: Multi-Region Snapshot Cleanup – Plan, then Apply
+--------------------------------------------------------
+The project's lambda_handler only looks at the default region and deletes
+right away. This script splits the cleanup into two phases:
+
+1. PLAN (read-only)
+   - scans every configured region AT THE SAME TIME (one thread per region),
+     so the scan takes as long as the slowest region, not the sum of all
+   - per region, builds the snapshot → volume → instance graph ONCE
+     (paginated describe_snapshots / describe_volumes / describe_instances,
+     see snapshot_sweeper.py)
+   - writes a JSON plan: every stale snapshot with its reason and size,
+     plus the estimated GB saved per region
+2. APPLY
+   - reads the plan and deletes the snapshots, regions in parallel and each
+     region in batches (parallel deletes with throttling retry from
+     snapshot_sweeper.py)
+
+Review the plan (or send it for approval) before applying it.
+
+Run:
+    python snapshot_planner.py plan --regions us-east-1,eu-west-1 --output plan.json
+    python snapshot_planner.py plan --output plan.json          # all enabled regions
+    python snapshot_planner.py apply plan.json --workers 16
+
+The GB figure is an estimate: it adds up the snapshots' VolumeSize. EBS
+snapshots are incremental, so the real saving is usually lower.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+import boto3
+
+from snapshot_sweeper import (DELETE_WORKERS, PAGE_SIZE, delete_snapshots, list_snapshots,
+                              make_client, stale_reason, volume_index)
+
+APPLY_BATCH_SIZE = 200
+PLAN_MAX_AGE_HOURS = 24   # apply refuses older plans: the account may have changed
+
+
+def enabled_regions(region=None):
+    """All regions enabled for this account."""
+    ec2 = boto3.client('ec2', region_name=region or 'us-east-1')
+    return sorted(r['RegionName'] for r in ec2.describe_regions()['Regions'])
+
+
+def instance_states(ec2):
+    """{instance_id: state name} for every instance (all states, all pages)."""
+    paginator = ec2.get_paginator('describe_instances')
+    states = {}
+    for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZE}):
+        for reservation in page['Reservations']:
+            for instance in reservation['Instances']:
+                states[instance['InstanceId']] = instance['State']['Name']
+    return states
+
+
+def scan_region(region, require_running=False, min_age_days=0, client_factory=make_client):
+    """
+    Build the snapshot → volume → instance graph of one region and return its
+    part of the plan: {'region', 'snapshots', 'stale': [...], 'gb', 'seconds'}.
+    """
+    start = time.perf_counter()
+    ec2 = client_factory(region)
+    snapshots = list_snapshots(ec2)
+    volumes = volume_index(ec2)
+    states = instance_states(ec2)
+    running_ids = {i for i, state in states.items() if state == 'running'} if require_running else None
+    newest_allowed = datetime.now(timezone.utc) - timedelta(days=min_age_days)
+
+    stale = []
+    for snapshot in snapshots:
+        if min_age_days and snapshot['StartTime'] > newest_allowed:
+            continue  # too young to delete
+        reason = stale_reason(snapshot, volumes, running_ids)
+        if not reason:
+            continue
+        volume = volumes.get(snapshot.get('VolumeId'), {})
+        instance_ids = [a['InstanceId'] for a in volume.get('Attachments', []) if a.get('InstanceId')]
+        stale.append({
+            'snapshot_id': snapshot['SnapshotId'],
+            'volume_id': snapshot.get('VolumeId'),
+            'instances': {i: states.get(i, 'unknown') for i in instance_ids},
+            'size_gb': snapshot.get('VolumeSize', 0),
+            'start_time': snapshot['StartTime'].isoformat(),
+            'reason': reason,
+        })
+    return {
+        'region': region,
+        'snapshots': len(snapshots),
+        'stale': stale,
+        'gb': sum(item['size_gb'] for item in stale),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def build_plan(regions, require_running=False, min_age_days=0, client_factory=make_client, log=print):
+    """Scan all regions concurrently and return the plan (a JSON-serialisable dict)."""
+    start = time.perf_counter()
+    results, errors = [], {}
+    with ThreadPoolExecutor(max_workers=max(1, len(regions))) as pool:
+        futures = {pool.submit(scan_region, region, require_running, min_age_days, client_factory): region
+                   for region in regions}
+        for future in as_completed(futures):
+            region = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # one broken region must not hide the others
+                errors[region] = str(e)
+                log(f" {region}: scan failed: {e}")
+                continue
+            results.append(result)
+            log(f" {region}: {len(result['stale'])} of {result['snapshots']} snapshots stale, "
+                f"~{result['gb']} GB ({result['seconds']} s)")
+
+    results.sort(key=lambda result: result['region'])
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'rules': {'require_running': require_running, 'min_age_days': min_age_days},
+        'scan_seconds': round(time.perf_counter() - start, 3),
+        'total_stale': sum(len(result['stale']) for result in results),
+        'estimated_gb_saved': sum(result['gb'] for result in results),
+        'regions': results,
+        'errors': errors,
+    }
+
+
+def write_plan(plan, path):
+    with open(path, 'w') as file:
+        json.dump(plan, file, indent=2)
+
+
+def read_plan(path, max_age_hours=PLAN_MAX_AGE_HOURS):
+    with open(path) as file:
+        plan = json.load(file)
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(plan['created'])
+    if max_age_hours and age > timedelta(hours=max_age_hours):
+        raise ValueError(f"Plan is {age} old (limit {max_age_hours} h): run 'plan' again")
+    return plan
+
+
+def apply_region(region_plan, workers=DELETE_WORKERS, batch_size=APPLY_BATCH_SIZE,
+                 client_factory=make_client, log=print):
+    """Delete the stale snapshots of one region, batch by batch. Returns a status Counter dict."""
+    region = region_plan['region']
+    snapshot_ids = [item['snapshot_id'] for item in region_plan['stale']]
+    counts = {'deleted': 0, 'gone': 0, 'failed': 0}
+    if not snapshot_ids:
+        return counts
+
+    ec2 = client_factory(region, workers)
+    for start in range(0, len(snapshot_ids), batch_size):
+        batch = snapshot_ids[start:start + batch_size]
+        for snapshot_id, status, detail in delete_snapshots(ec2, batch, workers):
+            counts[status] += 1
+            if status == 'failed':
+                log(f" {region}: could not delete {snapshot_id}: {detail}")
+        log(f" {region}: {start + len(batch)}/{len(snapshot_ids)} done")
+    return counts
+
+
+def apply_plan(plan, workers=DELETE_WORKERS, batch_size=APPLY_BATCH_SIZE, client_factory=make_client, log=print):
+    """Apply a plan: regions in parallel, each with its own delete pool. Returns {region: counts}."""
+    region_plans = [region_plan for region_plan in plan['regions'] if region_plan['stale']]
+    if not region_plans:
+        return {}
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(region_plans)) as pool:
+        futures = {pool.submit(apply_region, region_plan, workers, batch_size, client_factory, log):
+                   region_plan['region'] for region_plan in region_plans}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan and apply stale EBS snapshot cleanup in many regions')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = commands.add_parser('plan', help='scan regions and write a deletion plan (read-only)')
+    plan_parser.add_argument('--regions', help='comma separated (default: all enabled regions)')
+    plan_parser.add_argument('--output', default='snapshot-plan.json')
+    plan_parser.add_argument('--require-running', action='store_true',
+                             help='snapshots of volumes attached only to stopped instances are stale too')
+    plan_parser.add_argument('--min-age-days', type=int, default=0, help='keep snapshots younger than this')
+
+    apply_parser = commands.add_parser('apply', help='delete the snapshots listed in a plan')
+    apply_parser.add_argument('plan')
+    apply_parser.add_argument('--workers', type=int, default=DELETE_WORKERS, help='parallel deletes per region')
+    apply_parser.add_argument('--batch-size', type=int, default=APPLY_BATCH_SIZE)
+    apply_parser.add_argument('--max-age-hours', type=float, default=PLAN_MAX_AGE_HOURS,
+                              help='refuse older plans (0 = no limit)')
+    args = parser.parse_args()
+
+    if args.command == 'plan':
+        regions = args.regions.split(',') if args.regions else enabled_regions()
+        plan = build_plan(regions, args.require_running, args.min_age_days)
+        write_plan(plan, args.output)
+        print(f" Plan: {plan['total_stale']} snapshots, ~{plan['estimated_gb_saved']} GB in "
+              f"{len(plan['regions'])} regions, scanned in {plan['scan_seconds']} s → {args.output}")
+    else:
+        plan = read_plan(args.plan, args.max_age_hours)
+        results = apply_plan(plan, args.workers, args.batch_size)
+        for region, counts in sorted(results.items()):
+            print(f" {region}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
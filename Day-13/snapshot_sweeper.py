@@ -0,0 +1,231 @@
+"""
+Day-13: Batched EBS Stale-Snapshot Sweeper
+------------------------------------------
+Runnable version of the lambda_handler in 03-cost-optimization-project.md
+that also works on accounts with tens of thousands of snapshots.
+
+The original handler:
+- calls describe_snapshots ONCE (no pagination → only the first page is seen)
+- calls describe_volumes once PER SNAPSHOT (N+1 API calls)
+- deletes snapshots one by one
+
+This sweeper:
+1. Lists snapshots, volumes (and running instances) with boto3 PAGINATORS.
+2. Builds an in-memory index {volume_id: volume} from ONE describe_volumes scan,
+   so checking a snapshot's volume is a dict lookup, not an API call.
+3. Deletes stale snapshots through a bounded thread pool (boto3 clients are
+   thread-safe). Throttling errors (RequestLimitExceeded, ...) are retried
+   with exponential backoff + jitter; the client itself uses botocore's
+   "adaptive" retry mode, which also slows down when AWS throttles.
+
+A snapshot is stale when (same rules as the original handler):
+- it has no associated volume
+- its volume no longer exists
+- its volume is not attached to any instance
+  (with require_running=True: not attached to a RUNNING instance)
+
+Run locally (uses your AWS CLI credentials):
+    python snapshot_sweeper.py --dry-run             # only print what would be deleted
+    python snapshot_sweeper.py --region eu-west-1 --workers 16
+
+Deploy as Lambda: handler = snapshot_sweeper.lambda_handler
+    event: {"dry_run": true, "workers": 8}
+
+IAM permissions: ec2:DescribeSnapshots, ec2:DescribeVolumes,
+ec2:DescribeInstances, ec2:DeleteSnapshot
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+PAGE_SIZE = 1000          # describe_snapshots / describe_volumes allow up to 1000 per page
+DELETE_WORKERS = 8
+MAX_ATTEMPTS = 6          # our own attempts per delete, on top of botocore's retries
+BASE_DELAY = 0.5          # seconds, doubled on every throttled attempt
+
+THROTTLING_CODES = {'RequestLimitExceeded', 'Throttling', 'ThrottlingException', 'RequestThrottled'}
+
+
+def make_client(region=None, workers=DELETE_WORKERS):
+    """EC2 client with adaptive retries and enough HTTP connections for the thread pool."""
+    config = Config(
+        retries={'mode': 'adaptive', 'max_attempts': 5},
+        max_pool_connections=max(10, workers),
+    )
+    return boto3.client('ec2', region_name=region, config=config)
+
+
+def track_api_calls(ec2):
+    """Count every API call made by this client: returns a Counter {operation: calls}."""
+    calls = Counter()
+
+    def count(model, **kwargs):
+        calls[model.name] += 1
+
+    ec2.meta.events.register('before-call.ec2.*', count)
+    return calls
+
+
+# ---------- Step 1: read everything with paginators ----------
+
+def list_snapshots(ec2):
+    """Every snapshot owned by this account (all pages)."""
+    paginator = ec2.get_paginator('describe_snapshots')
+    snapshots = []
+    for page in paginator.paginate(OwnerIds=['self'], PaginationConfig={'PageSize': PAGE_SIZE}):
+        snapshots.extend(page['Snapshots'])
+    return snapshots
+
+
+def volume_index(ec2):
+    """{volume_id: volume} for every volume, from one paginated describe_volumes scan."""
+    paginator = ec2.get_paginator('describe_volumes')
+    volumes = {}
+    for page in paginator.paginate(PaginationConfig={'PageSize': PAGE_SIZE}):
+        for volume in page['Volumes']:
+            volumes[volume['VolumeId']] = volume
+    return volumes
+
+
+def running_instance_ids(ec2):
+    """Set of IDs of all running EC2 instances."""
+    paginator = ec2.get_paginator('describe_instances')
+    instance_ids = set()
+    pages = paginator.paginate(
+        Filters=[{'Name': 'instance-state-name', 'Values': ['running']}],
+        PaginationConfig={'PageSize': PAGE_SIZE},
+    )
+    for page in pages:
+        for reservation in page['Reservations']:
+            for instance in reservation['Instances']:
+                instance_ids.add(instance['InstanceId'])
+    return instance_ids
+
+
+# ---------- Step 2: decide, using the in-memory index ----------
+
+def stale_reason(snapshot, volumes, running_ids=None):
+    """
+    Why this snapshot is stale, or None if it must be kept.
+    running_ids=None → any attachment keeps the snapshot (original handler behaviour).
+    """
+    volume_id = snapshot.get('VolumeId')
+    if not volume_id:
+        return 'no associated volume'
+    volume = volumes.get(volume_id)
+    if volume is None:
+        return f'associated volume {volume_id} not found'
+    attachments = volume.get('Attachments', [])
+    if not attachments:
+        return f'volume {volume_id} not attached to any instance'
+    if running_ids is not None and not any(a.get('InstanceId') in running_ids for a in attachments):
+        return f'volume {volume_id} not attached to a running instance'
+    return None
+
+
+def find_stale_snapshots(snapshots, volumes, running_ids=None):
+    """List of (snapshot_id, reason) for every stale snapshot."""
+    stale = []
+    for snapshot in snapshots:
+        reason = stale_reason(snapshot, volumes, running_ids)
+        if reason:
+            stale.append((snapshot['SnapshotId'], reason))
+    return stale
+
+
+# ---------- Step 3: delete in parallel ----------
+
+def delete_snapshot(ec2, snapshot_id, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY):
+    """
+    Delete one snapshot. Returns (snapshot_id, status, detail) with status
+    'deleted', 'gone' (already deleted) or 'failed'.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            ec2.delete_snapshot(SnapshotId=snapshot_id)
+            return snapshot_id, 'deleted', ''
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'InvalidSnapshot.NotFound':
+                return snapshot_id, 'gone', ''
+            if code not in THROTTLING_CODES or attempt == max_attempts:
+                # e.g. InvalidSnapshot.InUse: the snapshot backs an AMI
+                return snapshot_id, 'failed', f'{code}: {e.response["Error"].get("Message", "")}'
+            # Full jitter: threads that were throttled together don't retry together
+            time.sleep(random.uniform(0, base_delay * 2 ** (attempt - 1)))
+    return snapshot_id, 'failed', 'no attempts made'
+
+
+def delete_snapshots(ec2, snapshot_ids, workers=DELETE_WORKERS, **retry_options):
+    """Delete snapshots through a pool of 'workers' threads. Yields results as they finish."""
+    if not snapshot_ids:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(delete_snapshot, ec2, snapshot_id, **retry_options)
+                   for snapshot_id in snapshot_ids]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def sweep(ec2=None, dry_run=False, workers=DELETE_WORKERS, require_running=False, log=print):
+    """Find and delete stale snapshots. Returns a summary dict."""
+    ec2 = ec2 or make_client(workers=workers)
+
+    snapshots = list_snapshots(ec2)
+    volumes = volume_index(ec2)
+    running_ids = running_instance_ids(ec2) if require_running else None
+    log(f" Found {len(snapshots)} snapshots and {len(volumes)} volumes.")
+
+    stale = find_stale_snapshots(snapshots, volumes, running_ids)
+    reasons = dict(stale)
+    summary = {'snapshots': len(snapshots), 'stale': len(stale), 'deleted': 0, 'gone': 0, 'failed': 0}
+    if dry_run:
+        for snapshot_id, reason in stale:
+            log(f" Would delete snapshot {snapshot_id} ({reason}).")
+        return summary
+
+    for snapshot_id, status, detail in delete_snapshots(ec2, list(reasons), workers):
+        summary[status] += 1
+        if status == 'failed':
+            log(f" Could not delete snapshot {snapshot_id}: {detail}")
+        else:
+            log(f" Deleted snapshot {snapshot_id} ({reasons[snapshot_id]}).")
+    return summary
+
+
+def lambda_handler(event, context):
+    event = event or {}
+    workers = int(event.get('workers', DELETE_WORKERS))
+    summary = sweep(
+        make_client(workers=workers),
+        dry_run=bool(event.get('dry_run', False)),
+        workers=workers,
+        require_running=bool(event.get('require_running', False)),
+    )
+    return {"status": "completed", **summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete stale EBS snapshots')
+    parser.add_argument('--region', help='AWS region (default: from your AWS config)')
+    parser.add_argument('--workers', type=int, default=DELETE_WORKERS, help='parallel deletes')
+    parser.add_argument('--dry-run', action='store_true', help='only print what would be deleted')
+    parser.add_argument('--require-running', action='store_true',
+                        help='also delete snapshots whose volume is attached only to stopped instances')
+    args = parser.parse_args()
+
+    ec2 = make_client(args.region, args.workers)
+    calls = track_api_calls(ec2)
+    start = time.perf_counter()
+    summary = sweep(ec2, args.dry_run, args.workers, args.require_running)
+    print(f" {summary} in {time.perf_counter() - start:.1f} s, {sum(calls.values())} API calls: {dict(calls)}")
+
+
+if __name__ == "__main__":
+    main()
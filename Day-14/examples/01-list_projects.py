@@ -4,75 +4,91 @@
 
 # This code sample uses the 'requests' library:
 # http://docs.python-requests.org
-# 
+#
 # BEGINNER TIP: 'requests' is a Python library for making HTTP requests (like fetching web data).
 # Install it: pip install requests
-# This script is a direct copy from Jira's API docs—it's a simple GET request to list projects.
+# This script started as a direct copy from Jira's API docs (one GET of /rest/api/3/project).
+# That endpoint returns EVERY project in one big JSON list: on a site with thousands of
+# projects the whole body (and the whole parsed list) sits in memory before the first line prints.
+# Now it uses the paginated endpoint /rest/api/3/project/search instead:
+# - pages of 50 projects (startAt=0, 50, 100, ...); once the first page tells the "total",
+#   the other pages are fetched by a few threads at the same time
+# - each page is parsed while it downloads, one project at a time
+# - jira.search_projects() is a GENERATOR: a for-loop gets one project after the other,
+#   so the first project prints right away and memory stays small
 
-import requests  # Main library for HTTP requests (GET, POST, etc.)
-from requests.auth import HTTPBasicAuth  # For "basic" authentication (email + token login)
+import argparse  # Built-in module for command-line options (--format table)
 import json  # Built-in Python module to handle JSON (text data from APIs, like structured dictionaries)
 
-# URL: The full web address for Jira's "list projects" endpoint.
-# Replace with your own (e.g., https://your-site.atlassian.net/rest/api/3/project).
-# What is an endpoint? It's a specific path in the API (like a menu item) to get projects.
-url = "https://your-site.atlassian.net/rest/api/3/project"  # Hardcoded for demo; make it a variable for flexibility.
+# Shared Jira client (jira_client.py in this folder): one pooled requests.Session with
+# auth, JSON headers, retries on 429/5xx (honoring Retry-After) and latency histograms.
+from jira_client import JiraClient
+
+# JIRA_SITE: the base address of your Jira Cloud site.
+# Replace with your own (e.g., https://your-site.atlassian.net).
+# The client adds the endpoint path (/rest/api/3/project/search) itself.
+JIRA_SITE = "https://your-site.atlassian.net"  # Hardcoded for demo; make it a variable for flexibility.
 
 # API_TOKEN: Your secure token from Jira (not a password—generate in Security settings).
 # Replace the empty string. BETTER: Use env var (see tip below).
 API_TOKEN = ""  # Replace with your token (e.g., "ATATT3xFfGF0...")
 
-# Authentication: Pairs your email (username) with token (password) for secure access.
-# Replace the empty string with your email (e.g., "your-email@example.com").
-auth = HTTPBasicAuth("your-email@example.com", API_TOKEN)  # Replace email.
+# Options: python 01-list_projects.py --format table --workers 8
+parser = argparse.ArgumentParser(description='List all Jira projects')
+parser.add_argument('--format', choices=['ndjson', 'table'], default='ndjson',
+                    help='ndjson: one JSON object per line (for jq / scripts); table: KEY / NAME / TYPE columns')
+parser.add_argument('--page-size', type=int, default=50, help="projects per page (Jira's default is 50)")
+parser.add_argument('--workers', type=int, default=4, help='pages fetched at the same time (1 = one by one)')
+parser.add_argument('--query', help='only projects whose key or name contains this text')
+args = parser.parse_args()
 
-# Headers: Dictionary telling the server what to expect/send.
-# - "Accept": Asks for JSON response (ensures clean data, not HTML).
-# No "Content-Type" needed here (GET doesn't send data, just reads).
-# Beginner Tip: Headers are like "instructions" for the request (e.g., "Give me JSON!").
-headers = {
-  "Accept": "application/json"  # Requests JSON back from Jira.
-}
+# The client: pairs your email (username) with token (password) for secure access,
+# and sets the "Accept: application/json" header (asks Jira for JSON, not HTML) for every call.
+# Replace the email (e.g., "your-email@example.com").
+jira = JiraClient(JIRA_SITE, email="your-email@example.com", api_token=API_TOKEN)  # Replace email.
 
-# Make the Request: Uses requests.request()—a general function for any HTTP method.
+# Make the Requests: a generator, nothing is downloaded until the loop below asks for projects.
 # - "GET": Read-only (fetches data, doesn't change anything).
-# - headers: Attached to the request.
-# - auth: Includes login info (sent securely).
-response = requests.request(
-   "GET",  # Method: GET for reading data.
-   url,    # The endpoint URL.
-   headers=headers,  # Our instructions (Accept JSON).
-   auth=auth  # Login credentials.
-)
-
-# Parse Response: response.text is a JSON string (e.g., '[{"name": "Project1", ...}]').
-# json.loads() converts it to a Python list of dictionaries (easy to access).
-output = json.loads(response.text)  # Now 'output' is a list, like [project_dict1, project_dict2, ...]
+# - extra keyword arguments (query=...) become URL parameters of every page.
+params = {'query': args.query} if args.query else {}
+projects = jira.search_projects(page_size=args.page_size, workers=args.workers, **params)
 
-# Access First Project: output[0] gets the first item (index 0) in the list—a dictionary.
+# Print the Result: one line per project, as soon as it has been parsed.
+# Each project is a dictionary, e.g. {"id": "10000", "key": "DP", "name": "Demo Project", ...}
 # ["name"] gets the value for key "name" (like dict["key"]).
-name = output[0]["name"]  # e.g., "Your Project Name" (assumes at least one project exists).
-
-# Print the Result: Simple output.
-print(name)  # Output: e.g., Your Project Name
+if args.format == 'table':
+    print(f"{'KEY':<12} {'NAME':<40} TYPE")  # Fixed widths: the rows print before all names are known
+count = 0
+for project in projects:
+    count += 1
+    if args.format == 'table':
+        print(f"{project['key']:<12} {project['name'][:40]:<40} {project.get('projectTypeKey', '')}")
+    else:
+        print(json.dumps(project))
+if args.format == 'table':
+    print(f"{count} projects")
 
 # BEGINNER TIP: Add Error Handling (not in original, but recommended):
-# Uncomment below to check if successful (200 = OK).
-# if response.status_code == 200:
-#     print("Success! First project:", name)
-# else:
-#     print(f"Error {response.status_code}: {response.text}")
-# 
-# Full Loop: Print all names.
-# for proj in output:
-#     print(f"- {proj['name']} (Key: {proj['key']})")
-# 
+# A failing page (401 bad token, 404 wrong site) raises requests.HTTPError inside the loop:
+# import requests
+# try:
+#     for project in projects: ...
+# except requests.HTTPError as error:
+#     print(f"Error {error.response.status_code}: {error.response.text}")
+#
+# Only the first project: next() takes one item from a generator (None if there is none).
+# first = next(jira.search_projects(), None)
+# print(first["name"] if first else "No projects")
+#
+# NDJSON works well with jq: python 01-list_projects.py | jq -r .key
+#
 # Security Upgrade: Use env vars instead of hardcoding.
-# import os
-# EMAIL = os.environ.get('JIRA_EMAIL', 'your-email')
-# API_TOKEN = os.environ.get('JIRA_API_TOKEN', '')
-# auth = HTTPBasicAuth(EMAIL, API_TOKEN)
+# JiraClient() without arguments reads JIRA_URL, JIRA_EMAIL and JIRA_API_TOKEN:
+# jira = JiraClient()
 # Set in terminal: export JIRA_EMAIL="your-email" && export JIRA_API_TOKEN="your-token"
+#
+# Latency: print(jira.latency_report()) shows calls and p50/p90/p99 per endpoint.
+# Speed + memory on 50,000 projects: python benchmark_list_projects.py
 
-# Run: python list_projects.py
-# Expected: Prints your first project's name. If empty list or error, check auth/URL.
\ No newline at end of file
+# Run: python 01-list_projects.py --format table
+# Expected: A table of all your projects. If empty or error, check auth/URL.
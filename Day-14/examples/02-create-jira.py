@@ -8,10 +8,11 @@
 # BEGINNER TIP: Same as above—requests for HTTP, auth for login, json for data.
 # This is the POST version: Sends data to "create" a new ticket.
 
-import requests  # Main library for HTTP requests (GET, POST, etc.)
-from requests.auth import HTTPBasicAuth  # For "basic" authentication (email + token login)
 import json  # Built-in Python module to handle JSON (text data from APIs, like structured dictionaries)
 
+# Shared Jira client (jira_client.py in this folder): pooled connection, auth, headers, retries.
+from jira_client import NO_DUPLICATE_RETRY_STATUSES, JiraClient
+
 # URL: Endpoint for creating issues (tickets).
 # Replace with your own. /rest/api/3/issue is the standard path for POST.
 url = "https://your-site.atlassian.net/rest/api/3/issue"
@@ -19,17 +20,14 @@ url = "https://your-site.atlassian.net/rest/api/3/issue"
 # API_TOKEN: Same as above—your Jira token.
 API_TOKEN = ""  # Replace with your token (e.g., "ATATT3xFfGF0...").
 
-# Authentication: Email + token.
-# Replace the empty string with your email.
-auth = HTTPBasicAuth("your-email@example.com", API_TOKEN)  # Replace email.
-
-# Headers: Both Accept (response) and Content-Type (payload).
-# - Content-Type: **MANDATORY**—tells Jira the data is JSON (prevents 400 errors).
-# - Accept: Ensures JSON reply.
-headers = {
-  "Accept": "application/json",          # Request JSON response.
-  "Content-Type": "application/json"     # **KEY**: Payload is JSON data.
-}
+# The client: Email + token login, and both headers for every call:
+# - Content-Type: application/json — **MANDATORY**, tells Jira the data is JSON (prevents 400 errors).
+# - Accept: application/json — Ensures JSON reply.
+# Replace the email.
+# This script CREATES an issue, so only 429 (rate limited: Jira did nothing) is retried.
+# After a 500/502/504 the ticket may already exist, and sending it again could make a duplicate.
+jira = JiraClient(email="your-email@example.com", api_token=API_TOKEN,  # Replace email.
+                  retry_statuses=NO_DUPLICATE_RETRY_STATUSES)
 
 # Payload: The data to create the ticket—converted to JSON string.
 # json.dumps() turns the dict into a string (e.g., '{"fields": {...}}').
@@ -68,14 +66,11 @@ payload = json.dumps({  # Outer dict for the whole request.
 # Make the Request: POST to create the issue.
 # - "POST": Sends data to create something new.
 # - data=payload: The JSON body.
-# - headers: Includes Content-Type (critical!).
-# - auth: Login.
-response = requests.request(
-   "POST",      # Method: POST for creating.
+# - The client adds the headers (Content-Type is critical!) and the login,
+#   and retries automatically if Jira answers 429 (rate limit) — not on 5xx, see above.
+response = jira.post(
    url,         # Endpoint.
-   data=payload, # JSON data to send (the ticket details).
-   headers=headers,  # Accept/Content-Type.
-   auth=auth     # Credentials.
+   data=payload # JSON data to send (the ticket details).
 )
 
 # Print Full Response: Parses JSON, then pretty-prints it (sorted, indented).
@@ -93,13 +88,9 @@ print(json.dumps(json.loads(response.text), sort_keys=True, indent=4, separators
 #     print(f"Error {response.status_code}: {response.text}")
 # 
 # Simplify Payload: Remove "update": {} and extra ADF if not needed.
-# Security: Use os.environ.get('JIRA_API_TOKEN', '') for token/email.
-# import os
-# EMAIL = os.environ.get('JIRA_EMAIL', '')
-# API_TOKEN = os.environ.get('JIRA_API_TOKEN', '')
-# auth = HTTPBasicAuth(EMAIL, API_TOKEN)
+# Security: JiraClient() without arguments reads JIRA_URL, JIRA_EMAIL and JIRA_API_TOKEN from env vars.
 # 
-# Shorthand Alternative: requests.post(url, json=dict_payload, ...) — auto-handles dumps/headers.
+# Shorthand Alternative: jira.create_issue(fields_dict) — builds the {"fields": ...} body for you.
 
 # Run: python create_jira.py
 # Expected: Pretty JSON of new ticket (e.g., {"key": "DP-14", "fields": {...}}). Check Jira board!
\ No newline at end of file
@@ -0,0 +1,100 @@
+# Bulk Create Jira Issues (`03-bulk-create-jira.py`)
+
+#- Creates MANY tickets with Jira's bulk endpoint instead of one POST per ticket.
+
+# BEGINNER TIP: 02-create-jira.py makes one HTTP round-trip per ticket.
+# During an incident storm (hundreds of tickets per minute) that is slow and burns rate limit.
+# Jira's bulk endpoint accepts up to 50 issues in ONE request:
+#   POST /rest/api/3/issue/bulk   body: {"issueUpdates": [ {"fields": {...}}, ... ]}
+# The answer lists the created issues AND the ones that failed:
+#   {"issues": [{"key": "DP-14", ...}, ...],
+#    "errors": [{"failedElementNumber": 2, "status": 400, "elementErrors": {...}}]}
+# "failedElementNumber" is the position of the failed issue in OUR list—so we can map
+# every error back to the input that caused it.
+
+import json  # Built-in Python module to handle JSON
+
+# Shared Jira client (jira_client.py in this folder): pooled connection, auth, headers, retries.
+# Three bulk calls in a row reuse ONE connection instead of three TLS handshakes.
+from jira_client import NO_DUPLICATE_RETRY_STATUSES, JiraClient
+
+# URL: Bulk endpoint for creating issues. Replace with your own site.
+url = "https://your-site.atlassian.net/rest/api/3/issue/bulk"
+
+# API_TOKEN and email: same as 02-create-jira.py.
+API_TOKEN = ""  # Replace with your token (e.g., "ATATT3xFfGF0...").
+# Creates issues: only 429 is retried (a resent bulk call after a 5xx could duplicate tickets).
+jira = JiraClient(email="your-email@example.com", api_token=API_TOKEN,  # Replace email.
+                  retry_statuses=NO_DUPLICATE_RETRY_STATUSES)
+
+BULK_LIMIT = 50  # Jira accepts at most 50 issues per bulk call.
+
+# The tickets we want to create (e.g., one per alert). An empty summary will fail on purpose,
+# so you can see how errors are mapped back to the input.
+summaries = [f"Alert storm ticket {number}" for number in range(1, 121)]
+summaries[5] = ""  # Invalid: Jira requires a summary.
+
+
+def issue_payload(summary):
+    """Build the JSON for ONE issue (same fields as 02-create-jira.py)."""
+    return {
+        "fields": {
+            "description": {
+                "content": [{"content": [{"text": "Created by bulk script", "type": "text"}], "type": "paragraph"}],
+                "type": "doc",
+                "version": 1
+            },
+            "project": {"key": "DP"},        # Your project key.
+            "issuetype": {"id": "10006"},    # Your issue type ID.
+            "summary": summary,
+        }
+    }
+
+
+def bulk_create(items):
+    """
+    Create up to 50 issues in one call.
+    Returns a list with one entry per input item: ("created", key) or ("failed", error).
+    """
+    response = jira.post(
+        url,
+        data=json.dumps({"issueUpdates": [issue_payload(summary) for summary in items]})
+    )
+    try:
+        output = json.loads(response.text)
+    except ValueError:
+        output = response.text  # Not JSON (e.g., an HTML error page from a proxy)
+    # Per-item answers only come with a LIST of errors (one per failed item).
+    # Anything else is a whole-request failure: 401 bad token, or Jira's generic
+    # {"errorMessages": [...], "errors": {"field": "message"}} → every item failed.
+    if not isinstance(output, dict) or not isinstance(output.get("errors", []), list) or \
+            (response.status_code not in (200, 201) and "errors" not in output):
+        return [("failed", output)] * len(items)
+
+    # Map errors back by position; created issues come back in input order (minus the failures).
+    errors = {error["failedElementNumber"]: error for error in output.get("errors", [])}
+    created = iter(output.get("issues", []))
+    results = []
+    for index in range(len(items)):
+        if index in errors:
+            results.append(("failed", errors[index]["elementErrors"]))
+        else:
+            issue = next(created, None)  # None: Jira returned fewer issues than expected
+            results.append(("created", issue["key"]) if issue else ("failed", "missing from bulk response"))
+    return results
+
+
+# Send the tickets in chunks of 50 → 120 tickets = 3 HTTP calls instead of 120.
+for start in range(0, len(summaries), BULK_LIMIT):
+    chunk = summaries[start:start + BULK_LIMIT]
+    for offset, (state, detail) in enumerate(bulk_create(chunk)):
+        number = start + offset  # Position in the ORIGINAL list
+        if state == "created":
+            print(f"#{number} '{summaries[number]}' → {detail}")
+        else:
+            print(f"#{number} '{summaries[number]}' FAILED: {detail}")
+
+# Run: python 03-bulk-create-jira.py
+# Expected: One line per ticket (e.g., "#0 'Alert storm ticket 1' → DP-15") and one FAILED line for #5.
+# The Flask app in Day-15 (02-github-jira.py + jira_queue.py) uses the same endpoint automatically,
+# batching webhook tickets for up to 50 items or 200 ms.
@@ -0,0 +1,104 @@
+# benchmark_list_projects.py
+# ----------------------------------------------------
+# Time and peak memory of listing 50,000 Jira projects against a local stub
+# (Day-15/examples/fake_jira.py, run in a child process so its own memory
+# does not count):
+#
+#   GET /project + json.loads   → the old 01-list_projects.py: one huge body,
+#                                 the whole list parsed before the first project
+#   search, 1 worker            → /project/search pages one after the other,
+#                                 each parsed from the stream (jira.search_projects)
+#   search, N workers           → the same with N pages downloading at once
+#
+# Every project is written out as an NDJSON line (to nowhere), like the script does.
+# Time and time-to-first-project come from a normal run; peak memory from a second
+# run under tracemalloc (Python allocations: body text, parsed dicts, buffers).
+#
+# Run:
+#   python benchmark_list_projects.py
+#   python benchmark_list_projects.py --projects 50000 --page-size 100 --latency 0.02 --workers 8
+# ----------------------------------------------------
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+from jira_client import JiraClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Day-15', 'examples'))
+from fake_jira import FakeJira
+
+
+def serve(projects, latency, urls, stop):
+    """Child process: the fake Jira with 'projects' projects, until 'stop' is set."""
+    fake = FakeJira(latency=latency, projects=projects).start()
+    urls.put(fake.url)
+    stop.wait()
+    fake.stop()
+
+
+def old_listing(jira):
+    response = jira.get('/rest/api/3/project')
+    response.raise_for_status()
+    yield from json.loads(response.text)
+
+
+def run(projects):
+    """Write every project as one JSON line; (count, seconds to the first project)."""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    with open(os.devnull, 'w') as sink:
+        for project in projects:
+            if first is None:
+                first = time.perf_counter() - start
+            sink.write(json.dumps(project) + '\n')
+            count += 1
+    return count, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark listing Jira projects: one big GET vs streamed pages')
+    parser.add_argument('--projects', type=int, default=50000, help='projects served by the stub')
+    parser.add_argument('--page-size', type=int, default=100, help='projects per /project/search page')
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds the stub waits per request')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent pages for the last run')
+    args = parser.parse_args()
+
+    urls, stop = multiprocessing.Queue(), multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(args.projects, args.latency, urls, stop), daemon=True)
+    server.start()
+    jira = JiraClient(urls.get(timeout=30), 'bench@example.com', 'token', pool_size=max(10, args.workers))
+
+    runs = {
+        'GET /project + json.loads': lambda: old_listing(jira),
+        'search, 1 worker': lambda: jira.search_projects(page_size=args.page_size, workers=1),
+        f'search, {args.workers} workers': lambda: jira.search_projects(page_size=args.page_size,
+                                                                       workers=args.workers),
+    }
+    print(f"{args.projects:,} projects, {args.latency * 1000:.0f} ms stub latency per request, "
+          f"pages of {args.page_size}:")
+    print(f"  {'':<28} {'total':>9} {'first project':>14} {'peak memory':>12}")
+    try:
+        for label, listing in runs.items():
+            start = time.perf_counter()
+            count, first = run(listing())
+            elapsed = time.perf_counter() - start
+            assert count == args.projects, f'{label}: {count} projects'
+
+            tracemalloc.start()
+            run(listing())
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {label:<28} {elapsed:8.2f}s {first * 1000:11.0f} ms {peak / 1e6:9.1f} MB")
+    finally:
+        stop.set()
+        server.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
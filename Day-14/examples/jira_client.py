@@ -0,0 +1,370 @@
+# jira_client.py
+# ----------------------------------------------------
+# One shared Jira REST client for all the Jira scripts
+#
+# BEGINNER TIP: the first versions of 01-list_projects.py and 02-create-jira.py
+# call requests.request(...) directly. That works, but EVERY call opens a new
+# TCP connection and does a new TLS handshake (several round trips to
+# atlassian.net) before the request is even sent.
+#
+# JiraClient keeps ONE requests.Session:
+# - keep-alive connection pool (pool_size connections, reused call after call)
+# - auth + JSON headers set once
+# - automatic retries with exponential backoff on 429 / 500 / 502 / 503 / 504
+#   and on connection errors; a "Retry-After" header from Jira (rate limit)
+#   is honored instead of our own backoff
+# - a latency histogram per endpoint ("GET /rest/api/3/project",
+#   "POST /rest/api/3/issue", ids replaced by {id}), printable as a small
+#   report or in Prometheus text format
+#
+# Retries happen inside the session's HTTPAdapter, so code that only gets
+# client.session (like the ETag cache in Day-11/http_cache.py or the ticket
+# queue in Day-15) gets the retries and the histograms too.
+#
+# NOTE: a POST answered with 5xx is retried as well. Jira normally rejects the
+# whole request in that case, but in a rare failure the issue may have been
+# created - pass retry_statuses=NO_DUPLICATE_RETRY_STATUSES (only 429: Jira did
+# not act on the call) when duplicates are worse than a failed call.
+#
+# Usage:
+#   jira = JiraClient()                     # JIRA_URL / JIRA_EMAIL / JIRA_API_TOKEN from the environment
+#   projects = jira.get('/rest/api/3/project').json()
+#   issue = jira.create_issue({"project": {"key": "DP"}, ...})
+#   for project in jira.search_projects():  # every project, page by page (generator)
+#       print(project['key'])
+#   print(jira.latency_report())
+# ----------------------------------------------------
+
+import codecs
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+DEFAULT_URL = 'https://your-site.atlassian.net'
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+NO_DUPLICATE_RETRY_STATUSES = (429,)  # rate limited: the request was never processed
+# Histogram bucket upper bounds in seconds (same idea as Prometheus histograms)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+PROJECT_PAGE_SIZE = 50  # Jira's default page size for /project/search
+STREAM_CHUNK = 64 * 1024  # bytes read at a time from a streamed response
+SEPARATORS = re.compile(r'[\s,]*')  # between array items
+
+# Path segments that are ids: numbers (10001) or issue keys (DP-14)
+ID_SEGMENT = re.compile(r'^(\d+|[A-Z][A-Z0-9_]*-\d+)$')
+
+
+def endpoint_name(method, url):
+    """'GET https://x/rest/api/3/issue/DP-14?fields=a' → 'GET /rest/api/3/issue/{id}'"""
+    segments = urlsplit(url).path.split('/')
+    for index, segment in enumerate(segments):
+        # the number right after /api/ is the API version, not an id
+        if ID_SEGMENT.match(segment) and (index == 0 or segments[index - 1] != 'api'):
+            segments[index] = '{id}'
+    return f"{method} {'/'.join(segments)}"
+
+
+def utf8_chunks(response, chunk_size=STREAM_CHUNK):
+    """Text chunks of a streamed (stream=True) JSON response; multi-byte characters never split."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in response.iter_content(chunk_size):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def iter_json_array(chunks, key, header=None):
+    """
+    Yield the items of the array under 'key' of a JSON object while the text
+    chunks arrive: {"total": 2, "values": [{...}, {...}]} → {...}, {...}
+    Only the current item and one chunk are held in memory, never the whole body.
+    header: optional dict, filled with the fields BEFORE the array ("total", "isLast", ...).
+    """
+    decoder = json.JSONDecoder()
+    needle = f'"{key}"'
+    chunks = iter(chunks)
+    buffer = ''
+    # 1. Read until '"values": [' has arrived
+    while True:
+        found = buffer.find(needle)
+        bracket = buffer.find('[', found + len(needle)) if found != -1 else -1
+        if bracket != -1:
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            return  # no such array
+        buffer += chunk
+    if header is not None:
+        try:
+            header.update(json.loads(buffer[:found].rstrip().rstrip(',') + '}'))
+        except ValueError:
+            pass  # the fields before the array are not simple: no header
+    position = bracket + 1
+
+    # 2. One item at a time: raw_decode() parses the value starting at 'position'
+    #    and tells where it ended; an item cut by the chunk end fails → read more
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if position == len(buffer):
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ValueError(f'JSON ended inside the "{key}" array')
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+        position = end
+        if position > STREAM_CHUNK:
+            buffer, position = buffer[position:], 0  # drop the text already parsed
+
+
+class LatencyHistogram:
+    """Counts of request durations per bucket, plus total count and sum."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (e.g. 99 → 'p99 <= 0.05 s')."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class JiraClient:
+    """Pooled, retrying Jira REST client with per-endpoint latency histograms."""
+
+    def __init__(self, base_url=None, email=None, api_token=None, pool_size=10, retries=4,
+                 backoff=0.5, max_backoff=30, timeout=30, verify=True, retry_statuses=RETRY_STATUSES):
+        self.base_url = (base_url or os.environ.get('JIRA_URL', DEFAULT_URL)).rstrip('/')
+        self.timeout = timeout
+        if verify is True:  # the CA bundle variables requests would read on every call
+            verify = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('CURL_CA_BUNDLE') or True
+        self.verify = verify  # True, False or the path of a CA bundle / self-signed certificate
+        email = email if email is not None else os.environ.get('JIRA_EMAIL', '')
+        api_token = api_token if api_token is not None else os.environ.get('JIRA_API_TOKEN', '')
+
+        # Retry rules, applied by urllib3 inside the adapter:
+        # - status_forcelist: retry these answers, for every method (allowed_methods=None)
+        # - backoff: sleep backoff * 2**(retry-1) seconds (max max_backoff), plus jitter
+        # - Retry-After on 429/503 replaces the backoff sleep
+        # - read=0: never resend a request after the connection died mid-answer
+        #   (the server may have acted on it); connect errors are always safe to retry
+        retry = Retry(total=retries, connect=retries, read=0, status=retries,
+                      status_forcelist=retry_statuses, allowed_methods=None,
+                      backoff_factor=backoff, backoff_max=max_backoff, backoff_jitter=backoff / 2,
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.auth = HTTPBasicAuth(email, api_token)
+        self.session.verify = verify
+        # requests reads the proxy / CA bundle environment variables again on EVERY call
+        # (~0.6 ms per call, more than a keep-alive round trip to a nearby server):
+        # read them once here instead
+        self.session.trust_env = False
+        self.session.proxies.update(requests.utils.get_environ_proxies(self.base_url))
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        })
+        # Called for every response that comes out of the session (after retries)
+        self.session.hooks['response'].append(self._observe)
+
+        self.histograms = {}    # endpoint name → LatencyHistogram
+        self.stats = Counter()  # requests / retries / status_XXX
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def url(self, path):
+        """'/rest/api/3/project' → full URL (full URLs are returned unchanged)."""
+        return path if path.startswith(('http://', 'https://')) else f'{self.base_url}{path}'
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    # ---------- Jira calls used by the scripts ----------
+
+    def list_projects(self):
+        response = self.get('/rest/api/3/project')
+        response.raise_for_status()
+        return response.json()
+
+    def search_projects(self, page_size=PROJECT_PAGE_SIZE, workers=4, **params):
+        """
+        Generator: every project from GET /rest/api/3/project/search (startAt / maxResults paging).
+
+        The first page is streamed; as soon as its "total" has arrived, the other
+        pages are requested by 'workers' threads (at most 2 x workers pages waiting),
+        while the projects keep coming out in order. Without a total, pages are
+        fetched one after the other until "isLast". Extra params (query, orderBy, ...)
+        are passed to Jira. Jira may answer with fewer than page_size projects per
+        page (it caps maxResults): the next startAt always follows what it returned.
+        """
+        header = {}
+        first_page = self._project_page(0, page_size, params, header)
+        first = next(first_page, None)  # the header is known from here on
+        total = header.get('total')
+        if first is None:
+            return
+        if not isinstance(total, int) or workers <= 1:
+            yield first
+            count = 1
+            for project in first_page:
+                count += 1
+                yield project
+            yield from self._sequential_pages(header.get('startAt', 0) + count, page_size, params, header)
+            return
+
+        # The page size Jira really used (e.g. 100 when 200 was asked for)
+        used = header.get('maxResults')
+        if isinstance(used, int) and 0 < used < page_size:
+            page_size = used
+        starts = iter(range(page_size, total, page_size))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jira-pages')
+        waiting = deque()
+        try:
+            for start in starts:
+                waiting.append(pool.submit(self._project_list, start, page_size, params))
+                if len(waiting) >= workers * 2:
+                    break
+            yield first
+            yield from first_page
+            while waiting:
+                page = waiting.popleft().result()
+                start = next(starts, None)
+                if start is not None:
+                    waiting.append(pool.submit(self._project_list, start, page_size, params))
+                yield from page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)  # also when the caller stops early
+
+    def _project_page(self, start_at, page_size, params, header=None):
+        """Generator over one /project/search page, parsed from the response stream."""
+        query = dict(params, startAt=start_at, maxResults=page_size)
+        with self.get('/rest/api/3/project/search', params=query, stream=True) as response:
+            response.raise_for_status()
+            yield from iter_json_array(utf8_chunks(response), 'values', header)
+
+    def _project_list(self, start_at, page_size, params):
+        return list(self._project_page(start_at, page_size, params))
+
+    def _sequential_pages(self, start_at, page_size, params, header):
+        """The pages after the one 'header' describes; each starts where the last one ended."""
+        while not header.get('isLast', False):
+            header = {}
+            count = 0
+            for project in self._project_page(start_at, page_size, params, header):
+                count += 1
+                yield project
+            if not count:
+                return
+            start_at = header.get('startAt', start_at) + count
+
+    def create_issue(self, fields, update=None):
+        """POST /rest/api/3/issue. Returns the response (201 + {"key": ...} when it worked)."""
+        return self.post('/rest/api/3/issue', json={"fields": fields, "update": update or {}})
+
+    def bulk_create(self, issue_updates):
+        """POST /rest/api/3/issue/bulk with up to 50 {"fields": ...} items. Returns the response."""
+        return self.post('/rest/api/3/issue/bulk', json={"issueUpdates": issue_updates})
+
+    # ---------- Latency histograms ----------
+
+    def _observe(self, response, *args, **kwargs):
+        """Session hook: time until the response headers arrived, retries and backoff included."""
+        name = endpoint_name(response.request.method, response.request.url)
+        retries = response.raw.retries  # urllib3's Retry object for this call (None without retries)
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(response.elapsed.total_seconds())
+            self.stats['requests'] += 1
+            self.stats[f'status_{response.status_code}'] += 1
+            if retries is not None:
+                self.stats['retries'] += len(retries.history)
+        return response
+
+    def latency_report(self):
+        """One line per endpoint: calls, average and bucketed p50 / p90 / p99."""
+        lines = []
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                average = histogram.total / histogram.count * 1000
+                lines.append(f"{name:<40} {histogram.count:>7} calls  avg {average:8.1f} ms  "
+                             f"p50 <= {histogram.percentile(50) * 1000:g} ms  "
+                             f"p90 <= {histogram.percentile(90) * 1000:g} ms  "
+                             f"p99 <= {histogram.percentile(99) * 1000:g} ms")
+        return '\n'.join(lines)
+
+    def metrics_text(self):
+        """Histograms in Prometheus text format (le = bucket upper bound, cumulative counts)."""
+        lines = ['# TYPE jira_request_seconds histogram']
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                method, path = name.split(' ', 1)
+                labels = f'method="{method}",endpoint="{path}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                    lines.append(f'jira_request_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'jira_request_seconds_sum{{{labels}}} {histogram.total:.6f}')
+                lines.append(f'jira_request_seconds_count{{{labels}}} {histogram.count}')
+            lines.append('# TYPE jira_request_retries_total counter')
+            lines.append(f"jira_request_retries_total {self.stats['retries']}")
+            lines.append('# TYPE jira_responses_total counter')
+            for name, count in sorted(self.stats.items()):
+                if name.startswith('status_'):
+                    lines.append(f'jira_responses_total{{status="{name[7:]}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -1,110 +1,192 @@
-# This code sample uses the 'requests' library:
-# http://docs.python-requests.org
-# The 'requests' library is a popular Python tool for making HTTP requests (like sending data to websites or APIs).
-# It simplifies interacting with web services, such as posting data to Jira.
-import requests
-# Import HTTPBasicAuth from requests.auth. This is used for basic authentication (username/password or token-based auth)
-# when making HTTP requests. Jira API uses this for secure access.
-from requests.auth import HTTPBasicAuth
-# Import the 'json' module, which helps work with JSON data (a common format for sending/receiving data over the web).
-# JSON looks like a dictionary in Python but is text-based for APIs.
-import json
+# Jira calls go through the shared Jira client from Day-14 (Day-14/examples/jira_client.py):
+# one pooled 'requests' session with basic auth (email + API token), JSON headers,
+# automatic retries on 429 only (honoring Jira's Retry-After; see below why not on 5xx)
+# and per-endpoint latency histograms.
+# 'sys' lets us add that folder to the import path.
+import sys
 # Import Flask to build a simple web application. Flask handles incoming web requests and sends responses.
-from flask import Flask
+# 'request' gives access to the incoming JSON body; 'jsonify' builds JSON responses.
+from flask import Flask, jsonify, request
+# 'os' reads settings from environment variables; 'queue' tells us when the ticket queue is full.
+import os
+import queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Day-14', 'examples'))
+from jira_client import NO_DUPLICATE_RETRY_STATUSES, JiraClient
+# Our background worker queue (jira_queue.py in this folder): Jira calls happen there, not in the route.
+from jira_queue import JiraTicketQueue
+# Remembers handled deliveries (delivery_cache.py in this folder), so GitHub retries don't create duplicate tickets.
+from delivery_cache import DeliveryCache, delivery_keys
+# Request timing, in-flight gauge, outbound Jira timing (DNS/connect/TLS/server) → /metrics (app_metrics.py).
+from app_metrics import AppMetrics
 
 # Create an instance (object) of the Flask application.
 # '__name__' is a special Python variable that tells Flask the name of the current module (file).
 # This helps Flask find resources like templates if needed.
 app = Flask(__name__)
 
-# Define a route (URL path) that handles incoming requests.
-# '/createJira' is the endpoint (like http://yourapp.com/createJira).
-# 'methods=['POST']' means this route only responds to POST requests (used for sending data, like creating something new).
-# When someone sends a POST to this URL, Flask will call the function below.
-@app.route('/createJira', methods=['POST'])
-# Define the function that runs when the '/createJira' route is accessed via POST.
-# This function will create a new issue (like a ticket or bug report) in Jira using their API.
-def createJira():
+# Jira settings. Environment variables win; the placeholders are the old hardcoded values.
+# WARNING: In real code, never hardcode secrets—export JIRA_EMAIL / JIRA_API_TOKEN instead.
+# Get your token from Jira settings > Security > API tokens.
+JIRA_URL = os.environ.get('JIRA_URL', 'https://YOUR_JIRA_SITE.atlassian.net')
+JIRA_EMAIL = os.environ.get('JIRA_EMAIL', '')
+API_TOKEN = os.environ.get('JIRA_API_TOKEN', '')
 
-    # Set the URL for the Jira REST API endpoint to create a new issue.
-    # REST API is a way for programs to communicate with Jira over the web.
-    # This specific URL is for Atlassian Jira Cloud (note: replace with your own Jira instance if different).
-    url = "https://YOUR_JIRA_SITE.atlassian.net/rest/api/3/issue"
-
-    # Define your API token here. This is a secret key from Jira that allows secure access to the API.
-    # WARNING: In real code, never hardcode secrets like this—use environment variables or config files.
-    # Get your token from Jira settings > Security > API tokens. Leave it empty for now, but fill it in to work.
-    API_TOKEN=""
-
-    # Create authentication object for basic auth.
-    # Jira uses email as "username" and API token as "password".
-    # Here, the email is empty—replace "" with your Jira email (e.g., "your.email@example.com").
-    auth = HTTPBasicAuth("", API_TOKEN)
-
-    # Define HTTP headers (extra info sent with the request).
-    # "Accept": "application/json" tells the server we want JSON back.
-    # "Content-Type": "application/json" tells the server we're sending JSON data.
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json"
-    }
+# Set the URL for the Jira REST API endpoint to create a new issue.
+# REST API is a way for programs to communicate with Jira over the web.
+ISSUE_URL = f"{JIRA_URL}/rest/api/3/issue"
+JIRA_WORKERS = int(os.environ.get('JIRA_WORKERS', '4'))
 
-    # Prepare the data (payload) to send to Jira for creating the issue.
-    # This is a Python dictionary that describes the new issue: summary, project, issue type, and description.
-    # json.dumps() converts the dictionary to a JSON string (text format) that APIs expect.
-    # The structure follows Jira's API format:
-    # - "fields" contains details like summary, project key ("DP" is your project code), issue type ID (10006 might be "Bug"),
-    #   and a rich description (using Atlassian's document format with paragraphs and text).
-    # - "update" is empty here, but could be used for additional updates.
-    payload = json.dumps( {
-        "fields": {
+# The Jira client, created ONCE: one keep-alive connection per worker thread.
+# Jira uses email as "username" and API token as "password" (basic auth).
+# Its calls create issues, so only 429 (rate limited, nothing was created) is retried:
+# resending a bulk create after a 500/502/504 could duplicate the tickets that the
+# delivery cache below makes sure are created once.
+jira = JiraClient(JIRA_URL, JIRA_EMAIL, API_TOKEN, pool_size=JIRA_WORKERS,
+                  retry_statuses=NO_DUPLICATE_RETRY_STATUSES)
+
+# Metrics for every request to this app and every call to Jira.
+# TRACE_FILE=traces.ndjson also writes one JSON line (span) per request / Jira call.
+app_metrics = AppMetrics(trace_path=os.environ.get('TRACE_FILE') or None).init_app(app)
+app_metrics.instrument_session(jira.session)
+
+# Create the ticket queue ONCE, when the app starts:
+# - JIRA_WORKERS threads send tickets to Jira over the client's connection pool.
+# - At most JIRA_QUEUE_SIZE tickets can wait; beyond that the webhook gets 503 (backpressure).
+# - Each worker groups up to JIRA_BATCH_SIZE tickets (max 50) or waits JIRA_BATCH_WAIT_MS,
+#   then creates them with ONE call to /rest/api/3/issue/bulk (JIRA_BATCH_SIZE=1 disables batching).
+ticket_queue = JiraTicketQueue(
+    ISSUE_URL,
+    session=jira.session,
+    workers=JIRA_WORKERS,
+    max_queue=int(os.environ.get('JIRA_QUEUE_SIZE', '100')),
+    batch_size=int(os.environ.get('JIRA_BATCH_SIZE', '50')),
+    batch_wait=int(os.environ.get('JIRA_BATCH_WAIT_MS', '200')) / 1000,
+).start()
+
+# Delivery cache: a webhook seen before (same X-GitHub-Delivery id, or same repo/issue/comment)
+# gets the first answer again without queueing another ticket.
+# - DELIVERY_CACHE_TTL: how long a delivery is remembered (seconds, default 1 day).
+# - DELIVERY_CACHE_DB: optional SQLite file shared by all worker processes (e.g. gunicorn -w 4).
+delivery_cache = DeliveryCache(
+    ttl=int(os.environ.get('DELIVERY_CACHE_TTL', '86400')),
+    db_path=os.environ.get('DELIVERY_CACHE_DB') or None,
+)
+
+
+def build_issue_fields(payload):
+    """
+    Build the Jira "fields" for a ticket from the GitHub webhook payload.
+    Falls back to the demo ticket when the payload has no issue details.
+    The structure follows Jira's API format:
+    - summary, project key ("DP" is your project code), issue type ID (10006 might be "Bug"),
+      and a rich description (using Atlassian's document format with paragraphs and text).
+    """
+    issue = payload.get('issue') or {}
+    summary = issue.get('title') or "Main order flow broken"
+    text = issue.get('body') or "Order entry fails when selecting supplier."
+    if issue.get('html_url'):
+        text = f"{text}\n\nGitHub issue: {issue['html_url']}"
+
+    return {
         "description": {
             "content": [
                 {
                     "content": [
                         {
-                            "text": "Order entry fails when selecting supplier.",
+                            "text": text,
                             "type": "text"
                         }
                     ],
                     "type": "paragraph"
-                    }
-                ],
+                }
+            ],
             "type": "doc",
-             "version": 1
+            "version": 1
         },
         "project": {
-           "key": "DP"
+            "key": "DP"
         },
         "issuetype": {
             "id": "10006"
         },
-        "summary": "Main order flow broken",
-    },
-    "update": {}
-    } )
-
-    # Make the HTTP POST request to the Jira API using the requests library.
-    # - "POST" is the method for creating new resources.
-    # - url: where to send it.
-    # - data=payload: the JSON data to create the issue.
-    # - headers: the metadata for the request.
-    # - auth: the authentication credentials.
-    # This will send the request and get a response from Jira (e.g., success or error).
-    response = requests.request(
-        "POST",
-        url,
-        data=payload,
-        headers=headers,
-        auth=auth
-    )
-
-    # Return the response from Jira as a nicely formatted JSON string.
-    # json.loads(response.text) parses the raw response text into a Python dictionary.
-    # json.dumps() then converts it back to JSON with formatting: sorted keys, indentation for readability,
-    # and specific separators for clean output.
-    # This is what the web client (e.g., browser or tool sending POST) will see.
-    return json.dumps(json.loads(response.text), sort_keys=True, indent=4, separators=(",", ": "))
+        "summary": summary,
+    }
+
+
+# Define a route (URL path) that handles incoming requests.
+# '/createJira' is the endpoint (like http://yourapp.com/createJira).
+# 'methods=['POST']' means this route only responds to POST requests (used for sending data, like creating something new).
+# When someone sends a POST to this URL, Flask will call the function below.
+@app.route('/createJira', methods=['POST'])
+# Define the function that runs when the '/createJira' route is accessed via POST.
+# It does NOT talk to Jira itself: it validates the webhook, queues the ticket and returns 202 at once,
+# so GitHub never waits on Jira latency.
+def createJira():
+    # Step 1: Validate the payload. GitHub sends JSON; anything else is a bad request (400).
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {} if not request.get_data() else None  # An empty body still creates the demo ticket
+    if not isinstance(payload, dict):
+        return jsonify({"status": "error", "message": "Body must be a JSON object"}), 400
+
+    # Step 2: If this is an issue comment, only '/CreateJira' creates a ticket.
+    comment = payload.get('comment')
+    if isinstance(comment, dict) and (comment.get('body') or '').strip() != '/CreateJira':
+        return jsonify({"status": "ignored", "message": "Comment is not /CreateJira"}), 200
+
+    # Build the ticket BEFORE claiming the delivery: a payload it cannot handle fails here
+    # with nothing to undo.
+    fields = build_issue_fields(payload)
+
+    # Step 3: Seen this delivery before? Answer exactly like the first time, no new ticket.
+    delivery_id = request.headers.get('X-GitHub-Delivery')
+    keys = delivery_keys(delivery_id, payload)
+    cached = delivery_cache.claim(keys)
+    if cached is not None:
+        body, status = cached
+        response = jsonify(body)
+        response.headers['X-Delivery-Cache'] = 'hit'
+        return response, status
+
+    # Step 4: Queue the ticket. A full queue means Jira is falling behind: answer 503 and let GitHub retry
+    # (the delivery is forgotten again, so that retry is not treated as a duplicate).
+    # The GitHub delivery id travels with the ticket, so a failed bulk element points back to this webhook,
+    # and so does this request's trace context: the Jira call's span joins this request's trace.
+    # Any other error also forgets the claim: otherwise every GitHub retry of this delivery
+    # would be answered "already being processed" for the whole TTL, and no ticket ever made.
+    try:
+        ticket_id = ticket_queue.submit(fields, source=delivery_id, trace=app_metrics.traceparent())
+        # 202 Accepted: "we got it, the ticket will be created shortly".
+        body = {"status": "queued", "ticket_id": ticket_id}
+        delivery_cache.complete(keys, body, 202)
+    except queue.Full:
+        delivery_cache.release(keys)
+        response = jsonify({"status": "busy", "message": "Ticket queue is full, retry later"})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    except Exception:
+        delivery_cache.release(keys)
+        raise
+    return jsonify(body), 202
+
+
+# Check what happened to a queued ticket (e.g. curl http://localhost:5000/createJira/<ticket_id>).
+@app.route('/createJira/<ticket_id>', methods=['GET'])
+def ticketStatus(ticket_id):
+    result = ticket_queue.status(ticket_id)
+    if result is None:
+        return jsonify({"status": "error", "message": "Unknown ticket id"}), 404
+    return jsonify(result), 200
+
+
+# How fast are we, and how fast is Jira answering? Everything in Prometheus text format
+# (e.g. curl http://localhost:5000/metrics): route latency, in-flight requests, Jira call phases,
+# Jira latency per endpoint and status codes, delivery cache hits.
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    text = app_metrics.metrics_text() + jira.metrics_text() + delivery_cache.metrics_text()
+    return text, 200, {'Content-Type': 'text/plain; version=0.0.4'}
 
 # This checks if the script is being run directly (not imported elsewhere).
 # If you run 'python hello-world.py' in the terminal, '__name__' becomes '__main__', so the server starts.
@@ -124,8 +206,7 @@ if __name__ == '__main__':
 # 2. Set up your Jira credentials:
 #    - Go to your Jira account (e.g., atlassian.net) > Account settings > Security > Create and manage API tokens.
 #    - Create a new API token and copy it.
-#    - In the code, replace the first "" in HTTPBasicAuth with your Jira email (e.g., "user@example.com").
-#    - Replace API_TOKEN="" with your actual token (e.g., API_TOKEN="ATATT3xFfGF0...").
+#    - export JIRA_EMAIL=user@example.com and JIRA_API_TOKEN=ATATT3xFfGF0... (or edit the defaults above).
 #    - Also, update the URL if it's not your Jira instance, and ensure "DP" is your project key and "10006" is a valid issue type ID.
 #
 # 3. Save the code: Save this as a file, e.g., 'hello-world.py' (or whatever name you prefer).
@@ -139,8 +220,9 @@ if __name__ == '__main__':
 # 5. Test the endpoint:
 #    - Use a tool like Postman, curl, or even Python's requests library to send a POST request to http://localhost:5000/createJira.
 #    - Example with curl (in a new terminal): curl -X POST http://localhost:5000/createJira
-#    - No body is needed for this endpoint since the payload is hardcoded inside the function.
-#    - If successful, you'll see a JSON response with the new Jira issue details. If not (e.g., auth error), check the terminal for errors.
+#    - No body is needed for this endpoint (an empty body queues the demo ticket).
+#    - You get 202 right away: {"status": "queued", "ticket_id": "..."}. The ticket is created in the background;
+#      check it with: curl http://localhost:5000/createJira/<ticket_id>  (state: queued → created / failed).
 #
 # Troubleshooting:
 # - If port 5000 is busy, change 'port=5000' to another number like 5001.
@@ -158,7 +240,7 @@ if __name__ == '__main__':
 #    - Press Ctrl+C to stop.
 # 5. Test Local:
 #    - curl -X POST http://localhost:5000/createJira -H "Content-Type: application/json" -d '{}'  # Empty JSON; creates hardcoded ticket.
-#    - Expected Response: {"status": "success", "message": "Jira ticket created!", "issue_key": "DP-15"} (JSON).
+#    - Expected Response (202): {"status": "queued", "ticket_id": "..."} (JSON). 503 means the queue is full—retry later.
 # 6. Test on EC2:
 #    - SSH to EC2, run script.
 #    - Webhook URL: http://ec2-public-ip:5000/createJira
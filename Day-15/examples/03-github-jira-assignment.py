@@ -1,16 +1,24 @@
 # 03-github-jira-assignment.py - Practice '/CreateJira' Conditional Logic (Day 15 Assignment)
-# Purpose: Standalone script to parse GitHub-like JSON and check for '/CreateJira'.
-# Beginner Explanation: No server/API—just Python basics (dicts, if-statements).
+# Purpose: Standalone script to parse GitHub-like JSON and check for slash commands like '/CreateJira'.
+# Beginner Explanation: No server/API—just Python basics (dicts, if-statements... and a dispatch table).
 # This teaches the "brain" of the project: Extract comment, decide to "create ticket" or ignore.
 # Run: python3 03-github-jira-assignment.py. It simulates GitHub data and prints results.
 # Use: To understand JSON traversal before full API.
+#
+# Next level: instead of one if-statement per command, the commands live in a table
+# (slash_commands.py in this folder): a case-insensitive prefix trie, with shell-style arguments
+# ('/LinkJira DP-12 "relates to"'). Raw webhook bytes can be rejected BEFORE json.loads()
+# when no comment starts with a known command (99% of real comments).
 
 import json  # For handling JSON (like dicts)
 
+# The router: @commands.command('/Name', 'usage') registers a function for a command.
+from slash_commands import CommandRouter, might_be_command
+
 # Simulate GitHub payload (what webhook sends)
 sample_payload = {
     "comment": {
-        "body": "/CreateJira",  # Change to "/abc" to test ignore
+        "body": "/CreateJira",  # Change to "/abc" to test ignore, or "/linkjira DP-12 blocks"
         "user": {"login": "dev-user"}
     },
     "issue": {
@@ -21,7 +29,72 @@ sample_payload = {
     "repository": {"name": "my-repo"}
 }
 
-# Function: Check comment and "simulate" ticket creation
+commands = CommandRouter()
+
+
+# Each command: a function getting the payload and the parsed command (name, args, text).
+# In the full project these would call the Jira API (see Day-14/examples/jira_client.py).
+@commands.command('/CreateJira', '[summary...]')
+def create_jira(payload, command):
+    issue_title = payload.get('issue', {}).get('title', 'No Title')
+    summary = ' '.join(command.args) or f"GitHub Issue - {issue_title}"
+    print("✓ Match! Would create Jira ticket here.")
+    print(f"Ticket Summary: {summary}")
+    return "Ticket Created"
+
+
+@commands.command('/CloseJira', '<issue-key> [resolution]')
+def close_jira(payload, command):
+    resolution = command.args[1] if len(command.args) > 1 else 'Done'
+    print(f"✓ Would close {command.args[0]} as '{resolution}'.")
+    return "Ticket Closed"
+
+
+@commands.command('/ReopenJira', '<issue-key>')
+def reopen_jira(payload, command):
+    print(f"✓ Would reopen {command.args[0]}.")
+    return "Ticket Reopened"
+
+
+@commands.command('/LinkJira', '<issue-key> [link-type]')
+def link_jira(payload, command):
+    link_type = command.args[1] if len(command.args) > 1 else 'relates to'
+    print(f"✓ Would link GitHub issue #{payload.get('issue', {}).get('number')} to {command.args[0]} ({link_type}).")
+    return "Ticket Linked"
+
+
+@commands.command('/AssignJira', '<issue-key> <user>')
+def assign_jira(payload, command):
+    print(f"✓ Would assign {command.args[0]} to {command.args[1]}.")
+    return "Ticket Assigned"
+
+
+@commands.command('/CommentJira', '<issue-key> <text...>')
+def comment_jira(payload, command):
+    print(f"✓ Would comment on {command.args[0]}: {' '.join(command.args[1:])}")
+    return "Comment Added"
+
+
+@commands.command('/LabelJira', '<issue-key> <label...>')
+def label_jira(payload, command):
+    print(f"✓ Would add labels {command.args[1:]} to {command.args[0]}.")
+    return "Labels Added"
+
+
+@commands.command('/PriorityJira', '<issue-key> <priority>')
+def priority_jira(payload, command):
+    print(f"✓ Would set priority of {command.args[0]} to {command.args[1]}.")
+    return "Priority Set"
+
+
+@commands.command('/JiraHelp')
+def jira_help(payload, command):
+    for name, usage, _ in commands.commands.values():
+        print(f"  {name} {usage}")
+    return "Help Shown"
+
+
+# Function: Check comment and run the matching command (or ignore it)
 def check_and_create(payload):
     # Extract comment body safely (no crash if missing)
     comment_body = payload.get('comment', {}).get('body', '').strip()
@@ -30,19 +103,32 @@ def check_and_create(payload):
     print(f"Comment received: '{comment_body}'")
     print(f"Issue: {issue_title}")
 
-    # Assignment Logic: If-Else for Conditional Handling
-    if comment_body == '/CreateJira':  # Exact match (add .lower() for case-insensitivity)
-        print("✓ Match! Would create Jira ticket here.")
-        print(f"Ticket Summary: GitHub Issue - {issue_title}")
-        # In full project: Call Jira API here
-        return "Ticket Created"
-    else:
-        print("✗ Ignored: Not '/CreateJira'. No ticket.")
+    # Assignment Logic: the dispatch table replaces "if comment_body == '/CreateJira'"
+    # (case-insensitive: '/createjira' works too)
+    result = commands.dispatch(payload)
+    if result is None:
+        print("✗ Ignored: Not a known command. No ticket.")
+        return "Ignored"
+    if result.startswith('Usage:'):
+        print(f"✗ {result}")  # Known command, wrong arguments
+    return result
+
+
+# Same check for the raw bytes a webhook receives: most comments are rejected without json.loads().
+def check_raw(raw_body):
+    if not might_be_command(raw_body, commands):
         return "Ignored"
+    return check_and_create(json.loads(raw_body))
+
 
 # Run the check
 result = check_and_create(sample_payload)
 print(f"Result: {result}")
 
-# Test Variations: Change sample_payload['comment']['body'] to "/abc" and run again.
-# Output: Shows ignore. This is the core if-condition from the tutorial.
\ No newline at end of file
+# Test Variations: a few comments, including the raw-bytes path
+if __name__ == "__main__":
+    for body in ["/abc", "/createjira Login page crashes", '/LinkJira DP-12 "is blocked by"', "/CloseJira", "Looks good to me!"]:
+        print()
+        sample_payload['comment']['body'] = body
+        print(f"Result: {check_raw(json.dumps(sample_payload).encode())}")
+# Output: Shows ignore for '/abc' and the plain comment, usage help for '/CloseJira' without a key.
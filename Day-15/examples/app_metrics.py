@@ -0,0 +1,350 @@
+# app_metrics.py
+# ----------------------------------------------------
+# Metrics + tracing for the Flask webhook app and its outbound HTTP calls
+#
+# Inbound (Flask hooks, metrics.init_app(app)):
+#   http_server_request_seconds{method,route}         latency histogram per route
+#   http_server_responses_total{method,route,status}   status-code counter
+#   http_server_requests_in_flight                     gauge: requests being handled now
+#
+# Outbound (metrics.instrument_session(session) - e.g. the Jira client's session):
+#   http_client_phase_seconds{host,phase}  histogram per phase of a call:
+#       dns      getaddrinfo() of the host name     ┐ only when a NEW connection
+#       connect  TCP handshake                      │ is opened; a keep-alive
+#       tls      TLS handshake (https only)         ┘ connection skips them
+#       server   request sent → response headers (the server's time + 1 round trip)
+#   http_client_responses_total{host,status}   status codes (e.g. Jira 201 / 429 / 500)
+#   http_client_connections_total{host}        new connections opened
+#   The phases are measured inside urllib3's connection objects (the layer under
+#   requests): the session's pools get connection classes that time each step.
+#
+# Tracing (trace_path=...): one JSON line per span in a local file
+#   {"trace_id", "span_id", "kind": "server"|"client", "name": "POST /createJira",
+#    "start": <unix time>, "duration_ms", "status", ...phase times for client spans}
+#   A W3C "traceparent" header on the incoming request is reused as trace id.
+#   metrics.traceparent() gives the current request's context; an outbound call
+#   that sends it as its "traceparent" header (jira_queue.py does, for the ticket
+#   it creates) gets a client span in the same trace, with the server span as parent.
+#   Lines are buffered and flushed at most once per second (and on close()).
+#
+# Overhead budget: OVERHEAD_BUDGET_US per inbound request and per outbound
+# call, with tracing on. benchmark_app_metrics.py measures it.
+#
+# Usage:
+#   metrics = AppMetrics(trace_path='traces.ndjson')
+#   metrics.init_app(app)
+#   metrics.instrument_session(jira.session)
+#   @app.route('/metrics')
+#   def prometheus(): return metrics.metrics_text(), 200, {'Content-Type': 'text/plain'}
+# ----------------------------------------------------
+
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, has_app_context, request
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Day-14', 'examples'))
+from jira_client import LatencyHistogram, endpoint_name
+
+OVERHEAD_BUDGET_US = 50  # microseconds per request / call
+FLUSH_EVERY = 1.0  # seconds between trace file flushes
+
+
+def new_id(bits):
+    return f'{random.getrandbits(bits):0{bits // 4}x}'
+
+
+def parse_traceparent(value):
+    """'00-<trace_id>-<parent span id>-01' → (trace_id, parent_id), or (None, None)."""
+    parts = (value or '').split('-')
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16:
+        return parts[1], parts[2]
+    return None, None
+
+
+def histogram_lines(metric, labels, histogram):
+    """Prometheus lines for one LatencyHistogram (cumulative buckets, sum, count)."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        le = '+Inf' if bound == float('inf') else f'{bound:g}'
+        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+    lines.append(f'{metric}_sum{{{labels}}} {histogram.total:.6f}')
+    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+class SpanWriter:
+    """Appends spans as JSON lines to a file; thread-safe, flushed once per second."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._flushed = time.monotonic()
+
+    def write(self, span):
+        line = json.dumps(span, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            now = time.monotonic()
+            if now - self._flushed >= FLUSH_EVERY:
+                self._file.flush()
+                self._flushed = now
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class TimedConnectionMixin:
+    """
+    Times DNS / connect / TLS / server phases of a urllib3 connection.
+    'metrics' is set on the subclasses that AppMetrics.instrument_session() creates.
+    """
+
+    metrics = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            # Same lookup as urllib3: its address family (IPv4 only when the host has no IPv6)
+            addresses = []
+            for *_, sockaddr in socket.getaddrinfo(host.strip('[]'), self.port, allowed_gai_family(),
+                                                   socket.SOCK_STREAM):
+                if sockaddr[0] not in addresses:
+                    addresses.append(sockaddr[0])
+        except OSError:
+            addresses = [host]  # urllib3 resolves again below and raises its usual error
+        resolved = time.perf_counter()
+        # Connect to the addresses we just resolved, so the DNS time is not counted twice,
+        # trying each one in turn like urllib3's create_connection() does (a host with
+        # broken IPv6 still falls back to IPv4). 'host' (used for TLS SNI and certificate
+        # checks) is read from _dns_host, so the name is put back as soon as the socket exists.
+        for number, address in enumerate(addresses, 1):
+            self._dns_host = address
+            try:
+                sock = super()._new_conn()
+                break
+            except ConnectTimeoutError:  # NewConnectionError too
+                if number == len(addresses):
+                    raise
+            finally:
+                self._dns_host = host
+        self._phases = {'dns': resolved - start, 'connect': time.perf_counter() - resolved}
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        except Exception:
+            self.metrics.count_connect_error(self.host)
+            raise
+        phases = self._phases
+        if isinstance(self, HTTPSConnection):
+            # Everything in connect() after the TCP handshake is the TLS handshake
+            # (plain http has none: no 'tls' phase rather than a 0 that drags the histogram down)
+            phases['tls'] = max(0.0, time.perf_counter() - start - phases['dns'] - phases['connect'])
+        self._new_connection = phases
+
+    def request(self, method, url, *args, **kwargs):
+        headers = kwargs.get('headers') if 'headers' in kwargs else (args[1] if len(args) > 1 else None)
+        traceparent = headers.get('traceparent') if headers else None
+        self._call = (method, url, time.time(), time.perf_counter(), traceparent)
+        super().request(method, url, *args, **kwargs)
+        self._sent = time.perf_counter()
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        finished = time.perf_counter()
+        phases = self.__dict__.pop('_new_connection', None)  # None: reused keep-alive connection
+        method, url, started_at, started, traceparent = self._call
+        self.metrics.record_outbound(self.host, method, url, response.status, phases,
+                                     finished - self._sent, started_at, finished - started, traceparent)
+        return response
+
+
+class AppMetrics:
+    """Inbound Flask + outbound urllib3 metrics, Prometheus text output, optional trace file."""
+
+    def __init__(self, trace_path=None):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.routes = {}            # (method, route) → LatencyHistogram
+        self.responses = Counter()  # (method, route, status) → count
+        self.phases = {}            # (host, phase) → LatencyHistogram
+        self.outbound = Counter()   # (host, status) → count
+        self.connections = Counter()     # host → new connections
+        self.connect_errors = Counter()  # host → failed connects
+        self.spans = SpanWriter(trace_path) if trace_path else None
+
+    def close(self):
+        if self.spans is not None:
+            self.spans.close()
+
+    # ---------- Inbound ----------
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        return self
+
+    # request / g are proxies with a lookup cost on every attribute access: each
+    # hook touches them once or twice and works on the real objects after that
+
+    def _before_request(self):
+        # start, wall clock start, status, then the span's ids (only with a trace file):
+        # trace id, span id, parent span id
+        state = g.app_metrics = [time.perf_counter(), time.time(), 500, None, None, None]
+        if self.spans is not None:
+            trace_id, parent_id = parse_traceparent(request.headers.get('traceparent'))
+            state[3:] = trace_id or new_id(128), new_id(64), parent_id
+        with self._lock:
+            self.in_flight += 1
+
+    def _after_request(self, response):
+        state = g.get('app_metrics')
+        if state is not None:
+            state[2] = response.status_code
+        return response
+
+    def _teardown_request(self, error=None):
+        state = g.pop('app_metrics', None)
+        if state is None:
+            return  # before_request did not run
+        start, started_at, status, trace_id, span_id, parent_id = state
+        elapsed = time.perf_counter() - start
+        current = request._get_current_object()
+        route = current.url_rule.rule if current.url_rule is not None else 'unmatched'
+        key = (current.method, route)
+        with self._lock:
+            self.in_flight -= 1
+            histogram = self.routes.get(key)
+            if histogram is None:
+                histogram = self.routes[key] = LatencyHistogram()
+            histogram.observe(elapsed)
+            self.responses[(current.method, route, status)] += 1
+        if trace_id is not None:
+            self.spans.write({
+                'trace_id': trace_id,
+                'span_id': span_id,
+                'parent_id': parent_id,
+                'kind': 'server',
+                'name': f'{current.method} {route}',
+                'start': round(started_at, 6),
+                'duration_ms': round(elapsed * 1000, 3),
+                'status': status,
+                'delivery': current.headers.get('X-GitHub-Delivery'),
+            })
+
+    def traceparent(self):
+        """
+        W3C traceparent of the request being handled ('00-<trace id>-<its span id>-01'),
+        or None without a trace file or outside a request. Pass it along with work
+        that makes outbound calls later (jira_queue.submit(..., trace=...)).
+        """
+        state = g.get('app_metrics') if has_app_context() else None
+        if state is None or state[3] is None:
+            return None
+        return f'00-{state[3]}-{state[4]}-01'
+
+    # ---------- Outbound ----------
+
+    def instrument_session(self, session):
+        """Make every pool of this requests.Session use timed connections."""
+        # Subclasses made here carry 'metrics', so two AppMetrics never mix their numbers
+        http_connection = type('TimedHTTPConnection', (TimedConnectionMixin, HTTPConnection), {'metrics': self})
+        https_connection = type('TimedHTTPSConnection', (TimedConnectionMixin, HTTPSConnection), {'metrics': self})
+        pool_classes = {
+            'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': http_connection}),
+            'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': https_connection}),
+        }
+        for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+            adapter.poolmanager.pool_classes_by_scheme = pool_classes
+            adapter.poolmanager.clear()  # pools made before this used plain connections
+        return session
+
+    def count_connect_error(self, host):
+        with self._lock:
+            self.connect_errors[host] += 1
+
+    def record_outbound(self, host, method, url, status, new_connection, server_seconds, started_at, seconds,
+                        traceparent=None):
+        """Called by the timed connections once the response headers arrived."""
+        with self._lock:
+            timings = [('server', server_seconds)]
+            if new_connection is not None:
+                self.connections[host] += 1
+                timings += new_connection.items()  # dns, connect (+ tls for https)
+            for phase, value in timings:
+                histogram = self.phases.get((host, phase))
+                if histogram is None:
+                    histogram = self.phases[(host, phase)] = LatencyHistogram()
+                histogram.observe(value)
+            self.outbound[(host, status)] += 1
+        if self.spans is not None:
+            # Sent with a traceparent (e.g. by jira_queue.py): join the trace of the request
+            # that asked for this call; otherwise the call is a trace of its own
+            trace_id, parent_id = parse_traceparent(traceparent)
+            span = {
+                'trace_id': trace_id or new_id(128),
+                'span_id': new_id(64),
+                'parent_id': parent_id,
+                'kind': 'client',
+                'name': endpoint_name(method, url),
+                'host': host,
+                'start': round(started_at, 6),
+                'duration_ms': round(seconds * 1000, 3),
+                'status': status,
+                'server_ms': round(server_seconds * 1000, 3),
+                'new_connection': new_connection is not None,
+                'thread': threading.current_thread().name,
+            }
+            if new_connection is not None:
+                for phase, value in new_connection.items():
+                    span[f'{phase}_ms'] = round(value * 1000, 3)
+            self.spans.write(span)
+
+    # ---------- Prometheus text ----------
+
+    def metrics_text(self):
+        lines = []
+        with self._lock:
+            lines.append('# TYPE http_server_requests_in_flight gauge')
+            lines.append(f'http_server_requests_in_flight {self.in_flight}')
+            lines.append('# TYPE http_server_request_seconds histogram')
+            for (method, route), histogram in sorted(self.routes.items()):
+                lines += histogram_lines('http_server_request_seconds', f'method="{method}",route="{route}"',
+                                         histogram)
+            lines.append('# TYPE http_server_responses_total counter')
+            for (method, route, status), count in sorted(self.responses.items()):
+                lines.append(f'http_server_responses_total{{method="{method}",route="{route}",status="{status}"}} '
+                             f'{count}')
+
+            lines.append('# TYPE http_client_phase_seconds histogram')
+            for (host, phase), histogram in sorted(self.phases.items()):
+                lines += histogram_lines('http_client_phase_seconds', f'host="{host}",phase="{phase}"', histogram)
+            lines.append('# TYPE http_client_responses_total counter')
+            for (host, status), count in sorted(self.outbound.items()):
+                lines.append(f'http_client_responses_total{{host="{host}",status="{status}"}} {count}')
+            lines.append('# TYPE http_client_connections_total counter')
+            for host, count in sorted(self.connections.items()):
+                lines.append(f'http_client_connections_total{{host="{host}"}} {count}')
+            lines.append('# TYPE http_client_connect_errors_total counter')
+            for host, count in sorted(self.connect_errors.items()):
+                lines.append(f'http_client_connect_errors_total{{host="{host}"}} {count}')
+        return '\n'.join(lines) + '\n'
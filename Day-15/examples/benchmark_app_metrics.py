@@ -0,0 +1,174 @@
+# benchmark_app_metrics.py
+# ----------------------------------------------------
+# What does app_metrics.py cost per request?
+#
+# 1. Hook cost, measured directly (this is what the budget is checked on):
+#      inbound  → the three Flask hooks run back to back inside one request context
+#      outbound → a do-nothing connection vs the same connection with the timing
+#                 methods of TimedConnectionMixin (request + getresponse + recording)
+#    each without and with a trace file.
+# 2. End to end, for context: Flask test client requests and keep-alive GETs to
+#    fake_jira.py, plain vs instrumented. Other work on the machine moves these
+#    numbers by more than the hooks cost, so they are not checked.
+#
+# Budget: app_metrics.OVERHEAD_BUDGET_US per request / call.
+#
+# First, a trace check: a webhook request queues a ticket (jira_queue.py), the
+# worker creates it on fake_jira.py, and the Jira call's client span must be in
+# the request's trace, with the request's span as parent (and no 'tls' on http).
+#
+# Run:
+#   python benchmark_app_metrics.py
+# ----------------------------------------------------
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import requests
+from flask import Flask
+
+from app_metrics import OVERHEAD_BUDGET_US, AppMetrics, TimedConnectionMixin
+from fake_jira import FakeJira
+from jira_queue import JiraTicketQueue
+
+ROUNDS = 3
+
+
+class StubResponse:
+    status = 201
+
+
+class StubConnection:
+    """Stands in for a urllib3 connection that never touches the network."""
+
+    host = 'jira.example.com'
+
+    def request(self, method, url, *args, **kwargs):
+        pass
+
+    def getresponse(self):
+        return StubResponse()
+
+
+def make_app(metrics=None):
+    app = Flask(__name__)
+
+    @app.route('/createJira', methods=['POST'])
+    def create_jira():
+        return {'status': 'queued'}, 202
+
+    if metrics is not None:
+        metrics.init_app(app)
+    return app
+
+
+def check_trace_links(folder):
+    path = os.path.join(folder, 'linked.ndjson')
+    metrics = AppMetrics(trace_path=path)
+    fake = FakeJira().start()
+    session = metrics.instrument_session(requests.Session())
+    tickets = JiraTicketQueue(f'{fake.url}/rest/api/3/issue', session=session, workers=1, batch_size=1).start()
+    app = Flask(__name__)
+
+    @app.route('/createJira', methods=['POST'])
+    def create_jira():
+        tickets.submit({'summary': 'trace check'}, source='delivery-1', trace=metrics.traceparent())
+        return {'status': 'queued'}, 202
+
+    metrics.init_app(app)
+    app.test_client().post('/createJira', headers={'X-GitHub-Delivery': 'delivery-1'})
+    tickets.join()
+    metrics.close()
+    fake.stop()
+    with open(path) as file:
+        spans = {span['kind']: span for span in map(json.loads, file)}
+    server, client = spans['server'], spans['client']
+    assert client['trace_id'] == server['trace_id'] and client['parent_id'] == server['span_id'], spans
+    assert 'connect_ms' in client and 'tls_ms' not in client, client
+    print(f"Trace check ok: the Jira call is a child of the webhook request (trace {server['trace_id'][:8]}...)\n")
+
+
+def best_of(function, count):
+    """Best seconds per call over ROUNDS rounds of count calls."""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        function(count)
+        best = min(best, (time.perf_counter() - start) / count)
+    return best
+
+
+def inbound_hooks(metrics, count):
+    app = make_app()
+    response = app.response_class('ok', status=202)
+
+    def run(count):
+        for _ in range(count):
+            metrics._before_request()
+            metrics._after_request(response)
+            metrics._teardown_request()
+
+    with app.test_request_context('/createJira', method='POST', headers={'X-GitHub-Delivery': 'bench'}):
+        return best_of(run, count)
+
+
+def outbound_hooks(metrics, count):
+    if metrics is None:
+        connection = StubConnection()
+    else:
+        connection = type('TimedStub', (TimedConnectionMixin, StubConnection), {'metrics': metrics})()
+
+    def run(count):
+        for _ in range(count):
+            connection.request('POST', '/rest/api/3/issue/bulk')
+            connection.getresponse()
+
+    return best_of(run, count)
+
+
+def check(label, seconds):
+    microseconds = seconds * 1e6
+    verdict = 'ok' if microseconds <= OVERHEAD_BUDGET_US else 'OVER BUDGET'
+    print(f"  {label:<34} {microseconds:7.1f} µs   ({verdict}, budget {OVERHEAD_BUDGET_US} µs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the per-request cost of app_metrics')
+    parser.add_argument('--hooks', type=int, default=100000, help='hook calls per round')
+    parser.add_argument('--requests', type=int, default=5000, help='end-to-end requests per round')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        check_trace_links(folder)
+        print("Hook cost per request / call:")
+        check('inbound', inbound_hooks(AppMetrics(), args.hooks))
+        traced = AppMetrics(trace_path=os.path.join(folder, 'inbound.ndjson'))
+        check('inbound + trace file', inbound_hooks(traced, args.hooks))
+        traced.close()
+        baseline = outbound_hooks(None, args.hooks)
+        check('outbound', outbound_hooks(AppMetrics(), args.hooks) - baseline)
+        traced = AppMetrics(trace_path=os.path.join(folder, 'outbound.ndjson'))
+        check('outbound + trace file', outbound_hooks(traced, args.hooks) - baseline)
+        traced.close()
+
+        print("\nEnd to end (for context, noisy):")
+        clients = {'Flask, no metrics': make_app().test_client(),
+                   'Flask, metrics': make_app(AppMetrics()).test_client()}
+        for label, client in clients.items():
+            seconds = best_of(lambda count: [client.post('/createJira') for _ in range(count)], args.requests)
+            print(f"  {label:<34} {seconds * 1e6:7.1f} µs per request")
+        fake = FakeJira().start()
+        url = f'{fake.url}/rest/api/3/project'
+        sessions = {'GET fake Jira, plain session': requests.Session(),
+                    'GET fake Jira, instrumented': AppMetrics().instrument_session(requests.Session())}
+        for label, session in sessions.items():
+            seconds = best_of(lambda count: [session.get(url) for _ in range(count)], args.requests // 5)
+            print(f"  {label:<34} {seconds * 1e6:7.1f} µs per call")
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# benchmark_jira_client.py
+# ----------------------------------------------------
+# requests.request(...) per call vs the shared JiraClient (Day-14/examples/jira_client.py)
+#
+# 1. Creates a throw-away self-signed certificate (needs the openssl command)
+#    and starts fake_jira.py over HTTPS on 127.0.0.1.
+# 2. Sends the same sequential calls (GET /project and POST /issue, alternating)
+#    two ways:
+#      plain requests → requests.request() each time: new TCP connection +
+#                       new TLS handshake for EVERY call (what the Day-14
+#                       scripts used to do)
+#      JiraClient     → one Session: one handshake, then keep-alive reuse
+# 3. Retry demo: a fake Jira that answers 429 (with Retry-After) or 500 to
+#    some calls; every call still succeeds through the client's retries.
+#
+# Over the internet each handshake costs extra round trips to atlassian.net,
+# so the real saving is bigger than on loopback.
+#
+# Run:
+#   python benchmark_jira_client.py
+#   python benchmark_jira_client.py --calls 5000
+# ----------------------------------------------------
+
+import argparse
+import json
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+from requests.auth import HTTPBasicAuth
+
+from fake_jira import FakeJira
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Day-14', 'examples'))
+from jira_client import JiraClient
+
+EMAIL = 'bench@example.com'
+API_TOKEN = 'not-a-real-token'
+ISSUE = {"project": {"key": "DP"}, "issuetype": {"id": "10006"}, "summary": "Benchmark ticket"}
+
+
+def make_certificate(folder):
+    """Self-signed certificate for 127.0.0.1; returns (cert_path, key_path)."""
+    cert, key = os.path.join(folder, 'cert.pem'), os.path.join(folder, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=localhost', '-addext', 'subjectAltName=IP:127.0.0.1',
+                    '-keyout', key, '-out', cert],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return cert, key
+
+
+def plain_call(base_url, number, cert):
+    """The old way: a brand-new connection for every call."""
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    auth = HTTPBasicAuth(EMAIL, API_TOKEN)
+    if number % 2:
+        return requests.request("POST", f"{base_url}/rest/api/3/issue", data=json.dumps({"fields": ISSUE}),
+                                headers=headers, auth=auth, verify=cert)
+    return requests.request("GET", f"{base_url}/rest/api/3/project", headers=headers, auth=auth, verify=cert)
+
+
+def client_call(jira, number):
+    if number % 2:
+        return jira.create_issue(ISSUE)
+    return jira.get('/rest/api/3/project')
+
+
+def timed_run(label, call, calls):
+    start = time.perf_counter()
+    statuses = [call(number).status_code for number in range(calls)]
+    elapsed = time.perf_counter() - start
+    assert set(statuses) <= {200, 201}, statuses
+    print(f"  {label:<16} {elapsed:7.2f} s   {elapsed / calls * 1000:6.2f} ms per call")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-call requests vs the pooled JiraClient')
+    parser.add_argument('--calls', type=int, default=1000, help='sequential calls per method')
+    parser.add_argument('--latency', type=float, default=0.0, help='fake Jira delay per call (s)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        cert, key = make_certificate(folder)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+
+        fake = FakeJira(latency=args.latency, ssl_context=context).start()
+        print(f"{args.calls:,} sequential calls against {fake.url} (TLS):")
+        plain_time = timed_run('plain requests', lambda number: plain_call(fake.url, number, cert), args.calls)
+        with JiraClient(fake.url, EMAIL, API_TOKEN, verify=cert) as jira:
+            client_time = timed_run('JiraClient', lambda number: client_call(jira, number), args.calls)
+            print(f"  → {plain_time / client_time:.1f}x faster, "
+                  f"{(plain_time - client_time) / args.calls * 1000:.2f} ms saved per call\n")
+            print(jira.latency_report())
+        fake.stop()
+
+        # Retries: ~10% throttled (Retry-After: 1 s), ~10% failing with 500 (backoff 0.05 s, 0.1 s, ...)
+        calls = 40
+        flaky = FakeJira(throttle_rate=0.1, retry_after=1, error_rate=0.1, ssl_context=context).start()
+        print(f"\nRetry demo: {calls} calls, 10% answered 429 (Retry-After: 1), 10% answered 500:")
+        with JiraClient(flaky.url, EMAIL, API_TOKEN, backoff=0.05, verify=cert) as jira:
+            start = time.perf_counter()
+            statuses = [client_call(jira, number).status_code for number in range(calls)]
+            elapsed = time.perf_counter() - start
+            print(f"  {statuses.count(200) + statuses.count(201)}/{calls} succeeded, "
+                  f"{jira.stats['retries']} retries, {sum(flaky.calls.values())} calls reached the server, "
+                  f"{elapsed:.1f} s (Retry-After sleeps included)")
+        flaky.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# benchmark_slash_commands.py
+# ----------------------------------------------------
+# Payloads/sec for the comment webhook: full json.loads vs raw-bytes prefilter
+#
+# Builds realistic GitHub issue_comment payloads of 20-60 KB (issue, comment,
+# repository and sender objects with all their *_url fields, labels,
+# reactions, long markdown bodies). 99% of the comments are ordinary text
+# (some start with '/' - paths, "/cc @team" - like real comments), 1% are
+# commands for the router in 03-github-jira-assignment.py.
+#
+#   json.loads + if       → the old check: parse everything, exact '/CreateJira'
+#   json.loads + router   → parse everything, then the trie dispatch table
+#   prefilter + router    → might_be_command() on the raw bytes first;
+#                           json.loads only for the payloads that pass
+#
+# Checks that the router gives the same decisions with and without prefilter.
+#
+# Run:
+#   python benchmark_slash_commands.py
+#   python benchmark_slash_commands.py --payloads 20000 --command-rate 0.05
+# ----------------------------------------------------
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import time
+
+from slash_commands import might_be_command
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WORDS = ("the build fails when we deploy to staging because the config map is missing a key "
+         "please check logs attached below and retry after the fix lands in main thanks").split()
+PLAIN_COMMENTS = ["LGTM!", "Thanks, merging.", "/cc @platform-team", "/usr/bin/python3 is missing on the runner",
+                  "Can you rebase?", "/CreateJiraTicket please", "+1"]
+COMMANDS = ["/CreateJira", "/createjira Login page crashes", '/LinkJira DP-12 "is blocked by"',
+            "/CloseJira DP-7 Fixed", "/AssignJira DP-3 alice", "/LabelJira DP-9 backend urgent"]
+
+
+def load_router():
+    """The CommandRouter defined in 03-github-jira-assignment.py (loaded by path, its demo output hidden)."""
+    spec = importlib.util.spec_from_file_location('assignment', os.path.join(HERE, '03-github-jira-assignment.py'))
+    module = importlib.util.module_from_spec(spec)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        spec.loader.exec_module(module)
+    return module.commands
+
+
+def github_user(rng, login):
+    base = f"https://api.github.com/users/{login}"
+    return {
+        "login": login, "id": rng.randrange(10**6, 10**8), "node_id": "MDQ6VXNlcj" + str(rng.random())[2:12],
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{rng.randrange(10**6)}?v=4", "gravatar_id": "",
+        "url": base, "html_url": f"https://github.com/{login}", "followers_url": f"{base}/followers",
+        "following_url": f"{base}/following{{/other_user}}", "gists_url": f"{base}/gists{{/gist_id}}",
+        "starred_url": f"{base}/starred{{/owner}}{{/repo}}", "subscriptions_url": f"{base}/subscriptions",
+        "organizations_url": f"{base}/orgs", "repos_url": f"{base}/repos", "events_url": f"{base}/events{{/privacy}}",
+        "received_events_url": f"{base}/received_events", "type": "User", "site_admin": False,
+    }
+
+
+def markdown(rng, size):
+    lines = []
+    while sum(len(line) for line in lines) < size:
+        kind = rng.random()
+        if kind < 0.1:
+            lines.append("```\n" + "\n".join(f"ERROR {rng.randrange(999)} at worker.py:{rng.randrange(500)}"
+                                              for _ in range(10)) + "\n```")
+        elif kind < 0.2:
+            lines.append(f"- [ ] {' '.join(rng.choices(WORDS, k=8))}")
+        else:
+            lines.append(' '.join(rng.choices(WORDS, k=rng.randrange(10, 40))) + ".")
+    return "\n\n".join(lines)
+
+
+def make_payload(rng, number, comment_body, size):
+    repo = "acme/platform-services"
+    api = f"https://api.github.com/repos/{repo}"
+    owner = github_user(rng, "acme")
+    repository = {"id": 123456, "node_id": "R_kgDOabc", "name": "platform-services", "full_name": repo,
+                  "private": False, "owner": owner, "html_url": f"https://github.com/{repo}",
+                  "description": "Platform services monorepo", "fork": False, "url": api,
+                  "default_branch": "main", "topics": ["devops", "python", "kubernetes"]}
+    for name in ("forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events", "assignees",
+                 "branches", "tags", "blobs", "git_tags", "git_refs", "trees", "statuses", "languages",
+                 "stargazers", "contributors", "subscribers", "subscription", "commits", "git_commits",
+                 "comments", "issue_comment", "contents", "compare", "merges", "archive", "downloads",
+                 "issues", "pulls", "milestones", "notifications", "labels", "releases", "deployments"):
+        repository[f"{name}_url"] = f"{api}/{name}{{/id}}"
+    issue_url = f"{api}/issues/{number}"
+    issue = {
+        "url": issue_url, "repository_url": api, "labels_url": f"{issue_url}/labels{{/name}}",
+        "comments_url": f"{issue_url}/comments", "events_url": f"{issue_url}/events",
+        "html_url": f"https://github.com/{repo}/issues/{number}", "id": rng.randrange(10**9), "number": number,
+        "title": ' '.join(rng.choices(WORDS, k=6)), "user": github_user(rng, "reporter"),
+        "labels": [{"id": index, "name": name, "color": "d73a4a", "default": False,
+                    "url": f"{api}/labels/{name}"} for index, name in enumerate(("bug", "backend", "p2"))],
+        "state": "open", "locked": False, "assignees": [github_user(rng, "oncall")], "comments": rng.randrange(50),
+        "created_at": "2024-05-01T10:00:00Z", "updated_at": "2024-05-02T10:00:00Z", "author_association": "MEMBER",
+        "reactions": {"url": f"{issue_url}/reactions", "total_count": 3, "+1": 2, "-1": 0, "laugh": 0,
+                      "hooray": 0, "confused": 0, "heart": 1, "rocket": 0, "eyes": 0},
+        "body": "",
+    }
+    comment = {
+        "url": f"{api}/issues/comments/{number}", "html_url": f"https://github.com/{repo}/issues/{number}#c",
+        "issue_url": issue_url, "id": rng.randrange(10**9), "user": github_user(rng, "dev-user"),
+        "created_at": "2024-05-02T10:00:00Z", "updated_at": "2024-05-02T10:00:00Z",
+        "author_association": "MEMBER", "body": comment_body,
+    }
+    payload = {"action": "created", "issue": issue, "comment": comment, "repository": repository,
+               "sender": comment["user"]}
+    fixed = len(json.dumps(payload))
+    issue["body"] = markdown(rng, max(0, size - fixed))  # the issue description fills up to 'size'
+    return json.dumps(payload).encode()
+
+
+def make_corpus(count, command_rate, seed=11):
+    rng = random.Random(seed)
+    corpus = []
+    for number in range(count):
+        if rng.random() < command_rate:
+            body = rng.choice(COMMANDS)
+        elif rng.random() < 0.5:
+            body = rng.choice(PLAIN_COMMENTS)
+        else:
+            body = markdown(rng, rng.randrange(100, 3000))
+        corpus.append(make_payload(rng, number, body, rng.randrange(20_000, 60_000)))
+    return corpus
+
+
+def exact_if(raw):
+    payload = json.loads(raw)
+    return payload.get('comment', {}).get('body', '').strip() == '/CreateJira'
+
+
+def timed(label, function, corpus, megabytes):
+    start = time.perf_counter()
+    results = [function(raw) for raw in corpus]
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {len(corpus) / elapsed:10,.0f} payloads/s  {megabytes / elapsed:8.0f} MB/s")
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark slash-command payload parsing')
+    parser.add_argument('--payloads', type=int, default=5000, help='number of webhook payloads')
+    parser.add_argument('--command-rate', type=float, default=0.01, help='fraction of comments that are commands')
+    args = parser.parse_args()
+
+    router = load_router()
+    corpus = make_corpus(args.payloads, args.command_rate)
+    megabytes = sum(len(raw) for raw in corpus) / 1e6
+    commands = sum(1 for raw in corpus if router.match(json.loads(raw)['comment']['body']))
+    print(f"{len(corpus):,} payloads, {megabytes:.0f} MB (avg {megabytes * 1000 / len(corpus):.0f} KB), "
+          f"{commands} commands ({len(router.commands)} registered):")
+
+    def route(raw):
+        command = router.match(json.loads(raw)['comment']['body'])
+        return command[0][0] if command else None
+
+    def prefiltered(raw):
+        return route(raw) if might_be_command(raw, router) else None
+
+    timed('json.loads + if', exact_if, corpus, megabytes)
+    routed, full_time = timed('json.loads + router', route, corpus, megabytes)
+    filtered, filter_time = timed('prefilter + router', prefiltered, corpus, megabytes)
+    assert routed == filtered
+    parsed = sum(1 for raw in corpus if might_be_command(raw, router))
+    print(f"  → {full_time / filter_time:.1f}x faster; json.loads ran on {parsed} of {len(corpus)} payloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# delivery_cache.py
+# ----------------------------------------------------
+# Idempotent webhook deliveries: the same GitHub event never creates two Jira tickets
+#
+# GitHub redelivers a webhook when our answer is slow or fails, and the same
+# comment can also reach us twice (two hooks, a manual "Redeliver"). Without
+# protection every copy queues another Jira ticket.
+#
+# Every delivery gets up to two keys:
+#   delivery:<X-GitHub-Delivery header>
+#   comment:<repo full name>#<issue number>/<comment id>
+# If ANY key was seen before (and has not expired), the delivery is a duplicate
+# and is answered with the saved answer of the first copy - no Jira call.
+#
+# The route uses three calls:
+#   answer = cache.claim(keys)          # None → first copy, go ahead
+#   cache.complete(keys, body, status)  # save the answer for the duplicates
+#   cache.release(keys)                 # first copy failed (e.g. 503): let a retry through
+# claim() is atomic, so two copies arriving at the same moment cannot both win.
+# While the first copy is still being handled, duplicates get IN_PROGRESS.
+#
+# Storage:
+# - in memory: TTL + LRU (OrderedDict, oldest entries dropped past max_entries)
+# - db_path=...: a SQLite file shared by all worker processes (gunicorn -w 4),
+#   so they agree on what was seen. The in-memory cache stays in front of it
+#   for finished answers, which never change until they expire.
+#
+# Usage:
+#   cache = DeliveryCache(ttl=3600, db_path='deliveries.db')
+#   keys = delivery_keys(request.headers.get('X-GitHub-Delivery'), payload)
+#   print(cache.stats, cache.hit_rate())
+# ----------------------------------------------------
+
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+
+DEFAULT_TTL = 24 * 3600  # GitHub stops redelivering long before a day has passed
+DEFAULT_MAX_ENTRIES = 10000
+PURGE_EVERY = 1000  # SQLite: delete expired rows every N claims
+
+# Answer for duplicates that arrive while the first copy is still being handled
+IN_PROGRESS = ({"status": "duplicate", "message": "This delivery is already being processed"}, 202)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    key     TEXT PRIMARY KEY,
+    expires REAL NOT NULL,
+    answer  TEXT              -- JSON [body, status]; NULL while in progress
+) WITHOUT ROWID;
+"""
+
+
+def delivery_keys(delivery_id, payload):
+    """Dedup keys for one webhook: its delivery id and the comment it is about."""
+    keys = []
+    if delivery_id:
+        keys.append(f'delivery:{delivery_id}')
+    comment = payload.get('comment')
+    issue = payload.get('issue')
+    repo = payload.get('repository')
+    if isinstance(comment, dict) and isinstance(issue, dict) and isinstance(repo, dict):
+        if comment.get('id') is not None and issue.get('number') is not None and repo.get('full_name'):
+            keys.append(f"comment:{repo['full_name']}#{issue['number']}/{comment['id']}")
+    return keys
+
+
+class DeliveryCache:
+    """TTL + LRU record of handled deliveries, optionally shared through SQLite."""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, db_path=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key → (expires, answer or None), oldest first
+        self._lock = threading.Lock()
+        self.stats = Counter()  # claims / hits / shared_hits / in_progress / misses / evictions / expired
+        self._db = None
+        if db_path:
+            # isolation_level=None: we open the transactions ourselves (BEGIN IMMEDIATE)
+            self._db = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+
+    def claim(self, keys):
+        """
+        None if this delivery is new (it is now marked "in progress"),
+        otherwise the (body, status) answer to send back for the duplicate.
+        """
+        if not keys:
+            return None  # nothing to recognise it by: always handled
+        now = time.time()
+        with self._lock:
+            self.stats['claims'] += 1
+            answer = self._memory_lookup(keys, now)
+            if answer is not None:
+                self.stats['hits' if answer is not IN_PROGRESS else 'in_progress'] += 1
+                return answer
+            if self._db is not None:
+                answer = self._db_claim(keys, now)
+                if answer is not None:
+                    self.stats['shared_hits' if answer is not IN_PROGRESS else 'in_progress'] += 1
+                    return answer
+            self.stats['misses'] += 1
+            for key in keys:
+                self._memory_store(key, now + self.ttl, None)
+            return None
+
+    def complete(self, keys, body, status):
+        """Save the answer of the first copy; duplicates get it until the TTL runs out."""
+        if not keys:
+            return
+        expires = time.time() + self.ttl
+        with self._lock:
+            for key in keys:
+                self._memory_store(key, expires, (body, status))
+            if self._db is not None:
+                answer = json.dumps([body, status])
+                self._db.executemany("UPDATE deliveries SET expires = ?, answer = ? WHERE key = ?",
+                                     [(expires, answer, key) for key in keys])
+            self.stats['stored'] += 1
+
+    def release(self, keys):
+        """Forget a claim whose handling failed, so GitHub's retry is processed normally."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.executemany("DELETE FROM deliveries WHERE key = ?", [(key,) for key in keys])
+            self.stats['released'] += 1
+
+    def hit_rate(self):
+        """Fraction of claims answered as duplicates."""
+        duplicates = self.stats['hits'] + self.stats['shared_hits'] + self.stats['in_progress']
+        return duplicates / self.stats['claims'] if self.stats['claims'] else 0.0
+
+    def metrics_text(self):
+        """Counters in Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in ('claims', 'hits', 'shared_hits', 'in_progress', 'misses', 'evictions', 'expired'):
+                metric = f'delivery_cache_{name}_total'
+                lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric} {self.stats[name]}')
+            lines.append('# TYPE delivery_cache_entries gauge')
+            lines.append(f'delivery_cache_entries {len(self._entries)}')
+        return '\n'.join(lines) + '\n'
+
+    # ---------- Internals (called with self._lock held) ----------
+
+    def _memory_lookup(self, keys, now):
+        """Answer (or IN_PROGRESS) for the first known key; None if no key is known here."""
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            expires, answer = entry
+            if expires <= now:
+                del self._entries[key]
+                self.stats['expired'] += 1
+                continue
+            if answer is None and self._db is not None:
+                continue  # in progress here: another worker may have finished it, ask SQLite
+            self._entries.move_to_end(key)
+            return answer if answer is not None else IN_PROGRESS
+        return None
+
+    def _memory_store(self, key, expires, answer):
+        self._entries[key] = (expires, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _db_claim(self, keys, now):
+        """Look up and (if new) insert the keys in ONE write transaction, across processes."""
+        marks = ','.join('?' * len(keys))
+        self._db.execute("BEGIN IMMEDIATE")  # takes the write lock: one claimer at a time
+        try:
+            if self.stats['claims'] % PURGE_EVERY == 0:
+                self._db.execute("DELETE FROM deliveries WHERE expires <= ?", (now,))
+            rows = self._db.execute(f"SELECT key, expires, answer FROM deliveries WHERE key IN ({marks})"
+                                    " AND expires > ?", (*keys, now)).fetchall()
+            if not rows:
+                self._db.executemany("INSERT OR REPLACE INTO deliveries VALUES (?, ?, NULL)",
+                                     [(key, now + self.ttl) for key in keys])
+        finally:
+            self._db.execute("COMMIT")
+        for key, expires, answer in rows:
+            if answer is not None:
+                body, status = json.loads(answer)
+                for known in keys:
+                    self._memory_store(known, expires, (body, status))
+                return body, status
+        return IN_PROGRESS if rows else None
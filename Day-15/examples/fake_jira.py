@@ -0,0 +1,205 @@
+# fake_jira.py
+# ----------------------------------------------------
+# A tiny local stand-in for the Jira Cloud REST API, used by the load tests.
+#
+# - GET  /rest/api/3/project     → 200 [every project, all in one list]
+# - GET  /rest/api/3/project/search?startAt=0&maxResults=50
+#                                → 200 {"startAt", "maxResults", "total", "isLast", "values": [...]}
+#   projects=N serves N projects with all the fields real Jira returns
+#   (avatarUrls, projectTypeKey, ...); the default is one "Demo Project"
+# - POST /rest/api/3/issue       → 201 {"id", "key", "self"}
+# - POST /rest/api/3/issue/bulk  → 201 {"issues": [...], "errors": [...]}
+#   (an issue without a "summary" fails with a per-element 400 error,
+#   like real Jira; if every element fails the whole answer is 400)
+# - configurable latency (seconds slept per request) and error rate
+#   (fraction of requests answered with 500)
+# - throttle_rate: fraction of requests answered 429 with a "Retry-After:
+#   retry_after" header, like Jira Cloud's rate limiting
+# - ssl_context: serve HTTPS instead of HTTP (url starts with https://)
+# - counts every call so tests can check how many outbound requests
+#   the Flask app really made
+#
+# Usage:
+#   jira = FakeJira(latency=0.05).start()
+#   os.environ['JIRA_URL'] = jira.url
+#   ...
+#   print(jira.calls)
+#   jira.stop()
+# ----------------------------------------------------
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeJira:
+    """Threaded fake Jira server listening on a free 127.0.0.1 port."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, project_key='DP', throttle_rate=0.0, retry_after=1,
+                 ssl_context=None, projects=1):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.project_key = project_key
+        self.projects = projects
+        self.calls = Counter()  # {'POST /rest/api/3/issue': 12, ...}
+        self._next_id = 10000
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._scheme = 'http'
+        if ssl_context is not None:
+            # The TLS handshake runs in the handler thread on the first read,
+            # so a slow client cannot block the accept loop
+            self._server.socket = ssl_context.wrap_socket(self._server.socket, server_side=True,
+                                                          do_handshake_on_connect=False)
+            self._scheme = 'https'
+
+    @property
+    def url(self):
+        return f'{self._scheme}://127.0.0.1:{self._server.server_port}'
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+    def project(self, index):
+        """Project number 'index' (0 = project_key), shaped like a /project/search value."""
+        project_id = 10000 + index
+        avatar = f'{self.url}/rest/api/3/universal_avatar/view/type/project/avatar/10424'
+        return {
+            'expand': 'description,lead,issueTypes,url,projectKeys,permissions,insight',
+            'self': f'{self.url}/rest/api/3/project/{project_id}',
+            'id': str(project_id),
+            'key': self.project_key if index == 0 else f'P{index}',
+            'name': 'Demo Project' if index == 0 else f'Project {index}',
+            'avatarUrls': {size: f'{avatar}?size={name}' for size, name in
+                           (('48x48', 'large'), ('24x24', 'small'), ('16x16', 'xsmall'), ('32x32', 'medium'))},
+            'projectTypeKey': 'software',
+            'simplified': index % 2 == 0,
+            'style': 'next-gen' if index % 2 == 0 else 'classic',
+            'isPrivate': False,
+            'properties': {},
+            'entityId': f'{project_id:08x}-0000-4000-8000-{index:012x}',
+            'uuid': f'{project_id:08x}-0000-4000-8000-{index:012x}',
+        }
+
+    def project_page(self, start_at, max_results):
+        """Body of GET /project/search, Jira's field order ("values" last)."""
+        start_at = max(0, start_at)
+        end = min(self.projects, start_at + max(0, max_results))
+        return {
+            'self': f'{self.url}/rest/api/3/project/search?startAt={start_at}&maxResults={max_results}',
+            'maxResults': max_results,
+            'startAt': start_at,
+            'total': self.projects,
+            'isLast': end >= self.projects,
+            'values': [self.project(index) for index in range(start_at, end)],
+        }
+
+    def new_issue(self):
+        """Allocate the next issue id/key (thread-safe)."""
+        with self._lock:
+            self._next_id += 1
+            issue_id = self._next_id
+        key = f'{self.project_key}-{issue_id - 10000}'
+        return {'id': str(issue_id), 'key': key, 'self': f'{self.url}/rest/api/3/issue/{issue_id}'}
+
+    def bulk_create(self, issue_updates):
+        """Return (status, body) for a bulk create request, Jira style."""
+        if len(issue_updates) > 50:
+            return 400, {'errorMessages': ['Bulk create supports at most 50 issues']}
+        issues, errors = [], []
+        for index, update in enumerate(issue_updates):
+            if not update.get('fields', {}).get('summary'):
+                errors.append({
+                    'status': 400,
+                    'failedElementNumber': index,
+                    'elementErrors': {'errorMessages': [], 'errors': {'summary': 'You must specify a summary of the issue.'}},
+                })
+            else:
+                issues.append(self.new_issue())
+        status = 400 if issue_updates and not issues else 201
+        return status, {'issues': issues, 'errors': errors}
+
+    def _make_handler(self):
+        fake = self
+
+        class FakeJiraHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive connections
+            # Headers and body are written separately; without this, Nagle's algorithm
+            # holds the body back until the client's delayed ACK (~40 ms per call)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if self._simulate('GET'):
+                    return
+                url = urlsplit(self.path)
+                if url.path == '/rest/api/3/project':
+                    return self._reply(200, [fake.project(index) for index in range(fake.projects)])
+                if url.path == '/rest/api/3/project/search':
+                    query = parse_qs(url.query)
+                    try:
+                        start_at = int(query.get('startAt', ['0'])[0])
+                        max_results = int(query.get('maxResults', ['50'])[0])
+                    except ValueError:
+                        return self._reply(400, {'errorMessages': ['startAt and maxResults must be numbers']})
+                    return self._reply(200, fake.project_page(start_at, min(max_results, 100)))
+                return self._reply(404, {'errorMessages': [f'No fake for {self.path}']})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if self._simulate('POST'):
+                    return
+
+                if self.path == '/rest/api/3/issue':
+                    if 'fields' not in body:
+                        return self._reply(400, {'errorMessages': ['fields is required']})
+                    return self._reply(201, fake.new_issue())
+                if self.path == '/rest/api/3/issue/bulk':
+                    return self._reply(*fake.bulk_create(body.get('issueUpdates', [])))
+                return self._reply(404, {'errorMessages': [f'No fake for {self.path}']})
+
+            def _simulate(self, method):
+                """Count the call, sleep, maybe answer 429/500. True when an answer was sent."""
+                with fake._lock:
+                    fake.calls[f"{method} {self.path.split('?')[0]}"] += 1
+
+                time.sleep(fake.latency)
+                if random.random() < fake.throttle_rate:
+                    self._reply(429, {'errorMessages': ['Rate limit exceeded']},
+                                {'Retry-After': str(fake.retry_after)})
+                    return True
+                if random.random() < fake.error_rate:
+                    self._reply(500, {'errorMessages': ['Simulated Jira failure']})
+                    return True
+                return False
+
+            def _reply(self, status, data, headers=None):
+                payload = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep load-test output clean
+
+        return FakeJiraHandler
@@ -0,0 +1,235 @@
+# jira_queue.py
+# ----------------------------------------------------
+# Background worker queue for creating Jira tickets
+#
+# Problem: the Flask route used to call Jira INSIDE the webhook handler.
+# GitHub waited for Jira to answer, and every in-flight ticket held one
+# Flask worker thread.
+#
+# Solution:
+# - the route only validates the payload and calls submit() → 202 right away
+# - a bounded queue holds pending tickets; when it is full, submit() raises
+#   queue.Full and the route answers 503 (backpressure: GitHub retries later)
+# - a fixed pool of worker threads drains the queue, sharing one
+#   requests.Session whose keep-alive connection pool has one slot per worker
+#   (pass session= to reuse an existing one, e.g. JiraClient(...).session from
+#   Day-14/examples/jira_client.py with retries and latency histograms)
+# - batching: a worker waits for up to batch_size tickets OR batch_wait
+#   seconds (whichever comes first) and sends them in ONE call to Jira's
+#   bulk endpoint POST /rest/api/3/issue/bulk (Jira allows 50 per call)
+# - every error in the bulk response is mapped back to the ticket (and the
+#   webhook delivery, "source") that caused it
+# - trace= (a W3C traceparent, e.g. AppMetrics.traceparent() in app_metrics.py)
+#   travels with the ticket and is sent as the "traceparent" header of the Jira
+#   call, so the call's client span joins the webhook request's trace. A bulk
+#   call has one parent: the first traced ticket of the batch.
+#
+# Usage:
+#   tickets = JiraTicketQueue(issue_url, auth, workers=4, max_queue=100).start()
+#   tickets = JiraTicketQueue(issue_url, session=jira.session, workers=4).start()
+#   ticket_id = tickets.submit(fields, source=delivery_id)   # may raise queue.Full
+#   ticket_id = tickets.submit(fields, source=delivery_id, trace=metrics.traceparent())
+#   tickets.status(ticket_id)    # {'state': 'created', 'key': 'DP-1', 'source': ...}
+# ----------------------------------------------------
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+MAX_RESULTS = 10000  # How many finished ticket results we remember
+MAX_BULK_ISSUES = 50  # Jira's limit for /rest/api/3/issue/bulk
+
+logger = logging.getLogger(__name__)
+
+
+class JiraTicketQueue:
+    """Bounded queue + worker threads that POST issues to Jira."""
+
+    def __init__(self, issue_url, auth=None, workers=4, max_queue=100, timeout=10, batch_size=MAX_BULK_ISSUES,
+                 batch_wait=0.2, session=None):
+        self.issue_url = issue_url
+        self.bulk_url = issue_url.rstrip('/') + '/bulk'
+        self.workers = workers
+        self.timeout = timeout
+        # batch_size=1 turns batching off (one POST /issue per ticket)
+        self.batch_size = max(1, min(batch_size, MAX_BULK_ISSUES))
+        self.batch_wait = batch_wait
+
+        # One session for all workers: connections are kept alive and reused.
+        # A session passed in already has its pool size, auth and headers.
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.auth = auth
+            session.headers.update({
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            })
+        self.session = session
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._results = OrderedDict()  # ticket_id → result dict (oldest first)
+        self._lock = threading.Lock()
+        self.stats = Counter()  # queued / created / failed / rejected / jira_calls
+        self._threads = []
+
+    def start(self):
+        """Start the worker threads (daemon threads stop with the process)."""
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'jira-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, fields, source=None, trace=None):
+        """
+        Queue one issue ("fields" part of the Jira payload) and return its ticket id.
+        'source' identifies what caused it (e.g. the X-GitHub-Delivery id) and is
+        kept in the ticket's result so errors can be traced back to the webhook.
+        'trace' (a W3C traceparent) is sent with the Jira call that creates it.
+        Raises queue.Full when the queue is at capacity.
+        """
+        ticket_id = uuid.uuid4().hex
+        # Recorded BEFORE the ticket is queued: a fast worker may finish it right away,
+        # and its 'created' / 'failed' must not be overwritten by 'queued'
+        self._record(ticket_id, {'state': 'queued', 'source': source})
+        try:
+            self._queue.put_nowait((ticket_id, source, {"fields": fields, "update": {}}, trace))
+        except queue.Full:
+            with self._lock:
+                self._results.pop(ticket_id, None)
+                self.stats['rejected'] += 1
+            raise
+        with self._lock:
+            self.stats['queued'] += 1
+        return ticket_id
+
+    def status(self, ticket_id):
+        """Return the latest result for ticket_id (None if unknown/forgotten)."""
+        with self._lock:
+            return self._results.get(ticket_id)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def join(self):
+        """Block until every queued ticket has been processed."""
+        self._queue.join()
+
+    # ---------- Internals ----------
+
+    def _record(self, ticket_id, result):
+        with self._lock:
+            self._results[ticket_id] = result
+            self._results.move_to_end(ticket_id)
+            while len(self._results) > MAX_RESULTS:
+                self._results.popitem(last=False)
+
+    def _next_batch(self):
+        """
+        Block for the first ticket, then keep collecting until batch_size
+        tickets are waiting or batch_wait seconds have passed.
+        """
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _post(self, url, payload, trace=None):
+        """POST to Jira; returns (status_code, parsed JSON or None, error text)."""
+        with self._lock:
+            self.stats['jira_calls'] += 1
+        headers = {'traceparent': trace} if trace else None
+        try:
+            response = self.session.post(url, json=payload, headers=headers, timeout=self.timeout)
+        except requests.RequestException as error:
+            return None, None, str(error)
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return response.status_code, data, response.text[:500]
+
+    def _create_one(self, payload, trace=None):
+        """Single-issue endpoint: returns one result dict."""
+        status_code, data, error = self._post(self.issue_url, payload, trace)
+        if status_code == 201 and data:
+            return {'state': 'created', 'key': data.get('key')}
+        return {'state': 'failed', 'status_code': status_code, 'error': error}
+
+    def _create_bulk(self, payloads, trace=None):
+        """
+        Bulk endpoint: returns one result dict per payload, in the same order.
+
+        Jira's answer looks like:
+          {"issues": [{"key": "DP-1"}, ...],                      # the successes, in order
+           "errors": [{"failedElementNumber": 3, "status": 400,   # index into issueUpdates
+                       "elementErrors": {"errors": {...}}}]}
+        """
+        status_code, data, error = self._post(self.bulk_url, {"issueUpdates": payloads}, trace)
+        if not isinstance(data, dict) or not isinstance(data.get('errors', []), list) or \
+                (status_code not in (200, 201) and 'errors' not in data):
+            # The whole call failed (network error, 5xx, auth, or Jira's generic
+            # {"errorMessages": [...], "errors": {"field": "..."}} answer): every ticket failed
+            return [{'state': 'failed', 'status_code': status_code, 'error': error}] * len(payloads)
+
+        errors = {item.get('failedElementNumber'): item for item in data.get('errors', [])}
+        created = iter(data.get('issues', []))
+        results = []
+        for index in range(len(payloads)):
+            if index in errors:
+                element = errors[index]
+                results.append({
+                    'state': 'failed',
+                    'status_code': element.get('status'),
+                    'error': element.get('elementErrors'),
+                })
+            else:
+                issue = next(created, None)
+                if issue is None:
+                    results.append({'state': 'failed', 'status_code': status_code, 'error': 'missing from bulk response'})
+                else:
+                    results.append({'state': 'created', 'key': issue.get('key')})
+        return results
+
+    def _worker(self):
+        while True:
+            batch = self._next_batch()
+            payloads = [payload for _, _, payload, _ in batch]
+            trace = next((trace for *_, trace in batch if trace), None)
+            try:
+                if len(batch) == 1:
+                    results = [self._create_one(payloads[0], trace)]
+                else:
+                    results = self._create_bulk(payloads, trace)
+            except Exception as error:
+                # A bug or an unexpected answer must not kill the worker: the tickets
+                # would stay 'queued' forever and ticket_queue.join() would never return
+                logger.exception("Jira batch of %d tickets failed", len(batch))
+                results = [{'state': 'failed', 'status_code': None, 'error': repr(error)}] * len(batch)
+
+            for (ticket_id, source, _, _), result in zip(batch, results):
+                try:
+                    result = dict(result, source=source)
+                    if result['state'] == 'failed':
+                        logger.warning("Jira ticket %s (source %s) failed: %s", ticket_id, source, result.get('error'))
+                    self._record(ticket_id, result)
+                    with self._lock:
+                        self.stats[result['state']] += 1
+                finally:
+                    self._queue.task_done()
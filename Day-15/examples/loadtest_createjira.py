@@ -0,0 +1,123 @@
+# loadtest_createjira.py
+# ----------------------------------------------------
+# Load test for the /createJira webhook (02-github-jira.py)
+#
+# What it does:
+# 1. Starts a local fake Jira (fake_jira.py) with artificial latency.
+# 2. Starts the Flask app from 02-github-jira.py on a free local port,
+#    pointed at the fake Jira through the JIRA_URL environment variable.
+# 3. Fires N '/CreateJira' webhooks with C concurrent senders.
+# 4. Reports webhook latency (p50/p99, what GitHub sees) and how many
+#    tickets/sec the background workers pushed to Jira.
+#
+# Run:
+#   python loadtest_createjira.py
+#   python loadtest_createjira.py --requests 2000 --concurrency 50 --jira-latency 0.2 --workers 8
+#   python loadtest_createjira.py --batch-size 1     # one Jira call per ticket (no bulk API)
+# ----------------------------------------------------
+
+import argparse
+import importlib.util
+import logging
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.serving import make_server
+
+from fake_jira import FakeJira
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_app(jira_url, workers, queue_size, batch_size, batch_wait_ms):
+    """Import 02-github-jira.py (the file name is not a valid module name, so load it by path)."""
+    os.environ['JIRA_URL'] = jira_url
+    os.environ['JIRA_WORKERS'] = str(workers)
+    os.environ['JIRA_QUEUE_SIZE'] = str(queue_size)
+    os.environ['JIRA_BATCH_SIZE'] = str(batch_size)
+    os.environ['JIRA_BATCH_WAIT_MS'] = str(batch_wait_ms)
+    spec = importlib.util.spec_from_file_location('github_jira', os.path.join(HERE, '02-github-jira.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def webhook_payload(number):
+    return {
+        "action": "created",
+        "comment": {"id": number, "body": "/CreateJira", "user": {"login": "dev-user"}},
+        "issue": {"number": number, "title": f"Load test issue {number}", "body": "Generated by loadtest"},
+        "repository": {"full_name": "demo/repo"},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the /createJira webhook')
+    parser.add_argument('--requests', type=int, default=500, help='number of webhooks to send')
+    parser.add_argument('--concurrency', type=int, default=20, help='concurrent webhook senders')
+    parser.add_argument('--jira-latency', type=float, default=0.1, help='fake Jira delay per call (s)')
+    parser.add_argument('--workers', type=int, default=8, help='Jira worker threads in the app')
+    parser.add_argument('--queue-size', type=int, default=1000, help='max pending tickets in the app')
+    parser.add_argument('--batch-size', type=int, default=50, help='tickets per bulk call (1 = no batching)')
+    parser.add_argument('--batch-wait-ms', type=int, default=200, help='max wait to fill a batch')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no per-request access log lines
+    jira = FakeJira(latency=args.jira_latency).start()
+    module = load_app(jira.url, args.workers, args.queue_size, args.batch_size, args.batch_wait_ms)
+    server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webhook_url = f'http://127.0.0.1:{server.server_port}/createJira'
+
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=args.concurrency))
+
+    def send(number):
+        start = time.perf_counter()
+        response = session.post(webhook_url, json=webhook_payload(number),
+                                headers={'X-GitHub-Delivery': f'loadtest-{number}'})
+        return time.perf_counter() - start, response.status_code
+
+    print(f"Sending {args.requests} webhooks, concurrency {args.concurrency}, "
+          f"fake Jira latency {args.jira_latency * 1000:.0f} ms, {args.workers} workers, batch size {args.batch_size}\n")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, range(args.requests)))
+    sent_elapsed = time.perf_counter() - started
+
+    module.ticket_queue.join()  # wait until the workers created every ticket
+    drained_elapsed = time.perf_counter() - started
+
+    latencies = [latency * 1000 for latency, _ in results]
+    status_counts = {}
+    for _, status in results:
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+    print(f"Webhook responses:   {status_counts}")
+    print(f"Webhook latency:     p50 {percentile(latencies, 50):.1f} ms   "
+          f"p99 {percentile(latencies, 99):.1f} ms   mean {statistics.mean(latencies):.1f} ms")
+    print(f"Webhooks/sec:        {args.requests / sent_elapsed:.0f}")
+    print(f"Tickets created:     {module.ticket_queue.stats['created']}   "
+          f"failed: {module.ticket_queue.stats['failed']}   Jira calls: {jira.total_calls()}")
+    print(f"Tickets/sec:         {module.ticket_queue.stats['created'] / drained_elapsed:.1f}")
+    print(f"\nJira calls as seen by the app's Jira client:\n{module.jira.latency_report()}")
+
+    server.shutdown()
+    jira.stop()
+
+
+if __name__ == "__main__":
+    main()
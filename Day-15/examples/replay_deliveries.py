@@ -0,0 +1,131 @@
+# replay_deliveries.py
+# ----------------------------------------------------
+# Replay test for the delivery cache (delivery_cache.py) in 02-github-jira.py
+#
+# Every '/CreateJira' comment is sent 3 times, in random order, from
+# concurrent senders:
+#   copy 1 → the original delivery
+#   copy 2 → GitHub's retry: SAME X-GitHub-Delivery id
+#   copy 3 → the same comment under a NEW delivery id (second hook, manual redeliver)
+#
+# Three runs against a local fake Jira:
+#   no cache      → DELIVERY_CACHE_TTL=0: every copy creates a ticket
+#   memory cache  → one app instance, in-memory TTL+LRU
+#   shared SQLite → two app instances ("workers") sharing one SQLite file,
+#                   copies spread over both; they must still agree
+# Expected with the cache: exactly one ticket per comment, 2/3 hit rate.
+#
+# Run:
+#   python replay_deliveries.py
+#   python replay_deliveries.py --comments 500 --concurrency 30
+# ----------------------------------------------------
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.serving import make_server
+
+from fake_jira import FakeJira
+from loadtest_createjira import load_app, webhook_payload
+
+COPIES = 3
+
+
+def start_app(jira_url, ttl, db_path):
+    """Load 02-github-jira.py with its own queue and delivery cache; returns (module, webhook URL, server)."""
+    os.environ['DELIVERY_CACHE_TTL'] = str(ttl)
+    os.environ['DELIVERY_CACHE_DB'] = db_path or ''
+    module = load_app(jira_url, workers=4, queue_size=10000, batch_size=50, batch_wait_ms=50)
+    server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return module, f'http://127.0.0.1:{server.server_port}/createJira', server
+
+
+def deliveries(comments):
+    """(comment number, copy number, delivery id) for every copy, shuffled."""
+    sends = []
+    for number in range(comments):
+        sends.append((number, 1, f'delivery-{number}'))
+        sends.append((number, 2, f'delivery-{number}'))           # GitHub retry
+        sends.append((number, 3, f'redelivery-{number}'))         # new id, same comment
+    random.Random(42).shuffle(sends)
+    return sends
+
+
+def run(title, comments, concurrency, ttl=3600, shared=False):
+    jira = FakeJira(latency=0.05).start()
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = os.path.join(folder, 'deliveries.db') if shared else None
+        apps = [start_app(jira.url, ttl, db_path) for _ in range(2 if shared else 1)]
+
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_maxsize=concurrency))
+
+        def send(item):
+            number, copy, delivery_id = item
+            _, url, _ = apps[copy % len(apps)]
+            response = session.post(url, json=webhook_payload(number), headers={'X-GitHub-Delivery': delivery_id})
+            return number, response.status_code, response.json().get('ticket_id'), response.headers.get('X-Delivery-Cache')
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(send, deliveries(comments)))
+        for module, _, _ in apps:
+            module.ticket_queue.join()
+        elapsed = time.perf_counter() - started
+
+        created = sum(module.ticket_queue.stats['created'] for module, _, _ in apps)
+        statuses = Counter(status for _, status, _, _ in results)
+        cache_hits = sum(1 for _, _, _, hit in results if hit)
+        # Every copy that got a ticket id must point at the same ticket as the other copies
+        tickets = {}
+        for number, _, ticket_id, _ in results:
+            if ticket_id:
+                tickets.setdefault(number, set()).add(ticket_id)
+        consistent = sum(1 for ids in tickets.values() if len(ids) == 1)
+
+        stats = Counter()
+        for module, _, _ in apps:
+            stats.update(module.delivery_cache.stats)
+        claims = stats['claims'] or 1
+        print(f"{title}:")
+        print(f"  {len(results)} deliveries for {comments} comments in {elapsed:.2f} s, answers {dict(statuses)}")
+        print(f"  Jira tickets created: {created}   Jira calls: {jira.total_calls()}   "
+              f"answered from cache: {cache_hits}")
+        print(f"  cache: hit rate {(stats['hits'] + stats['shared_hits'] + stats['in_progress']) / claims:.0%}  "
+              f"(memory {stats['hits']}, shared {stats['shared_hits']}, in progress {stats['in_progress']}, "
+              f"misses {stats['misses']})")
+        print(f"  comments whose copies all got the same ticket id: {consistent}/{len(tickets)}\n")
+
+        for module, _, server in apps:
+            server.shutdown()
+            module.delivery_cache.close()
+    jira.stop()
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay every webhook 3x and count Jira tickets')
+    parser.add_argument('--comments', type=int, default=200, help='distinct /CreateJira comments')
+    parser.add_argument('--concurrency', type=int, default=20, help='concurrent webhook senders')
+    args = parser.parse_args()
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    run('No cache (TTL 0)', args.comments, args.concurrency, ttl=0)
+    created = run('Memory cache', args.comments, args.concurrency)
+    assert created == args.comments, created
+    created = run('Shared SQLite cache, 2 workers', args.comments, args.concurrency, shared=True)
+    assert created == args.comments, created
+
+
+if __name__ == "__main__":
+    main()
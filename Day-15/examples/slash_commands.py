@@ -0,0 +1,198 @@
+# slash_commands.py
+# ----------------------------------------------------
+# Slash-command router for GitHub comments (/CreateJira, /CloseJira DP-12, ...)
+#
+# 1. Dispatch table as a prefix trie
+#    Every command name is stored letter by letter (lowercase) in nested
+#    dicts:  {'c': {'r': {'e': ...}, 'l': {'o': ...}}, 'l': {'i': ...}}
+#    Matching walks the comment text one character at a time and stops at
+#    the FIRST letter that no command has - so "/abc..." or "/Createxyz"
+#    is rejected after a few characters, however long the comment is, and
+#    the text is never lower-cased or split as a whole. Case-insensitive:
+#    /createjira, /CREATEJIRA and /CreateJira are the same command.
+#
+# 2. Arguments with shlex (shell-style quoting) on the command's line:
+#    /LinkJira DP-12 "relates to"  →  ['DP-12', 'relates to']
+#    Following lines are kept as free text (e.g. a longer description).
+#
+# 3. Reject before parsing JSON
+#    99% of comments are not commands, and a GitHub issue_comment payload
+#    is 20-60 KB (issue, comment, repository, sender objects full of URLs).
+#    might_be_command(raw_bytes) finds the "comment" key in the RAW bytes
+#    (searching from the end), then each "body": "..." after it, decodes
+#    only its first 64 characters and walks them through the trie. If none
+#    can start with a known command the payload is rejected without
+#    json.loads(). The check can give false positives (another body after
+#    the comment, a cut-off prefix), but no false negatives as long as no
+#    object AFTER the comment has its own "comment" key (true for GitHub's
+#    issue_comment events). Passing payloads are parsed and routed on comment.body.
+#
+# Usage:
+#   router = CommandRouter()
+#
+#   @router.command('/LinkJira', '<issue-key> [link-type]')
+#   def link_jira(payload, command):
+#       ...
+#
+#   if might_be_command(raw, router):
+#       result = router.dispatch(json.loads(raw))
+# ----------------------------------------------------
+
+import json
+import re
+import shlex
+from collections import namedtuple
+
+# The parsed command handed to a handler
+Command = namedtuple('Command', 'name args text')
+
+# '' is never a letter, so it marks "a command ends here" inside a trie node
+END = ''
+
+# "body": "<first PREFIX_LENGTH characters>" in the raw payload (JSON allows spaces
+# around ':'). Group 2 is the closing quote when the whole string fits. '"' and '\\'
+# never occur inside a multi-byte UTF-8 character, so this is safe on raw bytes.
+PREFIX_LENGTH = 64
+KEY_COLON = re.compile(rb'\s*:')
+BODY_PREFIX = re.compile(rb'"body"\s*:\s*"((?:[^"\\]|\\.){0,%d})(")?' % PREFIX_LENGTH, re.DOTALL)
+
+
+class UsageError(ValueError):
+    """Raised by a command with missing or extra arguments."""
+
+
+class CommandRouter:
+    """Case-insensitive prefix-trie dispatch table for slash commands."""
+
+    def __init__(self):
+        self._trie = {}
+        self.commands = {}  # lowercase name → (display name, usage, handler)
+
+    def command(self, name, usage='', min_args=None, max_args=None):
+        """
+        Decorator registering handler(payload, command) for name ('/CreateJira').
+        min_args / max_args default to what 'usage' shows: <required> and [optional] words,
+        a trailing '...' allows any number.
+        """
+        words = usage.split()
+        if min_args is None:
+            min_args = sum(1 for word in words if word.startswith('<'))
+        if max_args is None:
+            max_args = None if words and words[-1].rstrip(']>').endswith('...') else len(words)
+
+        def register(handler):
+            node = self._trie
+            for letter in name.lower():
+                node = node.setdefault(letter, {})
+            node[END] = (name, usage, min_args, max_args, handler)
+            self.commands[name.lower()] = (name, usage, handler)
+            return handler
+        return register
+
+    def match(self, text):
+        """
+        (entry, end index) when text starts with a registered command (after
+        leading whitespace) followed by whitespace or the end; otherwise None.
+        """
+        start = 0
+        length = len(text)
+        while start < length and text[start].isspace():
+            start += 1
+        node = self._trie
+        index = start
+        while index < length:
+            letter = text[index]
+            if letter.isspace():
+                break
+            node = node.get(letter.lower())
+            if node is None:
+                return None  # no command continues with this letter
+            index += 1
+        entry = node.get(END) if index > start else None
+        return (entry, index) if entry else None
+
+    def starts_command(self, text, complete=True):
+        """
+        Like match() but only True/False. complete=False means text is just the
+        first characters of a longer string: True also when a command could
+        continue past the cut.
+        """
+        stripped = text.lstrip()
+        if not stripped:
+            return not complete
+        node = self._trie
+        for letter in stripped:
+            if letter.isspace():
+                return END in node
+            node = node.get(letter.lower())
+            if node is None:
+                return False
+        return END in node or not complete
+
+    def parse(self, text):
+        """Command(name, args, text) for a comment body, or None if it is not a known command."""
+        found = self.match(text)
+        if found is None:
+            return None
+        (name, _, _, _, _), end = found
+        first_line, _, rest = text[end:].partition('\n')
+        try:
+            args = shlex.split(first_line)
+        except ValueError:  # unbalanced quote, e.g. "/CreateJira can't log in"
+            args = first_line.split()
+        return Command(name, args, rest.strip())
+
+    def dispatch(self, payload):
+        """
+        Run the handler for payload['comment']['body'].
+        Returns the handler's result, None for non-commands, or a usage message.
+        """
+        comment = payload.get('comment')
+        body = comment.get('body') if isinstance(comment, dict) else None
+        if not isinstance(body, str):
+            return None
+        found = self.match(body)
+        if found is None:
+            return None
+        (name, usage, min_args, max_args, handler), _ = found
+        command = self.parse(body)
+        if len(command.args) < min_args or (max_args is not None and len(command.args) > max_args):
+            return f"Usage: {name} {usage}".rstrip()
+        try:
+            return handler(payload, command)
+        except UsageError as error:
+            return f"Usage: {name} {usage} ({error})".rstrip()
+
+
+def comment_position(raw):
+    """Byte offset of the "comment": key in raw JSON, or -1 (searched from the end)."""
+    position = raw.rfind(b'"comment"')
+    while position != -1:
+        if KEY_COLON.match(raw, position + 9):
+            return position  # a key, not the string value "comment"
+        position = raw.rfind(b'"comment"', 0, position)
+    return -1
+
+
+def might_be_command(raw, router):
+    """False when comment.body in the raw payload cannot start with a command of router."""
+    # comment.body comes somewhere after the "comment" key: the big issue body before it
+    # (GitHub sends action, issue, comment, repository, sender) is never scanned.
+    # Every "body" after the key is checked, so a different key order is still safe.
+    position = comment_position(raw)
+    if position == -1:
+        return False  # no comment at all: dispatch() would ignore it too
+    position = raw.find(b'"body"', position)
+    while position != -1:
+        found = BODY_PREFIX.match(raw, position)
+        position = raw.find(b'"body"', position + 6)
+        if found is None:
+            continue
+        prefix, complete = found.group(1), found.group(2) is not None
+        try:
+            text = json.loads(b'"' + prefix + b'"')
+        except ValueError:
+            return True  # cut inside a \uXXXX escape or a UTF-8 character: let json.loads decide
+        if router.starts_command(text, complete):
+            return True
+    return False
@@ -0,0 +1,381 @@
+# webhook_harness.py
+# ----------------------------------------------------
+# Record-and-replay load testing for the /createJira webhook (02-github-jira.py)
+#
+# loadtest_createjira.py fires one kind of synthetic webhook as fast as it
+# can. This harness works with a CORPUS of deliveries instead, so the same
+# burst can be replayed again and again and the results compared over time.
+#
+# 1. record → NDJSON corpus (one delivery per line:
+#             {"event", "delivery", "headers", "payload"})
+#      synthetic: realistic 20-60 KB issue_comment payloads, a share of them '/CreateJira'
+#      listen:    a tiny HTTP receiver; point a GitHub webhook (or ngrok) at it
+#                 and every delivery it gets is appended to the corpus
+# 2. replay → sends the corpus to the app
+#      --rate R        open loop: delivery i is due at i/R seconds, like real
+#                      traffic (latency counted from the due time, so a slow
+#                      app cannot hide its backlog)
+#      --concurrency C closed loop without --rate: C senders back to back;
+#                      with --rate: the most deliveries in flight at once
+#    By default the app runs in this process against fake_jira.py with the
+#    chosen latency / error / 429 rates, so outbound Jira calls are counted
+#    too. --url replays against an app that is already running instead.
+# 3. Results: throughput, latency percentiles, status and error counts,
+#    outbound calls, tickets created/failed, delivery-cache hits → printed and
+#    written to a JSON file (--result). 'compare' shows several result files
+#    side by side.
+#
+# Run:
+#   python webhook_harness.py record corpus.ndjson --synthetic 2000 --command-rate 0.2
+#   python webhook_harness.py record corpus.ndjson --listen 8080
+#   python webhook_harness.py replay corpus.ndjson --rate 200 --jira-latency 0.2 --result run1.json
+#   python webhook_harness.py replay corpus.ndjson --concurrency 50 --jira-error-rate 0.05 --result run2.json
+#   python webhook_harness.py compare run1.json run2.json
+# ----------------------------------------------------
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.serving import make_server
+
+from benchmark_slash_commands import PLAIN_COMMENTS, make_payload, markdown
+from fake_jira import FakeJira
+from loadtest_createjira import load_app, percentile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RECORDED_HEADERS = ('Content-Type', 'User-Agent', 'X-GitHub-Event', 'X-GitHub-Delivery', 'X-GitHub-Hook-ID',
+                    'X-Hub-Signature-256')
+# Numbers shown by 'compare' (path inside the result file, label)
+COMPARED = (
+    (('deliveries',), 'deliveries'),
+    (('throughput', 'sent_per_second'), 'sent/s'),
+    (('throughput', 'tickets_per_second'), 'tickets/s'),
+    (('latency_ms', 'p50'), 'latency p50 ms'),
+    (('latency_ms', 'p90'), 'latency p90 ms'),
+    (('latency_ms', 'p99'), 'latency p99 ms'),
+    (('latency_ms', 'max'), 'latency max ms'),
+    (('errors', 'http'), 'http errors'),
+    (('errors', 'exceptions'), 'exceptions'),
+    (('outbound', 'jira_calls'), 'Jira calls'),
+    (('outbound', 'tickets_created'), 'tickets created'),
+    (('outbound', 'tickets_failed'), 'tickets failed'),
+    (('outbound', 'retries'), 'Jira retries'),
+)
+
+
+# ---------- Corpus ----------
+
+def synthetic_corpus(count, command_rate, min_kb, max_kb, seed=5):
+    """Yield count synthetic issue_comment deliveries."""
+    rng = random.Random(seed)
+    for number in range(count):
+        if rng.random() < command_rate:
+            body = '/CreateJira'
+        elif rng.random() < 0.5:
+            body = rng.choice(PLAIN_COMMENTS)
+        else:
+            body = markdown(rng, rng.randrange(100, 3000))
+        raw = make_payload(rng, number + 1, body, rng.randrange(min_kb * 1000, max_kb * 1000 + 1))
+        delivery = str(uuid.UUID(int=rng.getrandbits(128)))
+        yield {
+            'event': 'issue_comment',
+            'delivery': delivery,
+            'headers': {'Content-Type': 'application/json', 'X-GitHub-Event': 'issue_comment',
+                        'X-GitHub-Delivery': delivery},
+            'payload': json.loads(raw),
+        }
+
+
+def write_corpus(path, records):
+    count = 0
+    with open(path, 'w', encoding='utf-8') as corpus:
+        for record in records:
+            corpus.write(json.dumps(record) + '\n')
+            count += 1
+    return count
+
+
+def read_corpus(path):
+    with open(path, encoding='utf-8') as corpus:
+        return [json.loads(line) for line in corpus if line.strip()]
+
+
+def record_listener(path, port):
+    """Receive webhooks on port and append each one to the corpus until Ctrl+C."""
+    lock = threading.Lock()
+    corpus = open(path, 'a', encoding='utf-8')
+
+    class RecorderHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                self.send_response(400)
+                self.end_headers()
+                return
+            headers = {name: self.headers[name] for name in RECORDED_HEADERS if name in self.headers}
+            record = {'event': headers.get('X-GitHub-Event'), 'delivery': headers.get('X-GitHub-Delivery'),
+                      'headers': headers, 'payload': payload}
+            with lock:
+                corpus.write(json.dumps(record) + '\n')
+                corpus.flush()
+            print(f"recorded {record['event']} {record['delivery']} ({len(body):,} bytes)")
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    server = ThreadingHTTPServer(('0.0.0.0', port), RecorderHandler)
+    print(f"Recording webhooks sent to http://<this-host>:{port}/ into {path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        corpus.close()
+
+
+# ---------- Replay ----------
+
+def start_local_app(args):
+    """fake Jira + 02-github-jira.py served on a free port. Returns (webhook url, module, fake, server)."""
+    fake = FakeJira(latency=args.jira_latency, error_rate=args.jira_error_rate,
+                    throttle_rate=args.jira_throttle_rate, retry_after=1).start()
+    module = load_app(fake.url, args.workers, args.queue_size, args.batch_size, args.batch_wait_ms)
+    server = make_server('127.0.0.1', 0, module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}/createJira', module, fake, server
+
+
+def replay(records, url, rate=None, concurrency=20, fresh_ids=False):
+    """
+    Send every record; returns one (due, start, end, status, error) tuple per delivery.
+    due is None in closed-loop mode (no --rate).
+    """
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=concurrency))
+    session.mount('https://', HTTPAdapter(pool_maxsize=concurrency))
+    # Serialize up front so the client's JSON work is not part of the measurement
+    prepared = []
+    for record in records:
+        headers = dict(record.get('headers') or {})
+        headers['Content-Type'] = 'application/json'
+        if fresh_ids:
+            headers['X-GitHub-Delivery'] = str(uuid.uuid4())
+        prepared.append((json.dumps(record['payload']).encode(), headers))
+
+    first_due = time.perf_counter() + 0.05
+
+    def send(item):
+        number, (body, headers) = item
+        due = None
+        if rate:
+            due = first_due + number / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        start = time.perf_counter()
+        try:
+            status, error = session.post(url, data=body, headers=headers, timeout=30).status_code, None
+        except requests.RequestException as exception:
+            status, error = None, type(exception).__name__
+        return due, start, time.perf_counter(), status, error
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(send, enumerate(prepared)))
+
+
+def summarize(results, elapsed, drained):
+    """Throughput / latency / error part of the result file."""
+    # Open loop: from the due time (includes waiting for a free sender); closed loop: from the send
+    latencies = [(end - (due if due is not None else start)) * 1000 for due, start, end, _, _ in results]
+    service = [(end - start) * 1000 for _, start, end, _, _ in results]
+    statuses = Counter(str(status) for _, _, _, status, error in results if error is None)
+    exceptions = Counter(error for _, _, _, _, error in results if error is not None)
+    return {
+        'throughput': {
+            'duration_seconds': round(elapsed, 3),
+            'drain_seconds': round(drained, 3),
+            'sent_per_second': round(len(results) / elapsed, 1),
+        },
+        'latency_ms': {
+            'mean': round(statistics.mean(latencies), 2),
+            'p50': round(percentile(latencies, 50), 2),
+            'p90': round(percentile(latencies, 90), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(max(latencies), 2),
+            'service_p50': round(percentile(service, 50), 2),
+            'service_p99': round(percentile(service, 99), 2),
+        },
+        'responses': dict(sorted(statuses.items())),
+        'errors': {
+            'http': sum(count for status, count in statuses.items() if not status.startswith('2')),
+            'exceptions': sum(exceptions.values()),
+            'exception_types': dict(exceptions),
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_replay(args):
+    records = read_corpus(args.corpus)
+    if args.limit:
+        records = records[:args.limit]
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    module = fake = server = None
+    url = args.url
+    if url is None:
+        url, module, fake, server = start_local_app(args)
+
+    mode = f"rate {args.rate:g}/s, max {args.concurrency} in flight" if args.rate else f"concurrency {args.concurrency}"
+    print(f"Replaying {len(records):,} deliveries from {args.corpus} to {url} ({mode})")
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    start = time.perf_counter()
+    results = replay(records, url, args.rate, args.concurrency, args.fresh_ids)
+    elapsed = time.perf_counter() - start
+    if module is not None:
+        module.ticket_queue.join()  # tickets still being sent to Jira
+    drained = time.perf_counter() - start
+
+    report = {
+        'started_at': started_at,
+        'git_commit': git_commit(),
+        'corpus': os.path.abspath(args.corpus),
+        'deliveries': len(records),
+        'config': {
+            'url': args.url, 'rate': args.rate, 'concurrency': args.concurrency, 'fresh_ids': args.fresh_ids,
+            'jira_latency': args.jira_latency, 'jira_error_rate': args.jira_error_rate,
+            'jira_throttle_rate': args.jira_throttle_rate, 'workers': args.workers,
+            'queue_size': args.queue_size, 'batch_size': args.batch_size, 'batch_wait_ms': args.batch_wait_ms,
+        },
+    }
+    report.update(summarize(results, elapsed, drained))
+    if module is not None:
+        stats = module.ticket_queue.stats
+        report['throughput']['tickets_per_second'] = round(stats['created'] / drained, 1)
+        report['outbound'] = {
+            'jira_calls': fake.total_calls(),
+            'jira_calls_by_endpoint': dict(fake.calls),
+            'retries': module.jira.stats['retries'],
+            'tickets_created': stats['created'],
+            'tickets_failed': stats['failed'],
+            'tickets_rejected': stats['rejected'],
+        }
+        report['delivery_cache'] = dict(module.delivery_cache.stats)
+        server.shutdown()
+        fake.stop()
+
+    print_report(report)
+    if args.result:
+        with open(args.result, 'w', encoding='utf-8') as result_file:
+            json.dump(report, result_file, indent=2)
+        print(f"\nResult written to {args.result}")
+
+
+def print_report(report):
+    throughput, latency, errors = report['throughput'], report['latency_ms'], report['errors']
+    print(f"  sent:        {report['deliveries']:,} in {throughput['duration_seconds']:.2f} s "
+          f"({throughput['sent_per_second']:,.0f}/s), drained after {throughput['drain_seconds']:.2f} s")
+    print(f"  latency ms:  p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  p99 {latency['p99']:.1f}  "
+          f"max {latency['max']:.1f}  (service p50 {latency['service_p50']:.1f}, p99 {latency['service_p99']:.1f})")
+    print(f"  responses:   {report['responses']}  http errors {errors['http']}  exceptions {errors['exceptions']}")
+    if 'outbound' in report:
+        outbound = report['outbound']
+        print(f"  Jira:        {outbound['jira_calls']} calls {outbound['jira_calls_by_endpoint']}, "
+              f"{outbound['retries']} retries")
+        print(f"  tickets:     {outbound['tickets_created']} created ({throughput['tickets_per_second']:,.0f}/s), "
+              f"{outbound['tickets_failed']} failed, {outbound['tickets_rejected']} rejected (queue full)")
+
+
+# ---------- Compare ----------
+
+def compare(paths):
+    reports = []
+    for path in paths:
+        with open(path, encoding='utf-8') as result_file:
+            reports.append(json.load(result_file))
+    names = [os.path.basename(path) for path in paths]
+    width = max(16, *(len(name) for name in names))
+    print(f"{'':<18}" + ''.join(f"{name:>{width + 2}}" for name in names))
+    print(f"{'started':<18}" + ''.join(f"{report['started_at'][:16]:>{width + 2}}" for report in reports))
+    print(f"{'commit':<18}" + ''.join(f"{str(report.get('git_commit')):>{width + 2}}" for report in reports))
+    for keys, label in COMPARED:
+        values = []
+        for report in reports:
+            value = report
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append('-' if value is None else f'{value:,}' if isinstance(value, int) else f'{value:,.1f}')
+        print(f"{label:<18}" + ''.join(f"{value:>{width + 2}}" for value in values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay GitHub webhooks against 02-github-jira.py')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='write an NDJSON corpus')
+    record.add_argument('corpus', help='NDJSON file to write')
+    source = record.add_mutually_exclusive_group(required=True)
+    source.add_argument('--synthetic', type=int, metavar='N', help='generate N synthetic deliveries')
+    source.add_argument('--listen', type=int, metavar='PORT', help='record real webhooks sent to this port')
+    record.add_argument('--command-rate', type=float, default=0.1, help="share of '/CreateJira' comments")
+    record.add_argument('--min-kb', type=int, default=20, help='smallest synthetic payload (KB)')
+    record.add_argument('--max-kb', type=int, default=60, help='largest synthetic payload (KB)')
+
+    run = commands.add_parser('replay', help='send a corpus to the app and write a result file')
+    run.add_argument('corpus', help='NDJSON corpus')
+    run.add_argument('--rate', type=float, help='deliveries per second (open loop)')
+    run.add_argument('--concurrency', type=int, default=20, help='senders / max deliveries in flight')
+    run.add_argument('--limit', type=int, help='only the first N deliveries')
+    run.add_argument('--fresh-ids', action='store_true', help='new X-GitHub-Delivery id per send')
+    run.add_argument('--url', help='webhook URL of a running app (no fake Jira, no outbound counts)')
+    run.add_argument('--jira-latency', type=float, default=0.1, help='fake Jira delay per call (s)')
+    run.add_argument('--jira-error-rate', type=float, default=0.0, help='fake Jira share of 500 answers')
+    run.add_argument('--jira-throttle-rate', type=float, default=0.0, help='fake Jira share of 429 answers')
+    run.add_argument('--workers', type=int, default=8, help='Jira worker threads in the app')
+    run.add_argument('--queue-size', type=int, default=1000, help='max pending tickets in the app')
+    run.add_argument('--batch-size', type=int, default=50, help='tickets per bulk call (1 = no batching)')
+    run.add_argument('--batch-wait-ms', type=int, default=200, help='max wait to fill a batch')
+    run.add_argument('--result', help='JSON result file to write')
+
+    versus = commands.add_parser('compare', help='show result files side by side')
+    versus.add_argument('results', nargs='+', help='JSON result files')
+
+    args = parser.parse_args()
+    if args.command == 'record':
+        if args.listen:
+            record_listener(args.corpus, args.listen)
+        else:
+            count = write_corpus(args.corpus, synthetic_corpus(args.synthetic, args.command_rate,
+                                                               args.min_kb, args.max_kb))
+            print(f"Wrote {count:,} deliveries ({os.path.getsize(args.corpus) / 1e6:.1f} MB) to {args.corpus}")
+    elif args.command == 'replay':
+        run_replay(args)
+    else:
+        compare(args.results)
+
+
+if __name__ == "__main__":
+    main()